@@ -124,7 +124,9 @@ setup(
         'console_scripts': ['qudi=qudi.runnable:main',
                             'qudi-config-editor=qudi.tools.config_editor.config_editor:main',
                             'qudi-uninstall-kernel=qudi.core.qudikernel:uninstall_kernel',
-                            'qudi-install-kernel=qudi.core.qudikernel:install_kernel'
+                            'qudi-install-kernel=qudi.core.qudikernel:install_kernel',
+                            'qudi-data-catalog=qudi.util.datacatalog:main',
+                            'qudi-build-ui-cache=qudi.util.uic:main'
                             ]
     },
     zip_safe=False
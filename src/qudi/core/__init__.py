@@ -22,6 +22,13 @@ If not, see <https://www.gnu.org/licenses/>.
 __all__ = ['StatusVar', 'ConfigOption', 'Connector', 'Base', 'LogicBase', 'GuiBase', 'get_logger']
 
 import os
+import sys
+
+# Start recording the startup profile as early as possible in order to include import times
+if '--profile-startup' in sys.argv[1:]:
+    from qudi.core.startupprofiler import start_startup_profiler
+    start_startup_profiler()
+
 from importlib import metadata
 __version__ = metadata.version('qudi-core')
 
@@ -18,7 +18,6 @@ If not, see <https://www.gnu.org/licenses/>.
 """
 
 import argparse
-from qudi.core.application import Qudi
 
 # parse commandline parameters
 parser = argparse.ArgumentParser(prog='python -m qudi.core')
@@ -46,7 +45,18 @@ parser.add_argument(
     default='',
     help='Absolute path to log directory to use instead of the default one "<user_home>/qudi/log/"'
 )
+parser.add_argument(
+    '--profile-startup',
+    action='store_true',
+    help='Record a trace of the qudi startup including import times and save it to the log '
+         'directory.'
+)
 args = parser.parse_args()
 
+# Profiling is started upon import of qudi.core if the --profile-startup flag is present
+from qudi.core.startupprofiler import startup_span
+with startup_span('load qudi.core.application'):
+    from qudi.core.application import Qudi
+
 app = Qudi(no_gui=args.no_gui, debug=args.debug, log_dir=args.logdir, config_file=args.config)
 app.run()
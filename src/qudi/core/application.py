@@ -27,7 +27,7 @@ import inspect
 import traceback
 import faulthandler
 from logging import DEBUG, INFO
-from PySide2 import QtCore, QtWidgets
+from PySide2 import QtCore
 
 from qudi.core.logger import init_rotating_file_handler, init_record_model_handler, clear_handlers
 from qudi.core.logger import get_logger, set_log_level
@@ -37,9 +37,11 @@ from qudi.util.colordefs import QudiMatplotlibStyle
 from qudi.core.config import Configuration, ValidationError, YAMLError
 from qudi.core.watchdog import AppWatchdog
 from qudi.core.modulemanager import ModuleManager
+from qudi.core.moduletiming import module_timing_recorder
+from qudi.core.autosave import StatusVariableAutosave
 from qudi.core.threadmanager import ThreadManager
-from qudi.core.gui.gui import Gui
 from qudi.core.servers import RemoteModulesServer, QudiNamespaceServer
+from qudi.core.startupprofiler import startup_span, startup_profiled, finish_startup_profiler
 
 # Use non-GUI "Agg" backend for matplotlib by default since it is reasonably thread-safe. Otherwise
 # you can only plot from main thread and not e.g. in a logic module.
@@ -87,6 +89,9 @@ class Qudi(QtCore.QObject):
     _instance = None
     _run_lock = Mutex()
     _quit_lock = Mutex()
+    # Time in seconds to wait for pending data storage writes upon shutdown if
+    # "module_deactivation_timeout" is disabled in the configuration
+    _data_storage_drain_timeout = 60
 
     def __new__(cls, *args, **kwargs):
         if cls._instance is None or cls._instance() is None:
@@ -98,6 +103,7 @@ class Qudi(QtCore.QObject):
             'Qudi.instance() to get a reference to the already created instance.'
         )
 
+    @startup_profiled('Qudi.__init__')
     def __init__(self, no_gui=False, debug=False, log_dir='', config_file=None):
         super().__init__()
 
@@ -107,67 +113,67 @@ class Qudi(QtCore.QObject):
         self.log_dir = str(log_dir) if os.path.isdir(log_dir) else get_default_log_dir(
             create_missing=True)
 
-        # Disable pyqtgraph "application exit workarounds" because they cause errors on exit
-        try:
-            import pyqtgraph
-            pyqtgraph.setConfigOption('exitCleanup', False)
-        except ImportError:
-            pass
-
         # Enable stack trace output for SIGSEGV, SIGFPE, SIGABRT, SIGBUS and SIGILL signals
         # -> e.g. for segmentation faults
         faulthandler.disable()
         faulthandler.enable(all_threads=True)
 
         # install logging facility and set logging level
-        init_record_model_handler(max_records=10000)
-        init_rotating_file_handler(path=self.log_dir)
-        set_log_level(DEBUG if self.debug_mode else INFO)
+        with startup_span('init logging'):
+            init_record_model_handler(max_records=10000)
+            init_rotating_file_handler(path=self.log_dir)
+            set_log_level(DEBUG if self.debug_mode else INFO)
 
         # Set up logger for qudi main instance
         self.log = get_logger(__class__.__name__)  # will be "qudi.Qudi" in custom logger
         sys.excepthook = self._qudi_excepthook
 
         # Load configuration from disc if possible
-        self.configuration = Configuration()
-        try:
-            self.configuration.load(config_file, set_default=True)
-        except ValueError:
-            self.log.info('No qudi configuration file specified. Using empty default config.')
-        except (ValidationError, YAMLError):
-            self.log.exception('Invalid qudi configuration file specified. '
-                               'Falling back to default config.')
+        with startup_span('load configuration'):
+            self.configuration = Configuration()
+            try:
+                self.configuration.load(config_file, set_default=True)
+            except ValueError:
+                self.log.info('No qudi configuration file specified. Using empty default config.')
+            except (ValidationError, YAMLError):
+                self.log.exception('Invalid qudi configuration file specified. '
+                                   'Falling back to default config.')
 
         # initialize thread manager and module manager
-        self.thread_manager = ThreadManager(parent=self)
-        self.module_manager = ModuleManager(qudi_main=self, parent=self)
+        with startup_span('create managers'):
+            self.thread_manager = ThreadManager(parent=self)
+            self.module_manager = ModuleManager(qudi_main=self, parent=self)
+            self.status_autosave = StatusVariableAutosave(module_manager=self.module_manager,
+                                                          parent=self)
 
         # initialize remote modules server if needed
-        remote_server_config = self.configuration['remote_modules_server']
-        if remote_server_config:
-            self.remote_modules_server = RemoteModulesServer(
+        with startup_span('create servers'):
+            remote_server_config = self.configuration['remote_modules_server']
+            if remote_server_config:
+                self.remote_modules_server = RemoteModulesServer(
+                    parent=self,
+                    qudi=self,
+                    name='remote-modules-server',
+                    host=remote_server_config.get('address', None),
+                    port=remote_server_config.get('port', None),
+                    certfile=remote_server_config.get('certfile', None),
+                    keyfile=remote_server_config.get('certfile', None),
+                    protocol_config=remote_server_config.get('protocol_config', None),
+                    ssl_version=remote_server_config.get('ssl_version', None),
+                    cert_reqs=remote_server_config.get('cert_reqs', None),
+                    ciphers=remote_server_config.get('ciphers', None),
+                    force_remote_calls_by_value=self.configuration['force_remote_calls_by_value']
+                )
+            else:
+                self.remote_modules_server = None
+            self.local_namespace_server = QudiNamespaceServer(
                 parent=self,
                 qudi=self,
-                name='remote-modules-server',
-                host=remote_server_config.get('address', None),
-                port=remote_server_config.get('port', None),
-                certfile=remote_server_config.get('certfile', None),
-                keyfile=remote_server_config.get('certfile', None),
-                protocol_config=remote_server_config.get('protocol_config', None),
-                ssl_version=remote_server_config.get('ssl_version', None),
-                cert_reqs=remote_server_config.get('cert_reqs', None),
-                ciphers=remote_server_config.get('ciphers', None),
+                name='local-namespace-server',
+                port=self.configuration['namespace_server_port'],
                 force_remote_calls_by_value=self.configuration['force_remote_calls_by_value']
             )
-        else:
-            self.remote_modules_server = None
-        self.local_namespace_server = QudiNamespaceServer(
-            parent=self,
-            qudi=self,
-            name='local-namespace-server',
-            port=self.configuration['namespace_server_port'],
-            force_remote_calls_by_value=self.configuration['force_remote_calls_by_value']
-        )
+
         self.watchdog = None
         self.gui = None
 
@@ -175,10 +181,11 @@ class Qudi(QtCore.QObject):
         self._is_running = False
         self._shutting_down = False
 
-        # Set qudi style for matplotlib
+        # Set qudi style for matplotlib. Use matplotlib.style instead of matplotlib.pyplot to avoid
+        # importing pyplot before it is actually needed.
         try:
-            import matplotlib.pyplot as plt
-            plt.style.use(QudiMatplotlibStyle.style)
+            import matplotlib.style
+            matplotlib.style.use(QudiMatplotlibStyle.style)
         except ImportError:
             pass
 
@@ -243,6 +250,7 @@ class Qudi(QtCore.QObject):
         self._configured_extension_paths = extensions
 
     @QtCore.Slot()
+    @startup_profiled()
     def _configure_qudi(self):
         """
         """
@@ -253,17 +261,36 @@ class Qudi(QtCore.QObject):
             print(f'> Applying configuration from "{self.configuration.file_path}"...')
             self.log.info(f'Applying configuration from "{self.configuration.file_path}"...')
 
-        # Clear all qudi modules
-        self.module_manager.clear()
+        # Stop status variable autosave
+        self.status_autosave.stop(wait=True)
+
+        # Remove qudi modules that are no longer configured or whose configuration has changed.
+        # Unchanged modules are kept alive unless the extension paths have changed.
+        if self.configuration['extension_paths'] != self._configured_extension_paths:
+            self.module_manager.clear()
+        else:
+            configurations = {
+                name: (base, cfg) for base in ['hardware', 'logic', 'gui'] for name, cfg in
+                self.configuration[base].items()
+            }
+            removed = self.module_manager.prune_modules(configurations)
+            if removed:
+                self.log.debug(f'Removed changed qudi modules: {removed}')
 
         # Configure extension paths
         self._remove_extensions_from_path()
         self._add_extensions_to_path()
 
+        # Configure data catalog
+        self._configure_data_catalog()
+
         # Configure qudi modules
         for base in ['hardware', 'logic', 'gui']:
             # Create ManagedModule instance by adding each module to ModuleManager
             for module_name, module_cfg in self.configuration[base].items():
+                # Skip unchanged modules that are still alive
+                if module_name in self.module_manager:
+                    continue
                 try:
                     self.module_manager.add_module(name=module_name,
                                                    base=base,
@@ -273,25 +300,79 @@ class Qudi(QtCore.QObject):
                     self.log.exception(f'Unable to create ManagedModule instance for {base} '
                                        f'module "{module_name}"')
 
+        # Configure status variable autosave
+        self._configure_status_autosave()
+
         print('> Qudi configuration complete!')
         self.log.info('Qudi configuration complete!')
 
+    def _configure_data_catalog(self):
+        """ Set up the data catalog all data storage objects register saved files in (if
+        configured). Avoid importing the data storage (and matplotlib) if not needed.
+        """
+        catalog_path = self.configuration['data_catalog']
+        datastorage = sys.modules.get('qudi.util.datastorage', None)
+        if datastorage is not None:
+            old_catalog = datastorage.DataStorageBase.get_catalog()
+            datastorage.DataStorageBase.set_catalog(None)
+            if old_catalog is not None:
+                old_catalog.close()
+        if catalog_path:
+            from qudi.util.datastorage import DataStorageBase
+            from qudi.util.datacatalog import DataCatalog
+            try:
+                DataStorageBase.set_catalog(DataCatalog(catalog_path))
+            except:
+                self.log.exception(f'Unable to open data catalog "{catalog_path}":')
+            else:
+                self.log.info(f'Registering saved data files in catalog "{catalog_path}"')
+
+    def _configure_status_autosave(self):
+        """ Set up periodic background autosave of module status variables (if configured).
+        """
+        interval = self.configuration['status_autosave_interval']
+        self.status_autosave.interval = interval
+        if interval is not None:
+            self.log.info(f'Autosaving status variables every {interval:.3g} s')
+            self.status_autosave.start()
+
+    @startup_profiled()
     def _start_gui(self):
         if self.no_gui:
             return
+        # Import the GUI stack (QtWidgets, pyqtgraph, main GUI) only if a GUI is requested
+        from qudi.core.gui.gui import Gui
+        self._disable_pyqtgraph_exit_cleanup()
         self.gui = Gui(qudi_instance=self, stylesheet_path=self.configuration['stylesheet'])
         if not self.configuration['hide_manager_window']:
             self.gui.activate_main_gui()
 
+    @staticmethod
+    def _disable_pyqtgraph_exit_cleanup():
+        """ Disable pyqtgraph "application exit workarounds" because they cause errors on exit.
+        """
+        try:
+            import pyqtgraph
+            pyqtgraph.setConfigOption('exitCleanup', False)
+        except ImportError:
+            pass
+
+    @startup_profiled()
     def _start_startup_modules(self):
-        for module in self.configuration['startup_modules']:
+        startup_modules = self.configuration['startup_modules']
+        for module in startup_modules:
             print(f'> Loading startup module: {module}')
             self.log.info(f'Loading startup module: {module}')
-            # Do not crash if a module can not be started
-            try:
-                self.module_manager.activate_module(module)
-            except:
-                self.log.exception(f'Unable to activate autostart module "{module}":')
+        # Activate startup modules and their dependencies level by level. Do not crash if a module
+        # can not be started.
+        results = self.module_manager.activate_modules(
+            startup_modules,
+            parallel=self.configuration['parallel_module_activation']
+        )
+        for module, error in results.items():
+            if error is not None:
+                self.log.error(f'Unable to activate module "{module}" during startup:',
+                               exc_info=error)
 
     def run(self):
         """
@@ -305,28 +386,37 @@ class Qudi(QtCore.QObject):
             self.log.info(startup_info)
             print(f'> {startup_info}')
 
-            # Get QApplication instance
-            app_cls = QtCore.QCoreApplication if self.no_gui else QtWidgets.QApplication
-            app = app_cls.instance()
-            if app is None:
-                app = app_cls(sys.argv)
+            with startup_span('Qudi.run'):
+                # Get QApplication instance. Import QtWidgets only if a GUI is requested.
+                if self.no_gui:
+                    app_cls = QtCore.QCoreApplication
+                else:
+                    from PySide2 import QtWidgets
+                    app_cls = QtWidgets.QApplication
+                app = app_cls.instance()
+                if app is None:
+                    app = app_cls(sys.argv)
 
-            # Install app watchdog
-            self.watchdog = AppWatchdog(self.interrupt_quit)
+                # Install app watchdog
+                self.watchdog = AppWatchdog(self.interrupt_quit)
 
-            # Start module servers
-            if self.remote_modules_server is not None:
-                self.remote_modules_server.start()
-            self.local_namespace_server.start()
+                # Start module servers
+                with startup_span('start servers'):
+                    if self.remote_modules_server is not None:
+                        self.remote_modules_server.start()
+                    self.local_namespace_server.start()
 
-            # Apply configuration to qudi
-            self._configure_qudi()
+                # Apply configuration to qudi
+                self._configure_qudi()
 
-            # Start GUI if needed
-            self._start_gui()
+                # Start GUI if needed
+                self._start_gui()
 
-            # Start the startup modules defined in the config file
-            self._start_startup_modules()
+                # Start the startup modules defined in the config file
+                self._start_startup_modules()
+
+            # Save startup profile if requested via "--profile-startup" command line flag
+            self._save_startup_profile()
 
             # Start Qt event loop unless running in interactive mode
             self._is_running = True
@@ -342,6 +432,16 @@ class Qudi(QtCore.QObject):
             # Exit application
             sys.exit(exit_code)
 
+    def _save_startup_profile(self):
+        try:
+            paths = finish_startup_profiler(self.log_dir, module_timing_recorder.get_records())
+        except:
+            self.log.exception('Unable to save startup profile:')
+            return
+        if paths is not None:
+            self.log.info(f'Startup profile saved to "{paths[0]}" and "{paths[1]}"')
+            print(f'> Startup profile saved to:\n>     {paths[0]}\n>     {paths[1]}')
+
     def _exit(self, prompt=True, restart=False):
         """ Shutdown qudi. Nicely request that all modules shut down if prompt is True.
         Signal restart to parent process (if present) via exitcode 42 if restart is True.
@@ -405,9 +505,34 @@ class Qudi(QtCore.QObject):
             QtCore.QCoreApplication.instance().processEvents()
             self.log.info('Deactivating modules...')
             print('> Deactivating modules...')
-            self.module_manager.stop_all_modules()
+            self.status_autosave.stop(wait=True)
+            self.module_manager.stop_all_modules(
+                parallel=self.configuration['parallel_module_activation'],
+                timeout=self.configuration['module_deactivation_timeout']
+            )
             self.module_manager.clear()
             QtCore.QCoreApplication.instance().processEvents()
+            # Wait for pending asynchronous data storage writes. Avoid importing the data storage
+            # (and matplotlib) if it has never been used.
+            datastorage = sys.modules.get('qudi.util.datastorage', None)
+            if datastorage is not None:
+                self.log.info('Waiting for pending data storage writes...')
+                print('> Waiting for pending data storage writes...')
+                # Do not let a hanging write (e.g. to a network share) block the shutdown forever
+                timeout = self.configuration['module_deactivation_timeout']
+                if timeout is None:
+                    timeout = self._data_storage_drain_timeout
+                if not datastorage.DataStorageBase.drain_async_save_queue(timeout=timeout):
+                    pending = datastorage.DataStorageBase.get_pending_async_save_jobs()
+                    pending_str = '\n    '.join(pending)
+                    self.log.error(
+                        f'Asynchronous data storage writes did not finish within {timeout:.3g} s. '
+                        f'Abandoning {len(pending):d} unfinished jobs:\n    {pending_str}'
+                    )
+                datastorage.DataStorageBase.shutdown_thumbnail_pool(wait=True)
+            # Modules of headless qudi might have imported pyqtgraph on their own
+            if 'pyqtgraph' in sys.modules:
+                self._disable_pyqtgraph_exit_cleanup()
             if not self.no_gui:
                 self.log.info('Closing main GUI...')
                 print('> Closing main GUI...')
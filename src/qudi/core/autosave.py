@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+
+"""
+This file contains the qudi service periodically saving status variables of active modules.
+
+Copyright (c) 2021, the qudi developers. See the AUTHORS.md file at the top-level directory of this
+distribution and on <https://github.com/Ulm-IQO/qudi-core/>
+
+This file is part of qudi.
+
+Qudi is free software: you can redistribute it and/or modify it under the terms of
+the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+
+Qudi is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with qudi.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+__all__ = ['StatusVariableAutosave']
+
+import time
+import copy
+import pickle
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Optional, Dict
+from PySide2 import QtCore
+
+from qudi.core.logger import get_logger
+from qudi.core.statusvariable import dump_status_variables, is_status_file_current
+from qudi.util.mutex import Mutex
+
+
+class StatusVariableAutosave(QtCore.QObject):
+    """ Periodically takes a snapshot of the status variables of all active local qudi modules and
+    writes the status variable files of modules with changed values in a background thread.
+
+    The snapshot is taken in the thread this object lives in (usually the main thread). Only
+    modules whose status variables changed since the last successful dump (autosave or
+    deactivation) are written. Files are replaced atomically, so a crash during an autosave can not
+    corrupt previously saved status variables.
+    """
+
+    def __init__(self, module_manager, interval: Optional[float] = None, parent=None):
+        """
+        @param ModuleManager module_manager: The qudi module manager holding the modules to save
+        @param float interval: optional, autosave interval in seconds (None to disable)
+        @param QObject parent: optional, Qt parent object
+        """
+        super().__init__(parent=parent)
+        self._module_manager = module_manager
+        self._lock = Mutex()
+        self._interval = None
+        self._executor = None
+        self._pending = dict()  # Pending write futures by status file path
+        self.log = get_logger(f'{__name__}.{self.__class__.__name__}')
+        self._timer = QtCore.QTimer(parent=self)
+        self._timer.setSingleShot(False)
+        self._timer.timeout.connect(self.autosave_now, QtCore.Qt.QueuedConnection)
+        self.interval = interval
+
+    @property
+    def interval(self) -> Optional[float]:
+        """ Autosave interval in seconds. None if periodic autosave is disabled """
+        return self._interval
+
+    @interval.setter
+    def interval(self, value: Optional[float]) -> None:
+        if value is not None:
+            value = float(value)
+            if value <= 0:
+                raise ValueError('Status variable autosave interval must be > 0 seconds or None')
+        self._interval = value
+        if value is not None:
+            self._timer.setInterval(max(1, int(round(value * 1000))))
+
+    @property
+    def is_running(self) -> bool:
+        return self._timer.isActive()
+
+    def start(self) -> None:
+        """ Start periodic autosave. Does nothing if the interval is None. """
+        with self._lock:
+            if self._interval is None:
+                return
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1,
+                                                    thread_name_prefix='status-autosave')
+            self._timer.start()
+
+    def stop(self, wait: bool = True) -> None:
+        """ Stop periodic autosave.
+
+        @param bool wait: optional, flag indicating if pending writes should be completed before
+                          returning (default: True)
+        """
+        with self._lock:
+            self._timer.stop()
+            executor = self._executor
+            self._executor = None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    @QtCore.Slot()
+    def autosave_now(self) -> Dict[str, Future]:
+        """ Take a snapshot of the status variables of all active local modules and schedule
+        writing the status variable files of all modules with changed values.
+
+        @return dict: Futures of the scheduled write jobs by module name
+        """
+        scheduled = dict()
+        with self._lock:
+            if self._executor is None:
+                return scheduled
+            for name, module in self._module_manager.items():
+                try:
+                    if module.is_remote or not module.is_active:
+                        continue
+                    instance = module.instance
+                    file_path = module.status_file_path
+                    # Do not queue a second write of the same file
+                    pending = self._pending.get(file_path, None)
+                    if pending is not None and not pending.done():
+                        continue
+                    snapshot_time = time.monotonic()
+                    variables = instance.module_status_variables
+                    if not variables:
+                        continue
+                    try:
+                        payload = pickle.dumps(variables, protocol=pickle.HIGHEST_PROTOCOL)
+                    except Exception:
+                        # Values can not be compared via digest. Write a copy every time.
+                        digest = None
+                        variables = copy.deepcopy(variables)
+                    else:
+                        digest = hashlib.blake2b(payload).digest()
+                        if is_status_file_current(file_path, digest):
+                            continue
+                        variables = payload
+                    future = self._executor.submit(self._dump,
+                                                   name,
+                                                   file_path,
+                                                   variables,
+                                                   snapshot_time,
+                                                   digest)
+                    self._pending[file_path] = future
+                    scheduled[name] = future
+                except:
+                    self.log.exception(f'Unable to take status variable snapshot of module '
+                                       f'"{name}":')
+        return scheduled
+
+    def _dump(self, name, file_path, variables, snapshot_time, digest) -> bool:
+        try:
+            if isinstance(variables, bytes):
+                variables = pickle.loads(variables)
+            written = dump_status_variables(file_path,
+                                            variables,
+                                            snapshot_time=snapshot_time,
+                                            digest=digest)
+            if written:
+                self.log.debug(f'Autosaved status variables of module "{name}"')
+            return written
+        except:
+            self.log.exception(f'Failed to autosave status variables of module "{name}":')
+            return False
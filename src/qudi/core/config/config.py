@@ -34,6 +34,7 @@ from .validator import ValidationError
 from .validator import validate_config as _validate_config
 from .validator import validate_local_module_config as _validate_local_module_config
 from .validator import validate_remote_module_config as _validate_remote_module_config
+from .validator import validate_module_name as _validate_module_name
 from .file_handler import ParserError, YAMLError, DuplicateKeyError
 from .file_handler import FileHandlerBase as _FileHandlerBase
 
@@ -49,7 +50,7 @@ class Configuration(_FileHandlerBase,
     Handles config file loading/dumping as well as writing qudi load config to AppData.
     Performs JSON schema validation upon file loading/dumping and mutation.
     Includes interface methods to add/remove module configurations as well as getting/setting
-    various config items.
+    various config items. These methods only validate the changed module configuration.
     """
     sigConfigChanged = QtCore.Signal(object)  # self
 
@@ -217,10 +218,10 @@ class Configuration(_FileHandlerBase,
             module_config['connect'] = copy.copy(connect)
         if options is not None:
             module_config['options'] = copy.deepcopy(options)
+        _validate_module_name(name)
         _validate_local_module_config(module_config)
-        new_config = self.config_map
-        new_config[base][name] = module_config
-        self.set_config(new_config)
+        self._config[base][name] = module_config
+        self.sigConfigChanged.emit(self)
 
     def add_remote_module(self,
                           base: str,
@@ -251,10 +252,12 @@ class Configuration(_FileHandlerBase,
             module_config['certfile'] = certfile
         if keyfile is not None:
             module_config['keyfile'] = keyfile
+        if base == 'gui':
+            raise ValidationError('Remote modules can not be configured as "gui" module')
+        _validate_module_name(name)
         _validate_remote_module_config(module_config)
-        new_config = self.config_map
-        new_config[base][name] = module_config
-        self.set_config(new_config)
+        self._config[base][name] = module_config
+        self.sigConfigChanged.emit(self)
 
     def rename_module(self, old_name: str, new_name: str) -> None:
         """ Mutates the current configuration by validating and renaming an already configured
@@ -270,15 +273,15 @@ class Configuration(_FileHandlerBase,
         if self.module_configured(new_name):
             raise KeyError(f'Module with name "{new_name}" already configured')
 
-        new_config = self.config_map
+        _validate_module_name(new_name)
         for base in ['gui', 'logic', 'hardware']:
             try:
-                module_config = new_config[base].pop(old_name)
+                module_config = self._config[base].pop(old_name)
             except KeyError:
                 continue
             else:
-                new_config[base][new_name] = module_config
-                self.set_config(new_config)
+                self._config[base][new_name] = module_config
+                self.sigConfigChanged.emit(self)
                 return
 
     def remove_module(self, name: str) -> None:
@@ -286,14 +289,13 @@ class Configuration(_FileHandlerBase,
 
         Raises KeyError if no module is configured by given <name>.
         """
-        new_config = self.config_map
         for base in ['gui', 'logic', 'hardware']:
             try:
-                del new_config[base][name]
+                del self._config[base][name]
             except KeyError:
                 continue
             else:
-                self.set_config(new_config)
+                self.sigConfigChanged.emit(self)
                 return
         raise KeyError(f'No module with name "{name}" configured')
 
@@ -39,7 +39,7 @@ class FileHandlerBase:
 
     @classmethod
     def _load(cls, path: str) -> Dict[str, Any]:
-        return yaml_load(cls._relative_to_absolute_path(path))
+        return yaml_load(cls._relative_to_absolute_path(path), cache=True)
 
     @classmethod
     def _dump(cls, path: str, config: Mapping[str, Any]) -> None:
@@ -99,6 +99,24 @@ def config_schema() -> Dict[str, Any]:
                         'type': ['null', 'string'],
                         'default': None
                     },
+                    'data_catalog': {
+                        'type': ['null', 'string'],
+                        'default': None
+                    },
+                    'status_autosave_interval': {
+                        'type': ['null', 'number'],
+                        'exclusiveMinimum': 0,
+                        'default': None
+                    },
+                    'parallel_module_activation': {
+                        'type': 'boolean',
+                        'default': True
+                    },
+                    'module_deactivation_timeout': {
+                        'type': ['null', 'number'],
+                        'exclusiveMinimum': 0,
+                        'default': 60
+                    },
                     'extension_paths': {
                         'type': 'array',
                         'uniqueItems': True,
@@ -22,10 +22,16 @@ If not, see <https://www.gnu.org/licenses/>.
 """
 
 __all__ = ['ValidationError', 'validate_config', 'validate_local_module_config',
-           'validate_remote_module_config', 'validate_module_name']
+           'validate_remote_module_config', 'validate_module_config', 'validate_module_name',
+           'clear_validation_cache']
 
 import re
-from typing import Mapping, Any
+import copy
+import pickle
+import threading
+from functools import lru_cache
+from collections import OrderedDict
+from typing import Mapping, Any, MutableMapping
 from jsonschema import ValidationError
 from jsonschema import validators as __validators
 from jsonschema import Draft7Validator as __BaseValidator
@@ -33,17 +39,27 @@ from jsonschema import Draft7Validator as __BaseValidator
 from .schema import config_schema, remote_module_config_schema, local_module_config_schema
 
 
+# Plain validators for sub-schemas used in __set_defaults by id of the (cached) schema
+_subschema_validators = dict()
+
+
+def __get_subschema_validator(schema):
+    try:
+        return _subschema_validators[id(schema)][1]
+    except KeyError:
+        validator = __BaseValidator(schema)
+        # Keep a reference to the schema to prevent its id from being reused
+        _subschema_validators[id(schema)] = (schema, validator)
+        return validator
+
+
 def __set_defaults(validator, properties, instance, schema):
     # Only insert default values of current schema into instance if validation passses
-    try:
-        __BaseValidator(schema).validate(instance)
-    except ValidationError:
-        pass
-    else:
+    if __get_subschema_validator(schema).is_valid(instance):
         for property, subschema in properties.items():
             if 'default' in subschema:
                 try:
-                    instance.setdefault(property, subschema['default'])
+                    instance.setdefault(property, copy.deepcopy(subschema['default']))
                 except AttributeError:
                     pass
 
@@ -65,25 +81,123 @@ DefaultInsertionValidator = __validators.extend(
 )
 
 
-def validate_config(config: Mapping[str, Any]) -> None:
+@lru_cache(maxsize=None)
+def _get_validator(schema_name: str):
+    """ Creates the validator for the given schema only once per process """
+    if schema_name == 'config':
+        # Module sections are validated separately for each module (see validate_config)
+        schema = config_schema()
+        for base in ('gui', 'logic', 'hardware'):
+            del schema['properties'][base]['additionalProperties']
+        del schema['$defs']
+    elif schema_name == 'local_module':
+        schema = local_module_config_schema()
+    elif schema_name == 'remote_module':
+        schema = remote_module_config_schema()
+    elif schema_name == 'module':
+        schema = {'oneOf': [local_module_config_schema(), remote_module_config_schema()]}
+    else:
+        raise ValueError(f'Unknown schema name "{schema_name}"')
+    return DefaultInsertionValidator(schema)
+
+
+class _ModuleValidationCache:
+    """ Remembers the validated (default values inserted) version of raw module configurations to
+    skip validating unchanged module configurations again (e.g. upon reload).
+    Module configs are identified by their pickled representation.
+    """
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key: bytes) -> Any:
+        with self._lock:
+            try:
+                payload = self._entries[key]
+            except KeyError:
+                return None
+            self._entries.move_to_end(key)
+        return pickle.loads(payload)
+
+    def put(self, key: bytes, validated: Any) -> None:
+        try:
+            payload = pickle.dumps(validated, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return
+        with self._lock:
+            self._entries[key] = payload
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_module_validation_cache = _ModuleValidationCache()
+
+
+def clear_validation_cache() -> None:
+    """ Forget all module configurations validated so far """
+    _module_validation_cache.clear()
+
+
+def validate_module_config(base: str, config: MutableMapping[str, Any]) -> MutableMapping[str, Any]:
+    """ JSON schema (draft v7) validator for a single module configuration of given module base
+    ("gui" modules must be local, "logic" and "hardware" modules can be local or remote).
+    Raises jsonschema.ValidationError if invalid.
+
+    Already validated module configurations are remembered and not validated again.
+    Returns the validated configuration with default values inserted which can be the given config
+    object or a new one.
+    """
+    schema_name = 'local_module' if base == 'gui' else 'module'
+    try:
+        key = pickle.dumps((schema_name, config), protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        key = None
+    else:
+        validated = _module_validation_cache.get(key)
+        if validated is not None:
+            return validated
+    _get_validator(schema_name).validate(config)
+    if key is not None:
+        _module_validation_cache.put(key, config)
+    return config
+
+
+def validate_config(config: MutableMapping[str, Any]) -> None:
     """ JSON schema (draft v7) validator for qudi configuration.
     Raises jsonschema.ValidationError if invalid.
+
+    The module configurations are validated one by one (see validate_module_config).
     """
-    DefaultInsertionValidator(config_schema()).validate(config)
+    _get_validator('config').validate(config)
+    for base in ('gui', 'logic', 'hardware'):
+        modules = config[base]
+        for name, module_config in modules.items():
+            try:
+                modules[name] = validate_module_config(base, module_config)
+            except ValidationError as err:
+                err.path.appendleft(name)
+                err.path.appendleft(base)
+                raise
 
 
 def validate_local_module_config(config: Mapping[str, Any]) -> None:
     """ JSON schema (draft v7) validator for single qudi local module configuration.
     Raises jsonschema.ValidationError if invalid.
     """
-    DefaultInsertionValidator(local_module_config_schema()).validate(config)
+    _get_validator('local_module').validate(config)
 
 
 def validate_remote_module_config(config: Mapping[str, Any]) -> None:
     """ JSON schema (draft v7) validator for single qudi remote module configuration.
     Raises jsonschema.ValidationError if invalid.
     """
-    DefaultInsertionValidator(remote_module_config_schema()).validate(config)
+    _get_validator('remote_module').validate(config)
 
 
 def validate_module_name(name: str) -> None:
@@ -29,7 +29,7 @@ from collections.abc import Mapping, Sequence, Set
 
 from qudi.core.statusvariable import StatusVar
 from qudi.core.threadmanager import ThreadManager
-from qudi.util.paths import get_main_dir, get_default_config_dir
+from qudi.util.paths import get_main_dir, get_default_config_dir, get_default_log_dir
 from qudi.core.gui.main_gui.errordialog import ErrorDialog
 from qudi.core.gui.main_gui.mainwindow import QudiMainWindow
 from qudi.core.module import GuiBase
@@ -124,6 +124,7 @@ class QudiMainGui(GuiBase):
         self.mw.action_reload_qudi.triggered.connect(
             qudi_main.prompt_restart, QtCore.Qt.QueuedConnection)
         self.mw.action_open_configuration_editor.triggered.connect(self.new_configuration)
+        self.mw.action_save_module_timing_trace.triggered.connect(self.save_module_timing_trace)
         self.mw.action_load_all_modules.triggered.connect(
             qudi_main.module_manager.start_all_modules)
         self.mw.action_view_default.triggered.connect(self.reset_default_layout)
@@ -152,6 +153,7 @@ class QudiMainGui(GuiBase):
         self.mw.action_reload_qudi.triggered.disconnect()
         self.mw.action_open_configuration_editor.triggered.disconnect()
         self.mw.action_load_all_modules.triggered.disconnect()
+        self.mw.action_save_module_timing_trace.triggered.disconnect()
         self.mw.action_view_default.triggered.disconnect()
         # Disconnect signals from manager
         qudi_main.configuration.sigConfigChanged.disconnect(self.update_config_widget)
@@ -344,6 +346,9 @@ class QudiMainGui(GuiBase):
     @QtCore.Slot(str, str, str)
     def update_module_state(self, base, name, state):
         self.mw.module_widget.update_module_state(base, name, state)
+        module = self._qudi_main.module_manager.get(name, None)
+        if module is not None:
+            self.mw.module_widget.update_module_timings(base, name, module.timings)
         return
 
     @QtCore.Slot(str, str, bool)
@@ -395,6 +400,22 @@ class QudiMainGui(GuiBase):
             if reply == QtWidgets.QMessageBox.Yes:
                 self._qudi_main.restart()
 
+    def save_module_timing_trace(self):
+        """ Ask the user for a file to save the recorded module lifecycle timings to (Chrome
+        trace event format)
+        """
+        filename = QtWidgets.QFileDialog.getSaveFileName(
+            self.mw,
+            'Save module timing trace',
+            os.path.join(get_default_log_dir(True), 'module_timing_trace.json'),
+            'Chrome trace files (*.json)'
+        )[0]
+        if filename:
+            try:
+                self._qudi_main.module_manager.save_module_timing_trace(filename)
+            except:
+                self.log.exception(f'Unable to save module timing trace to "{filename}":')
+
     def new_configuration(self):
         """ Prompt the user to open the graphical config editor in a subprocess in order to
         edit/create config files for qudi.
@@ -76,6 +76,12 @@ class QudiMainWindow(QtWidgets.QMainWindow):
         self.action_load_all_modules.setText('Load all modules')
         self.action_load_all_modules.setToolTip('Load all available modules found in configuration')
         # quit action
+        self.action_save_module_timing_trace = QtWidgets.QAction()
+        self.action_save_module_timing_trace.setIcon(
+            QtGui.QIcon(os.path.join(icon_path, 'document-save')))
+        self.action_save_module_timing_trace.setText('Save module timing trace')
+        self.action_save_module_timing_trace.setToolTip(
+            'Save durations of module loading, activation and deactivation as Chrome trace file')
         self.action_quit = QtWidgets.QAction()
         self.action_quit.setIcon(QtGui.QIcon(os.path.join(icon_path, 'application-exit')))
         self.action_quit.setText('Quit qudi')
@@ -146,6 +152,7 @@ class QudiMainWindow(QtWidgets.QMainWindow):
         menu.addAction(self.action_reload_qudi)
         menu.addSeparator()
         menu.addAction(self.action_load_all_modules)
+        menu.addAction(self.action_save_module_timing_trace)
         menu.addSeparator()
         menu.addAction(self.action_settings)
         menu.addSeparator()
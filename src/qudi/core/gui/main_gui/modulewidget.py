@@ -23,6 +23,7 @@ import os
 from PySide2 import QtCore, QtGui, QtWidgets
 from qudi.util.paths import get_artwork_dir
 from qudi.util.mutex import Mutex
+from qudi.core.moduletiming import LIFECYCLE_PHASES
 
 
 class ModuleFrameWidget(QtWidgets.QWidget):
@@ -80,6 +81,8 @@ class ModuleFrameWidget(QtWidgets.QWidget):
         self.setLayout(layout)
 
         self._module_name = ''
+        self._module_state = ''
+        self._module_timings = dict()
         if module_name:
             self.set_module_name(module_name)
 
@@ -116,11 +119,33 @@ class ModuleFrameWidget(QtWidgets.QWidget):
             self.reload_button.setEnabled(True)
             if not self.activate_button.isChecked():
                 self.activate_button.setChecked(True)
-        self.status_label.setText('Module is {0}'.format(state))
+        self._module_state = state
+        self._update_status_label()
 
     def set_module_app_data(self, exists):
         self.cleanup_button.setEnabled(exists)
 
+    def set_module_timings(self, timings):
+        """ Show the latest lifecycle phase durations (dict of durations in seconds by phase name)
+        """
+        self._module_timings = dict() if timings is None else timings
+        self._update_status_label()
+
+    def _update_status_label(self):
+        text = 'Module is {0}'.format(self._module_state)
+        activation_time = self._module_timings.get('activate', None)
+        if activation_time is not None:
+            text += ' (activated in {0:.3g} s)'.format(activation_time)
+        self.status_label.setText(text)
+        if self._module_timings:
+            phases = [phase for phase in LIFECYCLE_PHASES if phase in self._module_timings]
+            phases.extend(phase for phase in self._module_timings if phase not in phases)
+            self.status_label.setToolTip('\n'.join(
+                '{0}: {1:.3f} s'.format(phase, self._module_timings[phase]) for phase in phases
+            ))
+        else:
+            self.status_label.setToolTip('Displays module status information')
+
     @QtCore.Slot()
     def activate_clicked(self):
         self.sigActivateClicked.emit(self._module_name)
@@ -146,6 +171,7 @@ class ModuleListModel(QtCore.QAbstractListModel):
         self._lock = Mutex()
         self._module_states = dict()
         self._module_app_data = dict()
+        self._module_timings = dict()
         self._module_names = list()
 
     def rowCount(self, parent):
@@ -160,8 +186,9 @@ class ModuleListModel(QtCore.QAbstractListModel):
         name = self._module_names[row]
         state = self._module_states[name]
         app_data = self._module_app_data[name]
+        timings = self._module_timings.get(name, dict())
         if role == QtCore.Qt.DisplayRole:
-            return name, state, app_data
+            return name, state, app_data, timings
 
     def flags(self, index):
         return QtCore.Qt.ItemNeverHasChildren | QtCore.Qt.ItemIsEnabled
@@ -185,15 +212,17 @@ class ModuleListModel(QtCore.QAbstractListModel):
             del self._module_names[row]
             del self._module_states[name]
             del self._module_app_data[name]
+            self._module_timings.pop(name, None)
             self.endRemoveRows()
 
-    def reset_modules(self, state_dict, app_data_dict):
+    def reset_modules(self, state_dict, app_data_dict, timings_dict=None):
         if set(state_dict) != set(app_data_dict):
             raise RuntimeError('state_dict and app_data_dict must contain exactly the same keys.')
         with self._lock:
             self.beginResetModel()
             self._module_states = state_dict.copy()
             self._module_app_data = app_data_dict.copy()
+            self._module_timings = dict() if timings_dict is None else timings_dict.copy()
             self._module_names = list(state_dict)
             self.endResetModel()
 
@@ -221,6 +250,17 @@ class ModuleListModel(QtCore.QAbstractListModel):
             row = self._module_names.index(name)
             self.dataChanged.emit(self.createIndex(row, 0), self.createIndex(row, 0))
 
+    def change_module_timings(self, name, timings):
+        with self._lock:
+            if name not in self._module_states:
+                raise RuntimeError(
+                    f'Can not change module timings in ModuleListModel. No module by the name '
+                    f'"{name}" found.'
+                )
+            self._module_timings[name] = timings
+            row = self._module_names.index(name)
+            self.dataChanged.emit(self.createIndex(row, 0), self.createIndex(row, 0))
+
 
 class ModuleListItemDelegate(QtWidgets.QStyledItemDelegate):
     """
@@ -251,6 +291,7 @@ class ModuleListItemDelegate(QtWidgets.QStyledItemDelegate):
             editor.set_module_name(data[0])
             editor.set_module_state(data[1])
             editor.set_module_app_data(data[2])
+            editor.set_module_timings(data[3])
 
     def setModelData(self, editor, model, index):
         pass
@@ -261,10 +302,11 @@ class ModuleListItemDelegate(QtWidgets.QStyledItemDelegate):
     def paint(self, painter, option, index):
         """
         """
-        name, state, app_data = index.data()
+        name, state, app_data, timings = index.data()
         self.render_widget.set_module_name(name)
         self.render_widget.set_module_state(state)
         self.render_widget.set_module_app_data(app_data)
+        self.render_widget.set_module_timings(timings)
         self.render_widget.setGeometry(option.rect)
         painter.save()
         painter.translate(option.rect.topLeft())
@@ -335,6 +377,8 @@ class ModuleWidget(QtWidgets.QTabWidget):
             model.reset_modules(
                 {name: mod.state for name, mod in modules_dict.items() if mod.module_base == base},
                 {name: mod.has_app_data for name, mod in modules_dict.items() if
+                 mod.module_base == base},
+                {name: mod.timings for name, mod in modules_dict.items() if
                  mod.module_base == base}
             )
         return
@@ -346,3 +390,7 @@ class ModuleWidget(QtWidgets.QTabWidget):
     @QtCore.Slot(str, str, bool)
     def update_module_app_data(self, base, name, exists):
         self.list_models[base].change_app_data(name, exists)
+
+    @QtCore.Slot(str, str, dict)
+    def update_module_timings(self, base, name, timings):
+        self.list_models[base].change_module_timings(name, timings)
@@ -21,20 +21,26 @@ If not, see <https://www.gnu.org/licenses/>.
 import logging
 import os
 import copy
+import time
 import uuid
 from abc import abstractmethod
 from uuid import uuid4
 from fysom import Fysom
-from PySide2 import QtCore, QtGui, QtWidgets
-from typing import Any, Mapping, Optional, Callable, Union, Dict
+from PySide2 import QtCore, QtGui
+from typing import Any, Mapping, Optional, Callable, Union, Dict, TYPE_CHECKING
 
 from qudi.core.configoption import MissingOption
-from qudi.core.statusvariable import StatusVar
+from qudi.core.statusvariable import StatusVar, load_status_variables, dump_status_variables
+from qudi.core.statusvariable import get_status_variables_digest
 from qudi.util.paths import get_module_app_data_path, get_daily_directory, get_default_data_dir
-from qudi.util.yaml import yaml_load, yaml_dump
 from qudi.core.meta import ModuleMeta
+from qudi.core.moduletiming import module_timing_recorder
 from qudi.core.logger import get_logger
 
+if TYPE_CHECKING:
+    # Only needed for annotations. Avoid importing QtWidgets in headless qudi.
+    from PySide2 import QtWidgets
+
 
 class ModuleStateMachine(Fysom, QtCore.QObject):
     """
@@ -111,6 +117,8 @@ class Base(QtCore.QObject, metaclass=ModuleMeta):
     * Reload module data (from saved variables)
     """
     _threaded = False
+    # Set True in subclasses to memory-map large status variable arrays instead of loading them
+    _mmap_status_arrays = False
 
     # FIXME: This __new__ implementation has the sole purpose to circumvent a known PySide2(6) bug.
     #  See https://bugreports.qt.io/browse/PYSIDE-1434 for more details.
@@ -297,8 +305,10 @@ class Base(QtCore.QObject, metaclass=ModuleMeta):
         """ Restore status variables before activation and invoke on_activate method.
         """
         try:
-            self._load_status_variables()
-            self.on_activate()
+            with module_timing_recorder.measure(self.module_name, 'status_load'):
+                self._load_status_variables()
+            with module_timing_recorder.measure(self.module_name, 'on_activate'):
+                self.on_activate()
         except:
             self.log.exception('Exception during activation:')
             return False
@@ -309,12 +319,14 @@ class Base(QtCore.QObject, metaclass=ModuleMeta):
         fails.
         """
         try:
-            self.on_deactivate()
+            with module_timing_recorder.measure(self.module_name, 'on_deactivate'):
+                self.on_deactivate()
         except:
             self.log.exception('Exception during deactivation:')
         finally:
             # save status variables even if deactivation failed
-            self._dump_status_variables()
+            with module_timing_recorder.measure(self.module_name, 'status_dump'):
+                self._dump_status_variables()
         return True
 
     def _load_status_variables(self) -> None:
@@ -325,7 +337,7 @@ class Base(QtCore.QObject, metaclass=ModuleMeta):
                                              self.module_base,
                                              self.module_name)
         try:
-            variables = yaml_load(file_path, ignore_missing=True)
+            variables = load_status_variables(file_path, mmap=self._mmap_status_arrays)
         except:
             variables = dict()
             self.log.exception('Failed to load status variables:')
@@ -345,16 +357,23 @@ class Base(QtCore.QObject, metaclass=ModuleMeta):
 
         This method can also be used to manually dump status variables independent of the automatic
         dump during module deactivation.
+        Large numpy arrays are saved in a binary .npz file alongside the status variable file.
+        Writing the file is skipped if the values did not change since the last dump (e.g. by the
+        status variable autosave).
         """
         file_path = get_module_app_data_path(self.__class__.__name__,
                                              self.module_base,
                                              self.module_name)
         # collect StatusVar values into dictionary
+        snapshot_time = time.monotonic()
         variables = self.module_status_variables
         # Save to file if any StatusVars have been found
         if variables:
             try:
-                yaml_dump(file_path, variables)
+                dump_status_variables(file_path,
+                                      variables,
+                                      snapshot_time=snapshot_time,
+                                      digest=get_status_variables_digest(variables))
             except:
                 self.log.exception('Failed to save status variables:')
 
@@ -445,7 +464,7 @@ class GuiBase(Base):
     def show(self) -> None:
         raise NotImplementedError('Every GUI module needs to implement the show() method!')
 
-    def _save_window_geometry(self, window: QtWidgets.QMainWindow) -> None:
+    def _save_window_geometry(self, window: 'QtWidgets.QMainWindow') -> None:
         try:
             self.__window_geometry = window.saveGeometry().toHex().data().decode('utf-8')
         except:
@@ -457,7 +476,7 @@ class GuiBase(Base):
             self.log.exception('Unable to save window geometry:')
             self.__window_state = None
 
-    def _restore_window_geometry(self, window: QtWidgets.QMainWindow) -> bool:
+    def _restore_window_geometry(self, window: 'QtWidgets.QMainWindow') -> bool:
         if isinstance(self.__window_geometry, str):
             try:
                 encoded = QtCore.QByteArray(self.__window_geometry.encode('utf-8'))
@@ -20,12 +20,17 @@ If not, see <https://www.gnu.org/licenses/>.
 """
 
 import os
+import time
 import importlib
 import copy
 import weakref
+import threading
+import itertools
 import fysom
 
-from typing import FrozenSet, Iterable
+from typing import FrozenSet, Iterable, Optional, Dict, List
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from functools import partial
 from PySide2 import QtCore
 
@@ -33,10 +38,63 @@ from qudi.util.mutex import RecursiveMutex   # provides access serialization bet
 from qudi.core.logger import get_logger
 from qudi.core.servers import get_remote_module_instance
 from qudi.core.module import Base, get_module_app_data_path
+from qudi.core.statusvariable import get_status_array_file_path
+from qudi.core.moduletiming import module_timing_recorder, ModuleTimingRecord
 
 logger = get_logger(__name__)
 
 
+class _DaemonThreadExecutor:
+    """ Minimal executor running each submitted call in a new daemon thread. In contrast to
+    concurrent.futures.ThreadPoolExecutor, calls that never return (e.g. hung module state
+    transitions) do not block the interpreter shutdown.
+    """
+
+    def __init__(self, thread_name_prefix: str = ''):
+        self._thread_name_prefix = thread_name_prefix
+        self._counter = itertools.count()
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        future = Future()
+
+        def run():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as err:
+                future.set_exception(err)
+            else:
+                future.set_result(result)
+
+        threading.Thread(target=run,
+                         name=f'{self._thread_name_prefix}_{next(self._counter):d}',
+                         daemon=True).start()
+        return future
+
+
+def _sort_levels(predecessors: Dict[str, set]) -> List[List[str]]:
+    """ Sorts names into levels. Each name is placed in the level following the last level
+    containing one of its predecessors.
+
+    @param dict predecessors: sets of predecessor names by name
+    @return list: lists of names for each level
+    """
+    predecessors = {name: set(pre) for name, pre in predecessors.items()}
+    levels = list()
+    sorted_names = set()
+    while predecessors:
+        level = sorted(name for name, pre in predecessors.items() if pre <= sorted_names)
+        if not level:
+            raise RuntimeError(f'Circular module dependencies encountered between modules '
+                               f'{sorted(predecessors)}')
+        for name in level:
+            del predecessors[name]
+        sorted_names.update(level)
+        levels.append(level)
+    return levels
+
+
 class ModuleManager(QtCore.QObject):
     """
     """
@@ -97,6 +155,29 @@ class ModuleManager(QtCore.QObject):
                 self.remove_module(module_name, ignore_missing=True, emit_change=False)
             self.sigManagedModulesChanged.emit(self.modules)
 
+    def prune_modules(self, configurations, emit_change=True):
+        """ Removes all modules that are not contained in the given module configurations or
+        whose module base or configuration differs from the given one. Active modules depending on
+        a removed module are deactivated. All other modules are left untouched and keep their
+        state and module connections.
+
+        @param dict configurations: (base, configuration) tuples by module name
+        @param bool emit_change: optional, flag indicating if sigManagedModulesChanged should be
+                                 emitted if modules have been removed (default: True)
+        @return list: names of the removed modules
+        """
+        with self._lock:
+            removed = list()
+            for module_name, module in tuple(self._modules.items()):
+                base, configuration = configurations.get(module_name, (None, None))
+                if not module.has_configuration(base, configuration):
+                    removed.append(module_name)
+                    # Deactivation of a module also deactivates all depending modules
+                    self.remove_module(module_name, ignore_missing=True, emit_change=False)
+            if removed and emit_change:
+                self.sigManagedModulesChanged.emit(self.modules)
+            return removed
+
     def get(self, *args):
         with self._lock:
             return self._modules.get(*args)
@@ -130,12 +211,44 @@ class ModuleManager(QtCore.QObject):
     def modules(self):
         return self._modules.copy()
 
+    @property
+    def module_timings(self) -> Dict[str, Dict[str, float]]:
+        """ Latest recorded duration in seconds of each lifecycle phase (see
+        qudi.core.moduletiming.LIFECYCLE_PHASES) by module name. Contains all managed modules.
+        """
+        with self._lock:
+            timings = module_timing_recorder.get_timings()
+            return {name: timings.get(name, dict()) for name in self._modules}
+
+    def get_module_timing_records(self,
+                                  module_name: Optional[str] = None) -> List[ModuleTimingRecord]:
+        """ Returns all recorded lifecycle phase durations (of a single module) in the order
+        they have been recorded.
+
+        @param str module_name: optional, name of the module to get records for (default: all)
+        @return list: ModuleTimingRecord instances
+        """
+        return module_timing_recorder.get_records(module_name)
+
+    def save_module_timing_trace(self, file_path: str) -> None:
+        """ Saves all recorded lifecycle phase durations to a JSON file in Chrome trace event
+        format (see qudi.core.moduletiming.ModuleTimingRecorder.to_chrome_trace).
+
+        @param str file_path: path of the JSON file to create
+        """
+        module_timing_recorder.save_chrome_trace(file_path)
+
     def remove_module(self, module_name, ignore_missing=False, emit_change=True):
         with self._lock:
             module = self._modules.pop(module_name, None)
-            if module is None and not ignore_missing:
+            if module is None:
+                if ignore_missing:
+                    return
                 raise KeyError(f'No module with name "{module_name}" registered.')
-            module.deactivate()
+            try:
+                module.deactivate()
+            except:
+                logger.exception(f'Unable to deactivate module "{module_name}" upon removal:')
             module.sigStateChanged.disconnect(self.sigModuleStateChanged)
             module.sigAppDataChanged.disconnect(self.sigModuleAppDataChanged)
             if module.allow_remote_access:
@@ -207,6 +320,219 @@ class ModuleManager(QtCore.QObject):
                                f'Module activation aborted.')
             self._modules[module_name].activate()
 
+    def get_dependency_levels(self, module_names: Iterable[str]) -> List[List[str]]:
+        """ Sorts the given modules and all modules they (recursively) require into topological
+        dependency levels. Modules of one level only require modules of preceding levels.
+
+        @param iterable module_names: names of the modules to sort
+        @return list: lists of module names for each dependency level
+        """
+        with self._lock:
+            required = dict()
+            pending = list(module_names)
+            while pending:
+                name = pending.pop()
+                if name in required:
+                    continue
+                if name not in self._modules:
+                    raise KeyError(f'No module named "{name}" found in managed qudi modules.')
+                required[name] = {ref().name for ref in self._modules[name].required_modules if
+                                  ref() is not None}
+                pending.extend(required[name])
+            return _sort_levels(required)
+
+    def activate_modules(self, module_names: Iterable[str],
+                         parallel: bool = True) -> Dict[str, Optional[Exception]]:
+        """ Activates the given modules and all modules they require level by level (see
+        get_dependency_levels). A module is only activated after all its required modules have
+        been activated successfully.
+
+        If parallel is True, the threaded modules of one dependency level are activated
+        concurrently in their respective module threads. Non-threaded modules are always
+        activated one after another in the main thread.
+        Must be called from the main thread.
+
+        @param iterable module_names: names of the modules to activate
+        @param bool parallel: optional, flag indicating if threaded modules of the same dependency
+                              level should be activated concurrently (default: True)
+        @return dict: Exception raised during activation by module name (None if successful)
+        """
+        if QtCore.QThread.currentThread() is not self.thread():
+            raise RuntimeError('ModuleManager.activate_modules must be called from the main '
+                               'thread.')
+
+        results = dict()
+        with self._lock:
+            module_names = list(module_names)
+            for name in module_names:
+                if name not in self._modules:
+                    results[name] = KeyError(f'No module named "{name}" found in managed qudi '
+                                             f'modules. Module activation aborted.')
+            try:
+                levels = self.get_dependency_levels(n for n in module_names if n not in results)
+            except RuntimeError as err:
+                for name in module_names:
+                    results.setdefault(name, err)
+                return results
+
+            executor = _DaemonThreadExecutor('module-activation') if parallel else None
+            for level in levels:
+                self._activate_dependency_level(level, results, executor)
+            return results
+
+    def _activate_dependency_level(self, level, results, executor=None):
+        # Prepare activation (i.e. load modules) of all modules in this level whose required
+        # modules have been activated successfully
+        prepared = list()
+        for name in level:
+            module = self._modules[name]
+            failed = sorted(ref().name for ref in module.required_modules if
+                            ref() is not None and results.get(ref().name, None) is not None)
+            if failed:
+                results[name] = RuntimeError(f'Unable to activate module "{name}". Required '
+                                             f'module(s) {failed} failed to activate.')
+                continue
+            try:
+                if module._prepare_activation():
+                    prepared.append(module)
+                else:
+                    results[name] = None
+            except Exception as err:
+                results[name] = err
+        # Start threaded modules first so they can run concurrently to main thread activations
+        prepared.sort(key=lambda mod: not mod.instance.is_module_threaded)
+        started = list()
+        for module in prepared:
+            try:
+                started.append((module, module._start_activation(executor)))
+            except Exception as err:
+                results[module.name] = err
+        # Wait for all activations to finish
+        for module, future in started:
+            try:
+                module._finish_activation(future)
+            except Exception as err:
+                results[module.name] = err
+            else:
+                results[module.name] = None
+
+    def get_shutdown_levels(self, module_names: Iterable[str]) -> List[List[str]]:
+        """ Sorts the given active modules and all active modules (recursively) depending on them
+        into reverse topological dependency levels. Modules of one level are only required by
+        modules of preceding levels. Inactive modules are omitted.
+
+        @param iterable module_names: names of the modules to sort
+        @return list: lists of module names for each shutdown level
+        """
+        with self._lock:
+            dependent = dict()
+            pending = list(module_names)
+            while pending:
+                name = pending.pop()
+                if name in dependent:
+                    continue
+                if name not in self._modules:
+                    raise KeyError(f'No module named "{name}" found in managed qudi modules.')
+                module = self._modules[name]
+                if not module.is_active:
+                    continue
+                dependent[name] = {ref().name for ref in module.dependent_modules if
+                                   ref() is not None and ref().is_active}
+                pending.extend(dependent[name])
+            return _sort_levels(dependent)
+
+    def deactivate_modules(self, module_names: Iterable[str], parallel: bool = True,
+                           timeout: Optional[float] = None) -> Dict[str, Optional[Exception]]:
+        """ Deactivates the given modules and all modules depending on them level by level (see
+        get_shutdown_levels). A module is only deactivated after all modules depending on it have
+        been deactivated (or failed to deactivate).
+
+        If parallel is True, the threaded modules of one level are deactivated concurrently in
+        their respective module threads. Non-threaded modules are always deactivated one after
+        another in the main thread.
+        Threaded modules not finishing deactivation within <timeout> seconds are reported with
+        TimeoutError and their status variables are saved regardless. Non-threaded modules can
+        not be interrupted and are only logged if they exceed the timeout.
+        Must be called from the main thread.
+
+        @param iterable module_names: names of the modules to deactivate
+        @param bool parallel: optional, flag indicating if threaded modules of the same level
+                              should be deactivated concurrently (default: True)
+        @param float timeout: optional, time budget in seconds for each module (default: None)
+        @return dict: Exception raised during deactivation by module name (None if successful)
+        """
+        if QtCore.QThread.currentThread() is not self.thread():
+            raise RuntimeError('ModuleManager.deactivate_modules must be called from the main '
+                               'thread.')
+
+        results = dict()
+        with self._lock:
+            module_names = list(module_names)
+            for name in module_names:
+                if name not in self._modules:
+                    results[name] = KeyError(f'No module named "{name}" found in managed qudi '
+                                             f'modules. Module deactivation aborted.')
+            try:
+                levels = self.get_shutdown_levels(n for n in module_names if n not in results)
+            except RuntimeError as err:
+                for name in module_names:
+                    results.setdefault(name, err)
+                return results
+
+            executor = _DaemonThreadExecutor('module-deactivation') if parallel else None
+            for level in levels:
+                self._deactivate_shutdown_level(level, results, executor, timeout)
+            timed_out = sorted(name for name, err in results.items() if
+                               isinstance(err, TimeoutError))
+            if timed_out:
+                logger.error(f'Modules exceeding their deactivation time budget of {timeout:.3g} '
+                             f's: {timed_out}')
+            return results
+
+    def _deactivate_shutdown_level(self, level, results, executor=None, timeout=None):
+        # Prepare deactivation of all modules in this level
+        prepared = list()
+        for name in level:
+            module = self._modules[name]
+            try:
+                if module._prepare_deactivation():
+                    prepared.append(module)
+                else:
+                    results[name] = None
+            except Exception as err:
+                results[name] = err
+        # Start threaded modules first so they can run concurrently to main thread deactivations
+        prepared.sort(key=lambda mod: not mod.instance.is_module_threaded)
+        started = list()
+        for module in prepared:
+            start = time.perf_counter()
+            try:
+                future = module._start_deactivation(executor)
+            except Exception as err:
+                results[module.name] = err
+                continue
+            if future is None and timeout is not None:
+                elapsed = time.perf_counter() - start
+                if elapsed > timeout:
+                    logger.warning(f'Deactivation of module "{module.name}" took {elapsed:.3g} s '
+                                   f'and exceeded its time budget of {timeout:.3g} s')
+            started.append((module, future, start + (float('inf') if timeout is None else timeout)))
+        # Wait for all deactivations to finish
+        for module, future, deadline in started:
+            remaining = None if timeout is None else max(0., deadline - time.perf_counter())
+            try:
+                module._finish_deactivation(future, timeout=remaining)
+            except TimeoutError:
+                # Report original time budget
+                results[module.name] = TimeoutError(
+                    f'Deactivation of {module.module_base} module "{module.name}" did not finish '
+                    f'within {timeout:.3g} s'
+                )
+            except Exception as err:
+                results[module.name] = err
+            else:
+                results[module.name] = None
+
     def deactivate_module(self, module_name):
         if QtCore.QThread.currentThread() is not self.thread():
             self.current_module_name = module_name
@@ -247,10 +573,29 @@ class ModuleManager(QtCore.QObject):
             for module in self._modules.values():
                 module.activate()
 
-    def stop_all_modules(self):
+    def stop_all_modules(self, parallel: bool = True,
+                         timeout: Optional[float] = None) -> Dict[str, Optional[Exception]]:
+        """ Deactivates all active modules in reverse dependency order. Failures are logged.
+        See deactivate_modules for the meaning of the arguments.
+
+        @return dict: Exception raised during deactivation by module name (None if successful)
+        """
+        if QtCore.QThread.currentThread() is not self.thread():
+            self._stop_all_modules_args = (parallel, timeout)
+            QtCore.QMetaObject.invokeMethod(self,
+                                            '_stop_all_modules_slot',
+                                            QtCore.Qt.BlockingQueuedConnection)
+            results = self._stop_all_modules_results
+            if isinstance(results, Exception):
+                raise results
+            return results
+
         with self._lock:
-            for module in self._modules.values():
-                module.deactivate()
+            results = self.deactivate_modules(self._modules, parallel=parallel, timeout=timeout)
+        for name, error in results.items():
+            if error is not None:
+                logger.error(f'Unable to deactivate module "{name}":', exc_info=error)
+        return results
 
     def _module_ref_dead_callback(self, dead_ref, module_name):
         self.remove_module(module_name, ignore_missing=True)
@@ -274,6 +619,18 @@ class ModuleManager(QtCore.QObject):
         """
         self.deactivate_module(self.current_module_name)
 
+    @QtCore.Slot()
+    def _stop_all_modules_slot(self):
+        """
+        Helper slot that should only be called by stop_all_modules when this method is switching to the main thread.
+        """
+        parallel, timeout = self._stop_all_modules_args
+        try:
+            self._stop_all_modules_results = self.stop_all_modules(parallel=parallel,
+                                                                   timeout=timeout)
+        except Exception as err:
+            self._stop_all_modules_results = err
+
 
 class ManagedModule(QtCore.QObject):
     """ Object representing a qudi module (gui, logic or hardware) to be managed by the qudi Manager
@@ -305,6 +662,8 @@ class ManagedModule(QtCore.QObject):
         self._instance = None  # Store the module instance later on
 
         cfg = copy.deepcopy(configuration)
+        # Remember the complete configuration in order to detect configuration changes
+        self._configuration = copy.deepcopy(cfg)
 
         # Extract module and class name
         self._module, self._class = cfg.get(
@@ -336,6 +695,9 @@ class ManagedModule(QtCore.QObject):
 
         self.__poll_timer = None
         self.__last_state = None
+        self.__pending_deactivation = None  # Future of a timed out deactivation
+        self.__activation_start = None  # Start time of a running activation
+        self.__deactivation_start = None  # Start time of a running deactivation
 
     def __call__(self):
         return self.instance
@@ -360,6 +722,25 @@ class ManagedModule(QtCore.QObject):
     def options(self):
         return copy.deepcopy(self._options)
 
+    @property
+    def configuration(self):
+        return copy.deepcopy(self._configuration)
+
+    def has_configuration(self, base, configuration) -> bool:
+        """ Checks if this module has been created with the given module base and configuration.
+
+        @param str base: qudi module base to compare ("gui", "logic" or "hardware")
+        @param dict configuration: module configuration to compare
+        @return bool: True if base and configuration are equal, False otherwise
+        """
+        if base != self._base:
+            return False
+        try:
+            return bool(configuration == self._configuration)
+        except Exception:
+            # Values can not be compared (e.g. numpy arrays in options). Assume a change.
+            return False
+
     @property
     def instance(self):
         with self._lock:
@@ -475,6 +856,11 @@ class ManagedModule(QtCore.QObject):
                         active_dependent_modules.add(module_ref)
             return active_dependent_modules
 
+    @property
+    def timings(self) -> Dict[str, float]:
+        """ Latest recorded duration in seconds of each lifecycle phase of this module """
+        return module_timing_recorder.get_timings(self._name).get(self._name, dict())
+
     @property
     def module_thread_name(self):
         return f'mod-{self._base}-{self._name}'
@@ -489,6 +875,7 @@ class ManagedModule(QtCore.QObject):
         with self._lock:
             try:
                 os.remove(self.status_file_path)
+                os.remove(get_status_array_file_path(self.status_file_path))
             except OSError:
                 pass
             finally:
@@ -504,6 +891,27 @@ class ManagedModule(QtCore.QObject):
             return
 
         with self._lock:
+            if not self._prepare_activation():
+                return
+
+            # Recursive activation of required modules
+            for module_ref in self.required_modules:
+                module = module_ref()
+                if module is None:
+                    raise ReferenceError(f'Dead required module weakref encountered in '
+                                         f'ManagedModule "{self._name}".')
+                module.activate()
+
+            self._finish_activation(self._start_activation())
+
+    def _prepare_activation(self) -> bool:
+        """ First stage of module activation. Loads the module if needed.
+        Must be called from the main thread.
+
+        @return bool: False if the module is already active, True otherwise
+        """
+        with self._lock:
+            start = time.perf_counter()
             if not self.is_loaded:
                 self._load()
 
@@ -516,33 +924,44 @@ class ManagedModule(QtCore.QObject):
                     logger.info(f'Activating remote {self.module_base} module "{self.remote_url}"')
                 if self.is_remote:
                     logger.info(f'Activating remote {self.module_base} module "{self.remote_url}"')
-                return
-
-
-
+                return False
             else:
                 logger.info(
                     f'Activating {self.module_base} module "{self.module_name}.{self.class_name}"'
                 )
+            self.__activation_start = start
+            return True
 
-            # Recursive activation of required modules
-            for module_ref in self.required_modules:
-                module = module_ref()
-                if module is None:
-                    raise ReferenceError(f'Dead required module weakref encountered in '
-                                         f'ManagedModule "{self._name}".')
-                module.activate()
+    def _start_activation(self, executor=None) -> Optional[Future]:
+        """ Second stage of module activation. Connects the module and runs the module state
+        transition. All required modules must be active already. Must be called from the main
+        thread.
 
+        Threaded modules are moved to their own thread. If an executor is given, the state
+        transition of threaded modules is triggered by a worker of this executor and this method
+        returns immediately, so multiple threaded modules can be activated concurrently.
+
+        @param concurrent.futures.Executor executor: optional, executor to run the blocking
+                                                     activation call of threaded modules in
+        @return Future: Future of the threaded module activation. None if already finished.
+        """
+        with self._lock:
             # Establish module interconnections via Connector meta object in qudi module instance
             self._connect()
 
             # Activate this module
             if self._instance.is_module_threaded:
-                thread_name = self.module_thread_name
-                thread_manager = self._qudi_main_ref().thread_manager
-                thread = thread_manager.get_new_thread(thread_name)
-                self._instance.moveToThread(thread)
-                thread.start()
+                with module_timing_recorder.measure(self._name, 'thread'):
+                    thread_name = self.module_thread_name
+                    thread_manager = self._qudi_main_ref().thread_manager
+                    thread = thread_manager.get_new_thread(thread_name)
+                    self._instance.moveToThread(thread)
+                    thread.start()
+                if executor is not None:
+                    return executor.submit(QtCore.QMetaObject.invokeMethod,
+                                           self._instance.module_state,
+                                           'activate',
+                                           QtCore.Qt.BlockingQueuedConnection)
                 try:
                     QtCore.QMetaObject.invokeMethod(self._instance.module_state,
                                                     'activate',
@@ -550,16 +969,31 @@ class ManagedModule(QtCore.QObject):
                 finally:
                     # Cleanup if activation was not successful
                     if not self.is_active:
-                        QtCore.QMetaObject.invokeMethod(self._instance,
-                                                        'move_to_main_thread',
-                                                        QtCore.Qt.BlockingQueuedConnection)
-                        thread_manager.quit_thread(thread_name)
-                        thread_manager.join_thread(thread_name)
+                        self._quit_module_thread()
             else:
                 try:
                     self._instance.module_state.activate()
                 except fysom.Canceled:
                     pass
+            return None
+
+    def _finish_activation(self, future: Optional[Future] = None) -> None:
+        """ Last stage of module activation. Waits for the state transition started by
+        _start_activation, cleans up unsuccessful activations and notifies about the new module
+        state. Must be called from the main thread.
+
+        @param Future future: optional, Future returned by _start_activation
+        """
+        with self._lock:
+            if future is not None:
+                try:
+                    future.result()
+                finally:
+                    # Cleanup if activation was not successful
+                    if not self.is_active:
+                        self._quit_module_thread()
+            self._record_phase('activate', self.__activation_start)
+            self.__activation_start = None
 
             self.__last_state = self.state
             self.sigStateChanged.emit(self._base, self._name, self.__last_state)
@@ -582,6 +1016,26 @@ class ManagedModule(QtCore.QObject):
             self._instance.module_state.sigStateChanged.connect(self._state_change_callback)
 
 
+    def _record_phase(self, phase: str, start: Optional[float]) -> None:
+        """ Records the duration of a lifecycle phase of this module that started at <start>
+        (time.perf_counter) and ends now. Does nothing if start is None.
+        """
+        if start is not None:
+            module_timing_recorder.add_record(self._name,
+                                              phase,
+                                              start,
+                                              time.perf_counter() - start)
+
+    def _quit_module_thread(self) -> None:
+        """ Moves the module instance back to the main thread and stops the module thread """
+        thread_name = self.module_thread_name
+        thread_manager = self._qudi_main_ref().thread_manager
+        QtCore.QMetaObject.invokeMethod(self._instance,
+                                        'move_to_main_thread',
+                                        QtCore.Qt.BlockingQueuedConnection)
+        thread_manager.quit_thread(thread_name)
+        thread_manager.join_thread(thread_name)
+
     @QtCore.Slot(object)
     def _state_change_callback(self, event=None):
         self.sigStateChanged.emit(self._base, self._name, self.state)
@@ -596,16 +1050,9 @@ class ManagedModule(QtCore.QObject):
             return
 
         with self._lock:
-            if not self.is_active:
+            if not self._prepare_deactivation():
                 return
 
-            if self.is_remote:
-                logger.info(f'Deactivating remote {self.module_base} module "{self.remote_url}"')
-            else:
-                logger.info(
-                    f'Deactivating {self.module_base} module "{self.module_name}.{self.class_name}"'
-                )
-
             # Recursively deactivate dependent modules
             for module_ref in self.dependent_modules:
                 module = module_ref()
@@ -615,6 +1062,47 @@ class ManagedModule(QtCore.QObject):
                     )
                 module.deactivate()
 
+            self._finish_deactivation(self._start_deactivation())
+
+    def _prepare_deactivation(self) -> bool:
+        """ First stage of module deactivation. Must be called from the main thread.
+
+        @return bool: False if the module is not active, True otherwise
+        """
+        with self._lock:
+            # Finish a previously timed out deactivation
+            if self.__pending_deactivation is not None:
+                if not self.__pending_deactivation.done():
+                    raise RuntimeError(f'Deactivation of {self.module_base} module "{self.name}" '
+                                       f'timed out before and is still pending.')
+                future, self.__pending_deactivation = self.__pending_deactivation, None
+                self._finish_deactivation(future)
+
+            if not self.is_active:
+                return False
+
+            if self.is_remote:
+                logger.info(f'Deactivating remote {self.module_base} module "{self.remote_url}"')
+            else:
+                logger.info(
+                    f'Deactivating {self.module_base} module "{self.module_name}.{self.class_name}"'
+                )
+            self.__deactivation_start = time.perf_counter()
+            return True
+
+    def _start_deactivation(self, executor=None) -> Optional[Future]:
+        """ Second stage of module deactivation. Runs the module state transition. All dependent
+        modules must be deactivated already. Must be called from the main thread.
+
+        If an executor is given, the state transition of threaded modules is triggered by a
+        worker of this executor and this method returns immediately, so multiple threaded modules
+        can be deactivated concurrently.
+
+        @param concurrent.futures.Executor executor: optional, executor to run the blocking
+                                                     deactivation call of threaded modules in
+        @return Future: Future of the threaded module deactivation. None if already finished.
+        """
+        with self._lock:
             # Disable state updated
 
             if not self.is_remote:
@@ -623,27 +1111,64 @@ class ManagedModule(QtCore.QObject):
 
             # Actual deactivation of this module
             if self._instance.is_module_threaded:
-                thread_name = self.module_thread_name
-                thread_manager = self._qudi_main_ref().thread_manager
+                if executor is not None:
+                    return executor.submit(QtCore.QMetaObject.invokeMethod,
+                                           self._instance.module_state,
+                                           'deactivate',
+                                           QtCore.Qt.BlockingQueuedConnection)
                 try:
                     QtCore.QMetaObject.invokeMethod(self._instance.module_state,
                                                     'deactivate',
                                                     QtCore.Qt.BlockingQueuedConnection)
                 finally:
-                    QtCore.QMetaObject.invokeMethod(self._instance,
-                                                    'move_to_main_thread',
-                                                    QtCore.Qt.BlockingQueuedConnection)
-                    thread_manager.quit_thread(thread_name)
-                    thread_manager.join_thread(thread_name)
+                    self._quit_module_thread()
             else:
                 try:
                     self._instance.module_state.deactivate()
                 except fysom.Canceled:
                     pass
+            return None
+
+    def _finish_deactivation(self, future: Optional[Future] = None,
+                             timeout: Optional[float] = None) -> None:
+        """ Last stage of module deactivation. Waits for the state transition started by
+        _start_deactivation, disconnects the module and notifies about the new module state.
+        Must be called from the main thread.
+
+        If the state transition of a threaded module does not finish within <timeout> seconds,
+        the status variables are saved from the calling thread and TimeoutError is raised. The
+        module thread is left running in that case and the deactivation is finished by the next
+        call to deactivate.
+
+        @param Future future: optional, Future returned by _start_deactivation
+        @param float timeout: optional, time in seconds to wait for future (default: no timeout)
+        """
+        with self._lock:
+            if future is not None:
+                try:
+                    future.result(timeout=timeout)
+                except FutureTimeoutError:
+                    self.__pending_deactivation = future
+                    # Record the time until the timeout only once. Finishing the pending
+                    # deactivation later on must not add a second record.
+                    self._record_phase('deactivate', self.__deactivation_start)
+                    self.__deactivation_start = None
+                    try:
+                        self._instance._dump_status_variables()
+                    except:
+                        logger.exception(f'Unable to save status variables of module '
+                                         f'"{self.name}" after deactivation timeout:')
+                    raise TimeoutError(f'Deactivation of {self.module_base} module "{self.name}" '
+                                       f'did not finish within {timeout:.3g} s') from None
+                finally:
+                    if self.__pending_deactivation is None:
+                        self._quit_module_thread()
             QtCore.QCoreApplication.instance().processEvents()  # ToDo: Is this still needed?
 
             # Disconnect modules from this module
             self._disconnect()
+            self._record_phase('deactivate', self.__deactivation_start)
+            self.__deactivation_start = None
 
             self.__last_state = self.state
             self.sigStateChanged.emit(self._base, self._name, self.__last_state)
@@ -661,7 +1186,7 @@ class ManagedModule(QtCore.QObject):
             QtCore.QMetaObject.invokeMethod(self, 'reload', QtCore.Qt.BlockingQueuedConnection)
             return
 
-        with self._lock:
+        with self._lock, module_timing_recorder.measure(self._name, 'reload'):
             # Deactivate if active
             was_active = self.is_active
             mod_to_activate = None
@@ -687,9 +1212,11 @@ class ManagedModule(QtCore.QObject):
         """
         """
         with self._lock:
+            load_start = time.perf_counter()
             try:
                 # Do nothing if already loaded and no reload is requested
                 if self.is_loaded and not reload:
+                    load_start = None
                     return
 
                 if self.is_remote:
@@ -728,6 +1255,7 @@ class ManagedModule(QtCore.QObject):
                         raise RuntimeError(f'Error during initialization of qudi module '
                                            f'"qudi.{self._base}.{self._module}.{self._class}"')
             finally:
+                self._record_phase('load', load_start)
                 self.__last_state = self.state
                 self.sigStateChanged.emit(self._base, self._name, self.__last_state)
 
@@ -746,7 +1274,8 @@ class ManagedModule(QtCore.QObject):
                                   self._connect_cfg.items()}
 
             # Apply module connections
-            self._instance.connect_modules(module_connections)
+            with module_timing_recorder.measure(self._name, 'connect'):
+                self._instance.connect_modules(module_connections)
 
     def _disconnect(self):
         with self._lock:
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+
+"""
+This file contains a recorder for the durations of qudi module lifecycle phases (loading,
+connecting, activation, status variable handling, deactivation, ...).
+
+Copyright (c) 2021, the qudi developers. See the AUTHORS.md file at the top-level directory of this
+distribution and on <https://github.com/Ulm-IQO/qudi-core/>
+
+This file is part of qudi.
+
+Qudi is free software: you can redistribute it and/or modify it under the terms of
+the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+
+Qudi is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with qudi.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+__all__ = ['LIFECYCLE_PHASES', 'ModuleTimingRecord', 'ModuleTimingRecorder',
+           'module_timing_recorder']
+
+import os
+import json
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import NamedTuple, Optional, Dict, List, Any
+
+from qudi.util.mutex import Mutex
+
+
+# Known lifecycle phases in the order they usually occur
+LIFECYCLE_PHASES = ('load',  # import and instantiation of the module class
+                    'connect',  # connecting the module to its required modules
+                    'thread',  # creation and start of the module thread
+                    'status_load',  # loading status variables from disk
+                    'on_activate',  # on_activate method of the module
+                    'activate',  # complete module activation (including all of the above)
+                    'on_deactivate',  # on_deactivate method of the module
+                    'status_dump',  # saving status variables to disk
+                    'deactivate',  # complete module deactivation (including all of the above)
+                    'reload')  # complete module reload
+
+
+class ModuleTimingRecord(NamedTuple):
+    """ Duration of a single lifecycle phase of a qudi module """
+    module: str  # Name of the qudi module
+    phase: str  # Name of the lifecycle phase
+    start: float  # Start time (time.perf_counter) in seconds
+    duration: float  # Duration in seconds
+    thread_id: int  # Identifier of the thread the phase has been executed in
+    thread_name: str  # Name of the thread the phase has been executed in
+
+
+class ModuleTimingRecorder:
+    """ Thread-safe store of recorded qudi module lifecycle phase durations.
+
+    Keeps the <max_records> most recent records. Records can be summarized as table (latest
+    duration of each phase per module) or exported in Chrome trace event format, which can be
+    inspected with e.g. chrome://tracing, https://ui.perfetto.dev or speedscope.
+    """
+
+    def __init__(self, max_records: Optional[int] = 10000):
+        """
+        @param int max_records: optional, maximum number of records to keep (None for unlimited)
+        """
+        self._lock = Mutex()
+        self._records = deque(maxlen=max_records)
+        # Reference points to convert time.perf_counter values into wall-clock time
+        self._origin_perf_counter = time.perf_counter()
+        self._origin_time = time.time()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._records)
+
+    @contextmanager
+    def measure(self, module: str, phase: str):
+        """ Context manager recording the duration of the enclosed code block as lifecycle phase
+        <phase> of module <module>. The record is also added if the code block raises.
+
+        @param str module: name of the qudi module
+        @param str phase: name of the lifecycle phase (see LIFECYCLE_PHASES)
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_record(module, phase, start, time.perf_counter() - start)
+
+    def add_record(self, module: str, phase: str, start: float, duration: float) -> None:
+        """ Add a record for a lifecycle phase that has just been executed in the calling thread.
+
+        @param str module: name of the qudi module
+        @param str phase: name of the lifecycle phase (see LIFECYCLE_PHASES)
+        @param float start: start time of the phase as returned by time.perf_counter
+        @param float duration: duration of the phase in seconds
+        """
+        thread = threading.current_thread()
+        record = ModuleTimingRecord(module, phase, start, duration, thread.ident, thread.name)
+        with self._lock:
+            self._records.append(record)
+
+    def get_records(self, module: Optional[str] = None) -> List[ModuleTimingRecord]:
+        """ Returns all records (of a single module) in the order they have been recorded.
+
+        @param str module: optional, name of the qudi module to get records for (default: all)
+        @return list: ModuleTimingRecord instances
+        """
+        with self._lock:
+            if module is None:
+                return list(self._records)
+            return [rec for rec in self._records if rec.module == module]
+
+    def get_timings(self, module: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+        """ Returns the latest duration in seconds of each recorded lifecycle phase per module.
+
+        @param str module: optional, name of the qudi module to get timings for (default: all)
+        @return dict: Phase durations (dict) by module name
+        """
+        timings = dict()
+        for record in self.get_records(module):
+            timings.setdefault(record.module, dict())[record.phase] = record.duration
+        return timings
+
+    def clear(self, module: Optional[str] = None) -> None:
+        """ Removes all records (of a single module).
+
+        @param str module: optional, name of the qudi module to remove records for (default: all)
+        """
+        with self._lock:
+            if module is None:
+                self._records.clear()
+            else:
+                keep = [rec for rec in self._records if rec.module != module]
+                self._records.clear()
+                self._records.extend(keep)
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """ Returns all records as Chrome trace event format dict ("complete" events).
+
+        @return dict: JSON serializable trace
+        """
+        pid = os.getpid()
+        records = self.get_records()
+        events = list()
+        thread_names = dict()
+        for record in records:
+            thread_names[record.thread_id] = record.thread_name
+            events.append({
+                'name': f'{record.module}.{record.phase}',
+                'cat': record.phase,
+                'ph': 'X',
+                'ts': (record.start - self._origin_perf_counter) * 1e6,
+                'dur': record.duration * 1e6,
+                'pid': pid,
+                'tid': record.thread_id,
+                'args': {'module': record.module, 'phase': record.phase}
+            })
+        events.extend({'name': 'thread_name',
+                       'ph': 'M',
+                       'pid': pid,
+                       'tid': tid,
+                       'args': {'name': name}} for tid, name in thread_names.items())
+        return {'traceEvents': events,
+                'displayTimeUnit': 'ms',
+                'otherData': {'start_time': self._origin_time}}
+
+    def save_chrome_trace(self, file_path: str) -> None:
+        """ Saves all records to a JSON file in Chrome trace event format.
+
+        @param str file_path: path of the JSON file to create
+        """
+        with open(file_path, 'w') as file:
+            json.dump(self.to_chrome_trace(), file, indent=1)
+
+
+# Recorder instance used by all qudi modules of this process
+module_timing_recorder = ModuleTimingRecorder()
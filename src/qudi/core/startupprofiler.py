@@ -0,0 +1,398 @@
+# -*- coding: utf-8 -*-
+
+"""
+This file contains a lightweight profiler recording a hierarchical trace of the qudi startup
+including the import time of each top-level package.
+
+Copyright (c) 2021, the qudi developers. See the AUTHORS.md file at the top-level directory of this
+distribution and on <https://github.com/Ulm-IQO/qudi-core/>
+
+This file is part of qudi.
+
+Qudi is free software: you can redistribute it and/or modify it under the terms of
+the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+
+Qudi is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with qudi.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+__all__ = ['StartupProfiler', 'start_startup_profiler', 'get_startup_profiler',
+           'finish_startup_profiler', 'startup_span', 'startup_profiled']
+
+import os
+import sys
+import json
+import time
+import threading
+import importlib.abc
+import importlib.machinery
+from functools import wraps
+from contextlib import contextmanager, nullcontext
+from typing import Optional, Dict, List, Tuple, Iterable, Any, Callable
+
+# Profiler instance recording the current startup (if any)
+_active_profiler = None
+
+
+class _Span:
+    """ Single node of the hierarchical startup trace """
+    __slots__ = ('name', 'category', 'start', 'duration', 'thread_name', 'children')
+
+    def __init__(self, name: str, category: str, start: float, thread_name: str,
+                 duration: Optional[float] = None):
+        self.name = name
+        self.category = category
+        self.start = start
+        self.duration = duration
+        self.thread_name = thread_name
+        self.children = list()
+
+    def get_duration(self) -> float:
+        if self.duration is None:
+            return time.perf_counter() - self.start
+        return self.duration
+
+    def get_self_duration(self) -> float:
+        return max(0., self.get_duration() - sum(c.get_duration() for c in self.children))
+
+    def contains(self, other: '_Span') -> bool:
+        return self.start <= other.start and \
+            other.start + other.get_duration() <= self.start + self.get_duration()
+
+    def to_dict(self, origin: float) -> Dict[str, Any]:
+        return {'name': self.name,
+                'category': self.category,
+                'thread': self.thread_name,
+                'start': self.start - origin,
+                'duration': self.get_duration(),
+                'children': [child.to_dict(origin) for child in self.children]}
+
+
+class _ImportTimer(importlib.abc.MetaPathFinder):
+    """ Meta path finder timing the execution of all modules imported from source, bytecode or
+    extension files. The module spec is looked up by the other finders in sys.meta_path.
+    """
+    _timed_loaders = (importlib.machinery.SourceFileLoader,
+                      importlib.machinery.SourcelessFileLoader,
+                      importlib.machinery.ExtensionFileLoader)
+
+    def __init__(self, profiler: 'StartupProfiler'):
+        self._profiler = profiler
+        self._local = threading.local()
+
+    def find_spec(self, fullname, path, target=None):
+        # Avoid recursion if another finder imports something
+        if getattr(self._local, 'busy', False):
+            return None
+        self._local.busy = True
+        try:
+            for finder in sys.meta_path:
+                find_spec = getattr(finder, 'find_spec', None)
+                if finder is self or find_spec is None:
+                    continue
+                spec = find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._local.busy = False
+        loader = spec.loader
+        if isinstance(loader, self._timed_loaders) and 'exec_module' not in vars(loader):
+            loader.exec_module = self._timed_exec_module(fullname, loader.exec_module)
+        return spec
+
+    def _timed_exec_module(self, fullname: str, exec_module: Callable) -> Callable:
+        profiler = self._profiler
+
+        def exec_module_wrapper(module):
+            with profiler.import_span(fullname):
+                exec_module(module)
+
+        return exec_module_wrapper
+
+
+class StartupProfiler:
+    """ Records a hierarchical trace of named spans (e.g. startup phases) per thread.
+
+    If the import hook is installed, the execution of imported modules is recorded as spans of
+    category "import" named after the top-level package. Nested imports of the same top-level
+    package are merged into a single span.
+
+    The trace can be saved as nested JSON and as "collapsed stack" text file that can be rendered
+    as flame graph by e.g. flamegraph.pl or https://www.speedscope.app.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._origin = time.perf_counter()
+        self._origin_time = time.time()
+        self._roots = list()
+        self._import_timer = None
+
+    @property
+    def roots(self) -> List[_Span]:
+        with self._lock:
+            return self._roots.copy()
+
+    def _get_stack(self) -> List[_Span]:
+        try:
+            return self._local.stack
+        except AttributeError:
+            self._local.stack = list()
+            return self._local.stack
+
+    def begin_span(self, name: str, category: str = 'phase') -> _Span:
+        """ Starts a new span as child of the currently open span of the calling thread.
+
+        @param str name: name of the span
+        @param str category: optional, category of the span (default: "phase")
+        @return _Span: the started span to pass to end_span
+        """
+        stack = self._get_stack()
+        span = _Span(name, category, time.perf_counter(), threading.current_thread().name)
+        with self._lock:
+            if stack:
+                stack[-1].children.append(span)
+            else:
+                self._roots.append(span)
+        stack.append(span)
+        return span
+
+    def end_span(self, span: _Span) -> None:
+        """ Ends the given span (and all spans opened within it that are still open).
+
+        @param _Span span: the span to end as returned by begin_span
+        """
+        span.duration = time.perf_counter() - span.start
+        stack = self._get_stack()
+        if span in stack:
+            del stack[stack.index(span):]
+
+    @contextmanager
+    def span(self, name: str, category: str = 'phase'):
+        """ Context manager recording the enclosed code block as span.
+
+        @param str name: name of the span
+        @param str category: optional, category of the span (default: "phase")
+        """
+        span = self.begin_span(name, category)
+        try:
+            yield span
+        finally:
+            self.end_span(span)
+
+    @contextmanager
+    def import_span(self, module_name: str):
+        """ Context manager recording the execution of an imported module. Merges nested imports
+        of the same top-level package into the enclosing import span.
+
+        @param str module_name: full name of the imported module
+        """
+        package = module_name.partition('.')[0]
+        stack = self._get_stack()
+        if stack and stack[-1].category == 'import' and stack[-1].name == package:
+            yield
+        else:
+            with self.span(package, 'import'):
+                yield
+
+    def install_import_hook(self) -> None:
+        """ Start timing the execution of all subsequently imported modules """
+        if self._import_timer is None:
+            self._import_timer = _ImportTimer(self)
+            sys.meta_path.insert(0, self._import_timer)
+
+    def uninstall_import_hook(self) -> None:
+        """ Stop timing imported modules """
+        if self._import_timer is not None:
+            try:
+                sys.meta_path.remove(self._import_timer)
+            except ValueError:
+                pass
+            self._import_timer = None
+
+    def add_module_timings(self, records: Iterable, parent: Optional[str] = None) -> None:
+        """ Adds qudi module lifecycle phase records (see qudi.core.moduletiming) that started
+        during this profile. Each module gets a span "module <name>" (duration of the activation)
+        containing spans for the individual phases. Import spans recorded during loading of a
+        module in the main thread are moved into the respective "load" span.
+
+        @param iterable records: ModuleTimingRecord instances
+        @param str parent: optional, name of the span to add the module spans to (default: root)
+        """
+        records = [rec for rec in records if rec.start >= self._origin]
+        parent_span = next((span for span, _ in self._iter_spans() if span.name == parent), None)
+        with self._lock:
+            siblings = self._roots if parent_span is None else parent_span.children
+            for module in dict.fromkeys(rec.module for rec in records):
+                module_records = [rec for rec in records if rec.module == module]
+                activation = next((rec for rec in module_records if rec.phase == 'activate'),
+                                  None)
+                if activation is None:
+                    continue
+                module_span = _Span(f'module {module}',
+                                    'module',
+                                    activation.start,
+                                    activation.thread_name,
+                                    activation.duration)
+                for rec in module_records:
+                    if rec.phase in ('activate', 'deactivate', 'reload', 'on_deactivate',
+                                     'status_dump'):
+                        continue
+                    phase_span = _Span(rec.phase, 'module', rec.start, rec.thread_name,
+                                       rec.duration)
+                    # Move import spans during module load into the load span
+                    if rec.phase == 'load':
+                        for span in siblings.copy():
+                            if span.category == 'import' and \
+                                    span.thread_name == rec.thread_name and \
+                                    phase_span.contains(span):
+                                siblings.remove(span)
+                                phase_span.children.append(span)
+                    module_span.children.append(phase_span)
+                siblings.append(module_span)
+
+    def get_import_times(self) -> Dict[str, float]:
+        """ Returns the total import time in seconds (excluding nested imports of other packages)
+        by top-level package name, sorted in descending order.
+
+        @return dict: import times by package name
+        """
+        times = dict()
+        for span, _ in self._iter_spans():
+            if span.category == 'import':
+                times[span.name] = times.get(span.name, 0.) + span.get_self_duration()
+        return dict(sorted(times.items(), key=lambda item: item[1], reverse=True))
+
+    def _iter_spans(self, spans: Optional[List[_Span]] = None,
+                    path: Tuple[str, ...] = tuple()) -> Iterable[Tuple[_Span, Tuple[str, ...]]]:
+        if spans is None:
+            spans = self.roots
+        for span in spans:
+            if span.category == 'import':
+                name = f'import {span.name}'
+            else:
+                name = span.name
+            if not path and span.thread_name != 'MainThread':
+                name = f'{span.thread_name};{name}'
+            span_path = path + (name,)
+            yield span, span_path
+            yield from self._iter_spans(span.children, span_path)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """ Returns the recorded trace as JSON serializable dict """
+        total = time.perf_counter() - self._origin
+        return {'start_time': self._origin_time,
+                'total_duration': total,
+                'import_times': self.get_import_times(),
+                'spans': [span.to_dict(self._origin) for span in self.roots]}
+
+    def get_collapsed_stacks(self) -> List[str]:
+        """ Returns the recorded trace in "collapsed stack" format, i.e. one line per span with
+        the semicolon separated names of all enclosing spans followed by the time in microseconds
+        spent in this span but not in child spans.
+
+        @return list: lines of collapsed stacks
+        """
+        lines = list()
+        for span, path in self._iter_spans():
+            self_time = int(round(span.get_self_duration() * 1e6))
+            if self_time > 0:
+                lines.append(f'{";".join(p.replace(" ", "_") for p in path)} {self_time:d}')
+        return lines
+
+    def save(self, directory: str, name: str = 'startup_profile') -> Tuple[str, str]:
+        """ Saves the trace to a JSON file and a collapsed stack file in the given directory.
+        File names are created from <name> and the profile start time.
+
+        @param str directory: directory to save the files to
+        @param str name: optional, prefix of the file names
+        @return tuple: file paths of the JSON and the collapsed stack file
+        """
+        timestamp = time.strftime('%Y%m%d-%H%M%S', time.localtime(self._origin_time))
+        base_path = os.path.join(directory, f'{name}_{timestamp}')
+        json_path = f'{base_path}.json'
+        collapsed_path = f'{base_path}.collapsed'
+        with open(json_path, 'w') as file:
+            json.dump(self.to_dict(), file, indent=1)
+        with open(collapsed_path, 'w') as file:
+            file.write('\n'.join(self.get_collapsed_stacks()))
+            file.write('\n')
+        return json_path, collapsed_path
+
+
+def start_startup_profiler(import_hook: bool = True) -> StartupProfiler:
+    """ Creates a new active startup profiler. startup_span and startup_profiled record into this
+    profiler until finish_startup_profiler is called.
+
+    @param bool import_hook: optional, flag indicating if imports should be timed (default: True)
+    @return StartupProfiler: the new active profiler
+    """
+    global _active_profiler
+    if _active_profiler is not None:
+        _active_profiler.uninstall_import_hook()
+    _active_profiler = StartupProfiler()
+    if import_hook:
+        _active_profiler.install_import_hook()
+    return _active_profiler
+
+
+def get_startup_profiler() -> Optional[StartupProfiler]:
+    """ Returns the active startup profiler or None if startup profiling is disabled """
+    return _active_profiler
+
+
+def finish_startup_profiler(directory: str,
+                            module_records: Optional[Iterable] = None) -> Optional[Tuple[str, str]]:
+    """ Stops the active startup profiler (if any) and saves the trace to <directory>.
+
+    @param str directory: directory to save the profile files to
+    @param iterable module_records: optional, qudi module lifecycle phase records to include
+    @return tuple: file paths of the JSON and the collapsed stack file (None if not profiling)
+    """
+    global _active_profiler
+    profiler, _active_profiler = _active_profiler, None
+    if profiler is None:
+        return None
+    profiler.uninstall_import_hook()
+    if module_records is not None:
+        profiler.add_module_timings(module_records, parent='Qudi._start_startup_modules')
+    return profiler.save(directory)
+
+
+def startup_span(name: str):
+    """ Returns a context manager recording the enclosed code block as span of the active startup
+    profiler. Does nothing if startup profiling is disabled.
+
+    @param str name: name of the span
+    """
+    profiler = _active_profiler
+    if profiler is None:
+        return nullcontext()
+    return profiler.span(name)
+
+
+def startup_profiled(name: Optional[str] = None) -> Callable:
+    """ Decorator recording each call of the decorated function as span of the active startup
+    profiler. Does nothing if startup profiling is disabled.
+
+    @param str name: optional, name of the span (default: qualified name of the function)
+    """
+    def decorator(func):
+        span_name = func.__qualname__ if name is None else name
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with startup_span(span_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
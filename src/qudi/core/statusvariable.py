@@ -20,11 +20,22 @@ You should have received a copy of the GNU Lesser General Public License along w
 If not, see <https://www.gnu.org/licenses/>.
 """
 
-__all__ = ['StatusVar']
+__all__ = ['StatusVar', 'dump_status_variables', 'get_status_array_file_path',
+           'get_status_variables_digest', 'is_status_file_current', 'load_status_variables',
+           'migrate_status_variable_files']
 
+import os
+import re
 import copy
+import glob
+import pickle
+import hashlib
 import inspect
-from typing import Callable, Any, Optional
+import threading
+from typing import Callable, Any, Optional, Mapping, Dict, List
+
+from qudi.util.paths import get_appdata_dir
+from qudi.util.yaml import yaml_load, yaml_dump
 
 
 class StatusVar:
@@ -101,3 +112,129 @@ class StatusVar:
 
             return wrapper
         return func
+
+
+class _StatusFileState:
+    """ Book-keeping for a single status variable file written by this process """
+    __slots__ = ('lock', 'snapshot_time', 'digest')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.snapshot_time = None
+        self.digest = None
+
+
+_status_file_states = dict()
+_status_file_states_lock = threading.Lock()
+
+
+def _get_status_file_state(file_path: str) -> _StatusFileState:
+    with _status_file_states_lock:
+        try:
+            return _status_file_states[file_path]
+        except KeyError:
+            state = _status_file_states[file_path] = _StatusFileState()
+            return state
+
+
+def get_status_variables_digest(variables: Mapping[str, Any]) -> Optional[bytes]:
+    """ Returns a digest of the status variable values (based on pickle) to detect changes.
+    Returns None if the values can not be pickled.
+    """
+    try:
+        return hashlib.blake2b(pickle.dumps(variables, protocol=pickle.HIGHEST_PROTOCOL)).digest()
+    except Exception:
+        return None
+
+
+def is_status_file_current(file_path: str, digest: Optional[bytes]) -> bool:
+    """ Checks if the status variable file exists and has been written by this process from status
+    variables with the given digest (see get_status_variables_digest).
+    """
+    if digest is None:
+        return False
+    state = _get_status_file_state(file_path)
+    with state.lock:
+        return state.digest == digest and os.path.exists(file_path)
+
+
+def get_status_array_file_path(file_path: str) -> str:
+    """ Returns the path of the .npz file holding the arrays of the status variable file at
+    file_path.
+    """
+    return f'{os.path.splitext(file_path)[0]}.npz'
+
+
+def load_status_variables(file_path: str, *, mmap: Optional[bool] = False) -> Dict[str, Any]:
+    """ Load status variables from a status variable file (YAML). Large arrays are read from the
+    binary .npz side file only if the status variable file refers to it.
+    Returns an empty dict if the file does not exist.
+
+    @param str file_path: path to the status variable file
+    @param bool mmap: optional, return large arrays as copy-on-write memory-mapped arrays instead
+                      of reading them into memory (see qudi.util.yaml.yaml_load)
+
+    @return dict: status variable values by name
+    """
+    return yaml_load(file_path,
+                     ignore_missing=True,
+                     array_file_path=get_status_array_file_path(file_path),
+                     mmap=mmap,
+                     cache=True)
+
+
+def dump_status_variables(file_path: str, variables: Mapping[str, Any], *,
+                          snapshot_time: Optional[float] = None,
+                          digest: Optional[bytes] = None) -> bool:
+    """ Dump status variables into a status variable file (YAML). Large numpy arrays are saved in
+    binary format in a .npz side file (see get_status_array_file_path) instead. Both files are
+    replaced atomically.
+    Removes separate .npy files of arrays saved by older versions of qudi for this file.
+
+    Dumps of the same file are serialized. If snapshot_time is given, the dump is skipped if a
+    more recent snapshot of the variables has already been written. If digest is given (see
+    get_status_variables_digest), the dump is skipped if the file is still current.
+
+    @param str file_path: path to the status variable file
+    @param dict variables: status variable values by name
+    @param float snapshot_time: optional, time.monotonic() timestamp of the variables snapshot
+    @param bytes digest: optional, digest of the variables to skip writing unchanged values
+
+    @return bool: Flag indicating if the file has been written
+    """
+    state = _get_status_file_state(file_path)
+    with state.lock:
+        if snapshot_time is not None and state.snapshot_time is not None and \
+                snapshot_time < state.snapshot_time:
+            return False
+        if digest is not None and state.digest == digest and os.path.exists(file_path):
+            return False
+        yaml_dump(file_path, variables, array_file_path=get_status_array_file_path(file_path))
+        if snapshot_time is not None:
+            state.snapshot_time = snapshot_time
+        state.digest = digest
+        # Remove legacy array files "<file name>-000000.npy", "<file name>-000001.npy", etc.
+        base_path = os.path.splitext(file_path)[0]
+        for legacy_path in glob.glob(f'{glob.escape(base_path)}-*.npy'):
+            if re.fullmatch(r'-\d{6}\.npy', legacy_path[len(base_path):]):
+                os.remove(legacy_path)
+    return True
+
+
+def migrate_status_variable_files(directory: Optional[str] = None) -> List[str]:
+    """ Rewrite all status variable files ("status-*.cfg") in a directory using
+    dump_status_variables, i.e. move large arrays into binary .npz side files.
+    Status variable files are also migrated automatically the next time the respective module is
+    deactivated.
+
+    @param str directory: optional, directory containing status variable files (default: AppData)
+
+    @return list: paths of all migrated files
+    """
+    if directory is None:
+        directory = get_appdata_dir()
+    migrated = list()
+    for file_path in sorted(glob.glob(os.path.join(glob.escape(directory), 'status-*.cfg'))):
+        dump_status_variables(file_path, load_status_variables(file_path))
+        migrated.append(file_path)
+    return migrated
@@ -3,15 +3,19 @@
 
 """
 
-__all__ = ['ModuleFinder', 'QudiModules']
+__all__ = ['ModuleFinder', 'QudiModuleInfo', 'QudiModules', 'StaticModuleFinder']
 
+import os
+import ast
+import pickle
 import importlib
 import inspect
 import logging
-from typing import List, Type, Dict, Iterable
+from typing import List, Type, Dict, Iterable, Optional, Tuple, Any
 
 from qudi.core import Connector, ConfigOption, Base, LogicBase, GuiBase
 from qudi.util.helpers import iter_modules_recursive
+from qudi.util.paths import get_appdata_dir
 
 
 log = logging.getLogger(__package__)
@@ -75,17 +79,558 @@ class ModuleFinder:
         return modules
 
 
+class QudiModuleInfo:
+    """ Information about a qudi module class needed by the config editor """
+
+    def __init__(self, base_names: Iterable[str], connectors: Iterable[Connector],
+                 config_options: Iterable[ConfigOption]):
+        """
+        @param iterable base_names: names of all classes in the MRO of the module class
+        @param iterable connectors: Connector meta objects of the module class
+        @param iterable config_options: ConfigOption meta objects of the module class
+        """
+        self.base_names = frozenset(base_names)
+        self.connectors = list(connectors)
+        self.config_options = list(config_options)
+
+    @classmethod
+    def from_class(cls, module_class: Type[Base]) -> 'QudiModuleInfo':
+        return cls(base_names=(c.__name__ for c in module_class.mro()),
+                   connectors=module_class._meta['connectors'].values(),
+                   config_options=module_class._meta['config_options'].values())
+
+
+class _AmbiguousModuleError(Exception):
+    """ Raised if qudi module classes can not be determined reliably by static analysis """
+    pass
+
+
+_abstract_decorators = frozenset(
+    {'abstractmethod', 'abstractproperty', 'abstractclassmethod', 'abstractstaticmethod'}
+)
+_binary_operators = {ast.Add: lambda a, b: a + b,
+                     ast.Sub: lambda a, b: a - b,
+                     ast.Mult: lambda a, b: a * b,
+                     ast.Div: lambda a, b: a / b,
+                     ast.FloorDiv: lambda a, b: a // b,
+                     ast.Mod: lambda a, b: a % b,
+                     ast.Pow: lambda a, b: a ** b}
+_container_constructors = {'dict': dict, 'list': list, 'tuple': tuple, 'set': set,
+                           'frozenset': frozenset}
+
+
+def _dotted_name(node: ast.AST) -> Optional[str]:
+    """ Returns "a.b.c" for Name/Attribute expression nodes and None for any other expression """
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        parent = _dotted_name(node.value)
+        return None if parent is None else f'{parent}.{node.attr}'
+    return None
+
+
+def _evaluate_static(node: ast.AST) -> Any:
+    """ Evaluates literal expressions including arithmetic and calls of builtin container types.
+    Raises ValueError for anything else.
+    """
+    if isinstance(node, ast.BinOp) and type(node.op) in _binary_operators:
+        return _binary_operators[type(node.op)](_evaluate_static(node.left),
+                                                _evaluate_static(node.right))
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and \
+            node.func.id in _container_constructors:
+        args = [_evaluate_static(arg) for arg in node.args]
+        kwargs = {kw.arg: _evaluate_static(kw.value) for kw in node.keywords if kw.arg is not None}
+        if len(kwargs) != len(node.keywords):
+            raise ValueError('Unpacking of keyword arguments not supported')
+        return _container_constructors[node.func.id](*args, **kwargs)
+    if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+        values = [_evaluate_static(elt) for elt in node.elts]
+        if isinstance(node, ast.List):
+            return values
+        return tuple(values) if isinstance(node, ast.Tuple) else set(values)
+    if isinstance(node, ast.Dict) and None not in node.keys:
+        return {_evaluate_static(k): _evaluate_static(v) for k, v in zip(node.keys, node.values)}
+    return ast.literal_eval(node)
+
+
+def _call_argument(node: ast.AST) -> Tuple[str, Any]:
+    """ Returns ('value', <value>) for statically evaluable arguments, ('ref', <dotted name>) for
+    names and ('unknown', None) otherwise.
+    """
+    try:
+        return 'value', _evaluate_static(node)
+    except (ValueError, TypeError, SyntaxError, ArithmeticError):
+        pass
+    dotted = _dotted_name(node)
+    return ('unknown', None) if dotted is None else ('ref', dotted)
+
+
+def _summarize_class(node: ast.ClassDef) -> Dict[str, Any]:
+    """ Extracts base class names and the class namespace bindings from a class definition """
+    bases = [_dotted_name(base) for base in node.bases]
+    bindings = dict()
+    mangle_prefix = f'_{node.name.lstrip("_")}'
+
+    def bind(name, binding):
+        if name.startswith('__') and not name.endswith('__'):
+            name = mangle_prefix + name
+        bindings[name] = binding
+
+    for stmt in node.body:
+        if isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            decorators = [_dotted_name(dec) for dec in stmt.decorator_list]
+            abstract = any(dec is not None and dec.rsplit('.', 1)[-1] in _abstract_decorators
+                           for dec in decorators)
+            # Property setters/deleters keep the abstract state of the property
+            previous = bindings.get(stmt.name, None)
+            if not abstract and previous == ('abstract',):
+                abstract = any(dec in (f'{stmt.name}.setter', f'{stmt.name}.deleter')
+                               for dec in decorators)
+            bind(stmt.name, ('abstract',) if abstract else ('plain',))
+        elif isinstance(stmt, ast.ClassDef):
+            bind(stmt.name, ('plain',))
+        elif isinstance(stmt, (ast.Assign, ast.AnnAssign)):
+            targets = stmt.targets if isinstance(stmt, ast.Assign) else [stmt.target]
+            value = stmt.value
+            binding = ('plain',)
+            if isinstance(value, ast.Call) and _dotted_name(value.func) is not None:
+                binding = ('call',
+                           _dotted_name(value.func),
+                           [_call_argument(arg) for arg in value.args],
+                           {kw.arg: _call_argument(kw.value) for kw in value.keywords})
+            for target in targets:
+                if isinstance(target, ast.Name):
+                    bind(target.id, binding if len(targets) == 1 else ('plain',))
+        elif isinstance(stmt, (ast.If, ast.Try, ast.With, ast.For, ast.While)):
+            # Conditional bindings in the class namespace can not be resolved statically
+            for sub_node in ast.walk(stmt):
+                if isinstance(sub_node, (ast.Assign, ast.AnnAssign, ast.FunctionDef,
+                                         ast.AsyncFunctionDef, ast.ClassDef)):
+                    bindings['__ambiguous__'] = ('plain',)
+    return {'bases': bases,
+            'keywords': [kw.arg for kw in node.keywords],
+            'bindings': bindings}
+
+
+def _summarize_module(source: str, module_name: str, is_package: bool) -> Dict[str, Any]:
+    """ Extracts imports and class definitions from the source code of a Python module """
+    tree = ast.parse(source)
+    package = module_name if is_package else module_name.rpartition('.')[0]
+    imports = dict()
+    star_imports = list()
+    classes = dict()
+    ambiguous = set()
+    assigned = set()
+
+    def absolute_module(level, module):
+        if not level:
+            return module
+        parts = package.split('.')
+        if level > 1:
+            parts = parts[:1 - level]
+        base = '.'.join(parts)
+        return f'{base}.{module}' if module else base
+
+    def visit(statements):
+        for stmt in statements:
+            if isinstance(stmt, ast.Import):
+                for alias in stmt.names:
+                    if alias.asname is None:
+                        top_name = alias.name.split('.', 1)[0]
+                        imports[top_name] = (top_name, None)
+                    else:
+                        imports[alias.asname] = (alias.name, None)
+            elif isinstance(stmt, ast.ImportFrom):
+                module = absolute_module(stmt.level, stmt.module)
+                for alias in stmt.names:
+                    if alias.name == '*':
+                        star_imports.append(module)
+                    else:
+                        imports[alias.asname or alias.name] = (module, alias.name)
+            elif isinstance(stmt, ast.ClassDef):
+                if stmt.name in classes:
+                    ambiguous.add(stmt.name)
+                classes[stmt.name] = _summarize_class(stmt)
+            elif isinstance(stmt, (ast.Assign, ast.AnnAssign, ast.AugAssign)):
+                targets = stmt.targets if isinstance(stmt, ast.Assign) else [stmt.target]
+                for target in targets:
+                    for sub_node in ast.walk(target):
+                        if isinstance(sub_node, ast.Name):
+                            assigned.add(sub_node.id)
+            elif isinstance(stmt, ast.If):
+                visit(stmt.body)
+                visit(stmt.orelse)
+            elif isinstance(stmt, ast.Try):
+                visit(stmt.body)
+                for handler in stmt.handlers:
+                    visit(handler.body)
+                visit(stmt.orelse)
+                visit(stmt.finalbody)
+            elif isinstance(stmt, ast.With):
+                visit(stmt.body)
+
+    visit(tree.body)
+    return {'imports': imports,
+            'star_imports': star_imports,
+            'classes': classes,
+            'ambiguous': ambiguous | (assigned & (set(classes) | set(imports))),
+            'assigned': assigned - set(classes) - set(imports)}
+
+
+class StaticModuleFinder:
+    """ Finds qudi module classes, their Connectors and ConfigOptions by static analysis of the
+    source code (abstract syntax tree) without importing any of the modules.
+    The analysis result of each source file is cached on disk and only renewed if the file
+    modification time or size changed.
+    Modules that can not be analyzed reliably (e.g. dynamically created base classes or
+    ConfigOption default values that are no literals) are imported instead (see ModuleFinder).
+    """
+    _cache_version = 1
+    _namespaces = ('qudi.gui', 'qudi.logic', 'qudi.hardware')
+    _builtin_names = frozenset({'object', 'Exception', 'BaseException', 'dict', 'list', 'type'})
+
+    def __init__(self, search_paths: Optional[Iterable[str]] = None,
+                 cache_path: Optional[str] = None):
+        """
+        @param iterable search_paths: optional, root directories of the "qudi" namespace package
+                                      (default: qudi.__path__)
+        @param str cache_path: optional, path of the cache file (default:
+                               <AppData>/qudi/module_finder_cache.pickle). Empty str disables cache
+        """
+        if search_paths is None:
+            import qudi
+            search_paths = qudi.__path__
+        if cache_path is None:
+            cache_path = os.path.join(get_appdata_dir(), 'module_finder_cache.pickle')
+        self.search_paths = [os.path.abspath(path) for path in search_paths]
+        self.cache_path = cache_path
+        self._file_cache = self._load_cache()
+        self._file_cache_changed = False
+        self._summaries = dict()
+        self._linearizations = dict()
+
+    def _load_cache(self) -> Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]]:
+        if not self.cache_path:
+            return dict()
+        try:
+            with open(self.cache_path, 'rb') as file:
+                version, entries = pickle.load(file)
+        except Exception:
+            return dict()
+        return entries if version == self._cache_version else dict()
+
+    def save_cache(self) -> None:
+        """ Writes the source analysis results to the cache file (if anything changed) """
+        if not self.cache_path or not self._file_cache_changed:
+            return
+        tmp_path = f'{self.cache_path}.tmp'
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            with open(tmp_path, 'wb') as file:
+                pickle.dump((self._cache_version, self._file_cache),
+                            file,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.cache_path)
+            self._file_cache_changed = False
+        except OSError:
+            log.warning(f'Unable to write module finder cache "{self.cache_path}"')
+
+    def _find_module_file(self, module_name: str) -> Tuple[Optional[str], bool]:
+        """ Returns the source file path of a qudi module (None if not found) and a flag indicating
+        if the module is a package.
+        """
+        parts = module_name.split('.')[1:]
+        for root in self.search_paths:
+            path = os.path.join(root, *parts)
+            if parts and os.path.isfile(f'{path}.py'):
+                return f'{path}.py', False
+            if os.path.isfile(os.path.join(path, '__init__.py')):
+                return os.path.join(path, '__init__.py'), True
+        return None, False
+
+    def _is_namespace_package(self, module_name: str) -> bool:
+        parts = module_name.split('.')[1:]
+        return any(os.path.isdir(os.path.join(root, *parts)) for root in self.search_paths)
+
+    def _get_summary(self, module_name: str) -> Optional[Dict[str, Any]]:
+        """ Returns the (cached) source analysis result of a qudi module. None if no source file
+        could be found.
+        """
+        try:
+            return self._summaries[module_name]
+        except KeyError:
+            pass
+        file_path, is_package = self._find_module_file(module_name)
+        summary = None
+        if file_path is not None:
+            stat = os.stat(file_path)
+            key = (stat.st_mtime_ns, stat.st_size)
+            entry = self._file_cache.get(file_path, None)
+            if entry is not None and entry[0] == key and entry[1]['module'] == module_name:
+                summary = entry[1]
+            else:
+                try:
+                    with open(file_path, 'rb') as file:
+                        source = file.read()
+                    summary = _summarize_module(source, module_name, is_package)
+                except (SyntaxError, ValueError, OSError):
+                    summary = {'invalid': True}
+                summary['module'] = module_name
+                self._file_cache[file_path] = (key, summary)
+                self._file_cache_changed = True
+        self._summaries[module_name] = summary
+        return summary
+
+    def _resolve(self, module_name: str, dotted: str, _depth: int = 0) -> Optional[Tuple]:
+        """ Resolves a dotted name in the namespace of a module.
+
+        @return tuple: ('class', <module>, <class name>), ('module', <module>) or
+                       ('external', <class name>). None if the name can not be resolved.
+        """
+        if _depth > 32:
+            return None
+        first, _, rest = dotted.partition('.')
+        target = self._resolve_attribute(('module', module_name), first, _depth, local=True)
+        for part in rest.split('.') if rest else []:
+            if target is None or target[0] == 'external':
+                return None if target is None else ('external', part)
+            target = self._resolve_attribute(target, part, _depth)
+        return target
+
+    def _resolve_attribute(self, parent: Tuple, name: str, depth: int,
+                           local: bool = False) -> Optional[Tuple]:
+        if depth > 32:
+            # Most likely cyclic re-exports
+            return None
+        if parent[0] != 'module':
+            # Attributes of classes (e.g. nested classes) are not resolved
+            return None
+        module_name = parent[1]
+        if module_name != 'qudi' and not module_name.startswith('qudi.'):
+            return 'external', name
+        summary = self._get_summary(module_name)
+        if summary is None:
+            # Namespace package or missing module
+            submodule = f'{module_name}.{name}'
+            if self._is_namespace_package(submodule) or self._find_module_file(submodule)[0]:
+                return 'module', submodule
+            return None
+        if summary.get('invalid', False) or name in summary['ambiguous'] or \
+                name in summary['assigned']:
+            return None
+        if name in summary['classes']:
+            return 'class', module_name, name
+        if name in summary['imports']:
+            source, attr = summary['imports'][name]
+            if attr is None:
+                return 'module', source
+            return self._resolve_attribute(('module', source), attr, depth + 1)
+        submodule = f'{module_name}.{name}'
+        if self._find_module_file(submodule)[0] or self._is_namespace_package(submodule):
+            return 'module', submodule
+        for star_module in summary['star_imports']:
+            target = self._resolve_attribute(('module', star_module), name, depth + 1)
+            if target is not None:
+                return target
+        if local and name in self._builtin_names:
+            return 'external', name
+        return None
+
+    def _linearize(self, module_name: str, class_name: str, _depth: int = 0) -> List[Tuple]:
+        """ Returns the static equivalent of the class MRO. Raises _AmbiguousModuleError if it can
+        not be determined.
+        """
+        key = (module_name, class_name)
+        try:
+            return self._linearizations[key]
+        except KeyError:
+            pass
+        if _depth > 64:
+            raise _AmbiguousModuleError(f'Recursion in base classes of {class_name}')
+        summary = self._get_summary(module_name)
+        class_summary = summary['classes'][class_name]
+        if '__ambiguous__' in class_summary['bindings'] or \
+                any(kw is None for kw in class_summary['keywords']):
+            raise _AmbiguousModuleError(f'Dynamic namespace of class {class_name}')
+        base_linearizations = list()
+        for base in class_summary['bases']:
+            target = None if base is None else self._resolve(module_name, base)
+            if target is None or target[0] == 'module':
+                raise _AmbiguousModuleError(f'Unable to resolve base "{base}" of {class_name}')
+            if target[0] == 'external':
+                base_linearizations.append([target])
+            else:
+                base_linearizations.append(self._linearize(target[1], target[2], _depth + 1))
+        # C3 linearization
+        result = [('class', module_name, class_name)]
+        sequences = [list(seq) for seq in base_linearizations]
+        sequences.append([seq[0] for seq in base_linearizations])
+        while True:
+            sequences = [seq for seq in sequences if seq]
+            if not sequences:
+                break
+            for seq in sequences:
+                head = seq[0]
+                if not any(head in other[1:] for other in sequences):
+                    break
+            else:
+                raise _AmbiguousModuleError(f'Inconsistent MRO of class {class_name}')
+            result.append(head)
+            for seq in sequences:
+                if seq[0] == head:
+                    del seq[0]
+        self._linearizations[key] = result
+        return result
+
+    def _meta_objects(self, module_name: str, class_name: str) -> Optional[QudiModuleInfo]:
+        """ Returns the QudiModuleInfo if the class is a non-abstract qudi module class or None.
+        """
+        mro = self._linearize(module_name, class_name)
+        if ('class', 'qudi.core.module', 'Base') not in mro:
+            return None
+        if module_name == 'qudi.core.module' and class_name in ('Base', 'LogicBase', 'GuiBase'):
+            return None
+        # Resolve class attributes like getattr would
+        attributes = dict()
+        for entry in reversed(mro):
+            if entry[0] != 'class':
+                continue
+            bindings = self._get_summary(entry[1])['classes'][entry[2]]['bindings']
+            for attr_name, binding in bindings.items():
+                attributes[attr_name] = (entry[1], binding)
+        if any(binding == ('abstract',) for _, binding in attributes.values()):
+            return None
+        connectors = list()
+        config_options = list()
+        for attr_name in sorted(attributes):
+            defining_module, binding = attributes[attr_name]
+            if binding[0] != 'call':
+                continue
+            target = self._resolve(defining_module, binding[1])
+            if target is None or target[0] != 'class':
+                continue
+            func_mro = self._linearize(target[1], target[2])
+            if ('class', 'qudi.core.connector', 'Connector') in func_mro:
+                meta_cls = Connector
+            elif ('class', 'qudi.core.configoption', 'ConfigOption') in func_mro:
+                meta_cls = ConfigOption
+            else:
+                continue
+            if len(func_mro) > 2:
+                raise _AmbiguousModuleError(f'Subclass of {meta_cls.__name__} in {class_name}')
+            meta_obj = self._create_meta_object(meta_cls, attr_name, binding[2], binding[3])
+            (connectors if meta_cls is Connector else config_options).append(meta_obj)
+        base_names = [entry[2] if entry[0] == 'class' else entry[1] for entry in mro]
+        base_names.append('object')
+        return QudiModuleInfo(base_names=base_names,
+                              connectors=connectors,
+                              config_options=config_options)
+
+    @staticmethod
+    def _create_meta_object(meta_cls: type, attr_name: str, args: List[Tuple],
+                            kwargs: Dict[str, Tuple]) -> Any:
+        if meta_cls is Connector:
+            parameters = ['interface', 'name', 'optional']
+        else:
+            parameters = ['name', 'default']
+            # Callables are not needed by the config editor
+            kwargs = {k: v for k, v in kwargs.items()
+                      if k not in ('constructor', 'checker', 'converter')}
+        if len(args) > len(parameters) or None in kwargs:
+            raise _AmbiguousModuleError(f'Unsupported arguments of {meta_cls.__name__}')
+        arguments = dict(zip(parameters, args))
+        arguments.update(kwargs)
+        values = dict()
+        for param, (kind, value) in arguments.items():
+            if kind == 'value':
+                values[param] = value
+            elif kind == 'ref' and param == 'interface':
+                # Interfaces are identified by class name
+                values[param] = value.rsplit('.', 1)[-1]
+            else:
+                raise _AmbiguousModuleError(f'Unable to evaluate "{param}" of "{attr_name}"')
+        try:
+            meta_obj = meta_cls(**values)
+        except Exception as err:
+            raise _AmbiguousModuleError(str(err)) from None
+        meta_obj.__set_name__(None, attr_name)
+        return meta_obj
+
+    def get_qudi_modules_in_module(self, module_name: str) -> Dict[str, QudiModuleInfo]:
+        """ Returns QudiModuleInfo of all qudi module classes defined in the given module.
+        Raises _AmbiguousModuleError if static analysis is not possible.
+        """
+        summary = self._get_summary(module_name)
+        if summary is None or summary.get('invalid', False):
+            raise _AmbiguousModuleError(f'No analyzable source code found for "{module_name}"')
+        modules = dict()
+        for class_name in summary['classes']:
+            if class_name in summary['ambiguous']:
+                raise _AmbiguousModuleError(f'Multiple definitions of class {class_name}')
+            try:
+                info = self._meta_objects(module_name, class_name)
+            except RecursionError:
+                raise _AmbiguousModuleError(
+                    f'Recursion limit exceeded while resolving class {class_name}'
+                ) from None
+            if info is not None:
+                modules[f'{module_name}.{class_name}'] = info
+        return modules
+
+    def get_module_names(self, namespace: str) -> List[str]:
+        """ Returns the names of all Python modules in a namespace (e.g. "qudi.hardware") """
+        parts = namespace.split('.')[1:]
+        paths = [os.path.join(root, *parts) for root in self.search_paths]
+        module_names = [mod_finder.name for mod_finder in
+                        iter_modules_recursive([p for p in paths if os.path.isdir(p)],
+                                               f'{namespace}.')]
+        return list(dict.fromkeys(module_names))
+
+    def get_qudi_modules(self) -> Dict[str, QudiModuleInfo]:
+        """ Returns QudiModuleInfo of all qudi module classes in the qudi gui, logic and hardware
+        namespaces. Falls back to importing modules that can not be analyzed statically.
+        """
+        modules = dict()
+        for namespace in self._namespaces:
+            for module_name in self.get_module_names(namespace):
+                try:
+                    modules.update(self.get_qudi_modules_in_module(module_name))
+                except _AmbiguousModuleError as err:
+                    log.debug(f'Static analysis of module "{module_name}" failed ({err}). '
+                              f'Importing module instead.')
+                    try:
+                        module = importlib.import_module(module_name)
+                    except:
+                        log.warning(f'Error during import of module "{module_name}"')
+                        continue
+                    modules.update(
+                        {name: QudiModuleInfo.from_class(cls) for name, cls in
+                         ModuleFinder.get_qudi_classes_in_module(module).items()}
+                    )
+        self.save_cache()
+        return modules
+
+
 class QudiModules:
     """
     """
 
-    def __init__(self):
-        # import all qudi module classes if possible (log all errors upon import)
-        self._qudi_modules = {mod[5:] if mod.startswith('qudi.') else mod: cls for mod, cls in
-                              ModuleFinder.get_qudi_modules().items()}
+    def __init__(self, static_analysis: Optional[bool] = True):
+        """
+        @param bool static_analysis: optional, find qudi modules by analyzing the source code
+                                     instead of importing all modules (see StaticModuleFinder)
+        """
+        if static_analysis:
+            modules = StaticModuleFinder().get_qudi_modules()
+        else:
+            # import all qudi module classes if possible (log all errors upon import)
+            modules = {mod: QudiModuleInfo.from_class(cls) for mod, cls in
+                       ModuleFinder.get_qudi_modules().items()}
+        self._qudi_modules = {mod[5:] if mod.startswith('qudi.') else mod: info for mod, info in
+                              modules.items()}
         # Collect all connectors for all modules
         self._module_connectors = {
-            mod: list(cls._meta['connectors'].values()) for mod, cls in self._qudi_modules.items()
+            mod: info.connectors for mod, info in self._qudi_modules.items()
         }
         # Get for each connector in each module compatible modules to connect to
         self._module_connectors_compatible_modules = {
@@ -93,8 +638,7 @@ class QudiModules:
         }
         # Get all ConfigOptions for all modules
         self._module_config_options = {
-            mod: list(cls._meta['config_options'].values()) for mod, cls in
-            self._qudi_modules.items()
+            mod: info.config_options for mod, info in self._qudi_modules.items()
         }
 
     def _modules_for_connectors(self, connectors: Iterable[Connector]) -> Dict[str, List[str]]:
@@ -102,8 +646,9 @@ class QudiModules:
 
     def _modules_for_connector(self, connector: Connector) -> List[str]:
         interface = connector.interface
-        bases = {mod: {c.__name__ for c in cls.mro()} for mod, cls in self._qudi_modules.items()}
-        return list(mod for mod, base_names in bases.items() if interface in base_names)
+        return list(
+            mod for mod, info in self._qudi_modules.items() if interface in info.base_names
+        )
 
     @property
     def available_modules(self) -> List[str]:
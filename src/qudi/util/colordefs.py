@@ -39,8 +39,8 @@ __all__ = ['ColorScale', 'ColorScaleRainbow', 'ColorScaleMagma', 'ColorScaleInfe
            'QudiMatplotlibStyle']
 
 import numpy as np
-import pyqtgraph as pg
 from cycler import cycler
+from PySide2 import QtGui
 
 
 class ColorScale:
@@ -48,6 +48,9 @@ class ColorScale:
     You need to add two numpy arrays, COLORS and COLORS_INV when subclassing
     """
     def __init__(self):
+        # Import pyqtgraph only when needed since this module is also used by headless qudi
+        import pyqtgraph as pg
+
         color_positions = np.linspace(0.0, 1.0, num=len(self.COLORS))
         self.colormap = pg.ColorMap(color_positions, self.COLORS.astype(int))
         self.cmap_normed = pg.ColorMap(color_positions, self.COLORS_INV / 255)
@@ -1667,44 +1670,44 @@ class ColorScaleRdBuRev(ColorScale):
 class QudiPalette:
     """ Qudi saturated color palette """
 
-    blue = pg.mkColor(34, 23, 244)
+    blue = QtGui.QColor(34, 23, 244)
     c1 = blue
 
-    orange = pg.mkColor(255, 164, 14)
+    orange = QtGui.QColor(255, 164, 14)
     c2 = orange
 
-    magenta = pg.mkColor(255, 52, 135)
+    magenta = QtGui.QColor(255, 52, 135)
     c3 = magenta
 
-    green = pg.mkColor(0, 139, 0)
+    green = QtGui.QColor(0, 139, 0)
     c4 = green
 
-    cyan = pg.mkColor(23, 190, 207)
+    cyan = QtGui.QColor(23, 190, 207)
     c5 = cyan
 
-    purple = pg.mkColor(133, 0, 133)
+    purple = QtGui.QColor(133, 0, 133)
     c6 = purple
 
 
 class QudiPalettePale:
     """ Qudi desaturated color palette """
 
-    blue = pg.mkColor(102, 94, 252)
+    blue = QtGui.QColor(102, 94, 252)
     c1 = blue
 
-    orange = pg.mkColor(255, 175, 43)
+    orange = QtGui.QColor(255, 175, 43)
     c2 = orange
 
-    magenta = pg.mkColor(255, 81, 152)
+    magenta = QtGui.QColor(255, 81, 152)
     c3 = magenta
 
-    green = pg.mkColor(0, 179, 0)
+    green = QtGui.QColor(0, 179, 0)
     c4 = green
 
-    cyan = pg.mkColor(59, 217, 233)
+    cyan = QtGui.QColor(59, 217, 233)
     c5 = cyan
 
-    purple = pg.mkColor(188, 0, 188)
+    purple = QtGui.QColor(188, 0, 188)
     c6 = purple
 
 
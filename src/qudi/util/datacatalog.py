@@ -0,0 +1,483 @@
+# -*- coding: utf-8 -*-
+
+"""
+This file contains an SQLite based catalog of measurement data files saved by qudi data storage
+objects. The catalog can be queried for files by nametag, timestamp and metadata values without
+opening and parsing each file. Existing data directory trees can be (re-)indexed incrementally.
+
+Use from command line to (re-)index a data directory tree:
+
+    python -m qudi.util.datacatalog <data root directory> [--catalog <path to catalog file>]
+
+Copyright (c) 2021, the qudi developers. See the AUTHORS.md file at the top-level directory of this
+distribution and on <https://github.com/Ulm-IQO/qudi-core/>
+
+This file is part of qudi.
+
+Qudi is free software: you can redistribute it and/or modify it under the terms of
+the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+
+Qudi is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with qudi.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+__all__ = ['DataCatalog', 'flatten_metadata', 'get_default_catalog_path', 'main']
+
+import os
+import re
+import sys
+import argparse
+import sqlite3
+import threading
+import numpy as np
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+from qudi.util.paths import get_appdata_dir
+from qudi.util.datastorage import get_header_from_file, get_info_from_header, str_dict_to_metadata
+from qudi.util.datastorage import NpyDataStorage, NpyChunkDataStorage, Hdf5DataStorage, h5py
+from qudi.util.datastorage import _open_text_file, _text_compression
+
+_RealNumber = Union[int, float]
+
+_filename_regex = re.compile(r'\A\d{8}-\d{4}-\d{2}(?:_(.+))?\Z')
+
+_compression_suffixes = frozenset(suffix for suffix, _, _ in _text_compression.values())
+
+
+def get_default_catalog_path() -> str:
+    """ Returns the default file path of the data catalog in the qudi AppData directory """
+    return os.path.join(get_appdata_dir(), 'data_catalog.sqlite')
+
+
+def flatten_metadata(metadata: Mapping[str, Any], separator: Optional[str] = '.'
+                     ) -> Dict[str, Any]:
+    """ Flattens nested metadata dicts into a single dict with joined keys, e.g.
+    {'a': {'b': 1}} -> {'a.b': 1}
+    """
+    flat = dict()
+    for key, value in metadata.items():
+        key = str(key)
+        if isinstance(value, Mapping) and value:
+            for sub_key, sub_value in flatten_metadata(value, separator).items():
+                flat[f'{key}{separator}{sub_key}'] = sub_value
+        else:
+            flat[key] = value
+    return flat
+
+
+def _nametag_from_path(file_path: str) -> Union[None, str]:
+    """ Extracts the nametag from a qudi standard file name (see get_timestamp_filename) """
+    name = os.path.basename(file_path).split('.', 1)[0]
+    match = _filename_regex.match(name)
+    return match.group(1) if match else None
+
+
+def _numeric_value(value: Any) -> Union[None, float]:
+    if isinstance(value, (bool, np.bool_)):
+        return None
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return float(value)
+    return None
+
+
+class DataCatalog:
+    """ SQLite based catalog of saved measurement data files.
+
+    Each entry holds the absolute file path, timestamp, nametag, data shape, dtype, the name of the
+    storage class used and flattened metadata (global and local metadata).
+    Metadata values are stored as repr strings and can be reconstructed via eval (same as in
+    qudi data file headers). Numeric metadata values can additionally be queried by range.
+
+    Instances of this class can be shared between threads.
+    """
+
+    _schema = """
+        CREATE TABLE IF NOT EXISTS files (
+            id INTEGER PRIMARY KEY,
+            path TEXT UNIQUE NOT NULL,
+            timestamp TEXT,
+            nametag TEXT,
+            storage TEXT,
+            shape TEXT,
+            dtype TEXT,
+            mtime REAL,
+            size INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS metadata (
+            file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+            key TEXT NOT NULL,
+            value TEXT,
+            number REAL
+        );
+        CREATE INDEX IF NOT EXISTS files_timestamp_idx ON files(timestamp);
+        CREATE INDEX IF NOT EXISTS files_nametag_idx ON files(nametag);
+        CREATE INDEX IF NOT EXISTS metadata_file_idx ON metadata(file_id);
+        CREATE INDEX IF NOT EXISTS metadata_value_idx ON metadata(key, value);
+        CREATE INDEX IF NOT EXISTS metadata_number_idx ON metadata(key, number);
+    """
+
+    def __init__(self, catalog_path: Optional[str] = None):
+        """
+        @param str catalog_path: optional, path to the SQLite catalog file. Will be created if
+                                 missing. Defaults to "data_catalog.sqlite" in qudi AppData dir.
+        """
+        if catalog_path is None:
+            catalog_path = get_default_catalog_path()
+        if catalog_path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(catalog_path)), exist_ok=True)
+        self._catalog_path = catalog_path
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(catalog_path, check_same_thread=False)
+        with self._lock:
+            self._connection.execute('PRAGMA foreign_keys = ON')
+            self._connection.executescript(self._schema)
+            self._connection.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def catalog_path(self) -> str:
+        return self._catalog_path
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def add_file(self,
+                 file_path: str,
+                 *,
+                 timestamp: Optional[datetime] = None,
+                 nametag: Optional[str] = None,
+                 shape: Optional[Tuple[int, ...]] = None,
+                 dtype: Optional[Any] = None,
+                 metadata: Optional[Mapping[str, Any]] = None,
+                 storage: Optional[str] = None) -> None:
+        """ Add a data file to the catalog or update an existing entry with the same path.
+
+        @param str file_path: path of the data file
+        @param datetime.datetime timestamp: optional, timestamp of the data file
+        @param str nametag: optional, nametag of the data file. Derived from file name if omitted.
+        @param tuple shape: optional, shape of the saved data
+        @param dtype: optional, dtype of the saved data (numpy dtype, type or sequence of types)
+        @param dict metadata: optional, metadata dict saved with the data
+        @param str storage: optional, name of the storage class used to save the data file
+        """
+        file_path = os.path.abspath(file_path)
+        try:
+            stat = os.stat(file_path)
+            mtime, size = stat.st_mtime, stat.st_size
+        except FileNotFoundError:
+            mtime = size = None
+        if nametag is None:
+            nametag = _nametag_from_path(file_path)
+        rows = [
+            (key, repr(value), _numeric_value(value))
+            for key, value in flatten_metadata(metadata if metadata else dict()).items()
+        ]
+        with self._lock:
+            with self._connection:
+                self._connection.execute('DELETE FROM files WHERE path = ?', (file_path,))
+                cursor = self._connection.execute(
+                    'INSERT INTO files (path, timestamp, nametag, storage, shape, dtype, mtime, '
+                    'size) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                    (file_path,
+                     None if timestamp is None else timestamp.isoformat(),
+                     nametag,
+                     storage,
+                     None if shape is None else repr(tuple(shape)),
+                     None if dtype is None else self._dtype_to_str(dtype),
+                     mtime,
+                     size)
+                )
+                file_id = cursor.lastrowid
+                self._connection.executemany(
+                    'INSERT INTO metadata (file_id, key, value, number) VALUES (?, ?, ?, ?)',
+                    [(file_id, *row) for row in rows]
+                )
+
+    def update_file(self,
+                    file_path: str,
+                    *,
+                    shape: Optional[Tuple[int, ...]] = None,
+                    appended_shape: Optional[Tuple[int, ...]] = None) -> bool:
+        """ Update the shape, modification time and size of an existing entry after data has been
+        appended to the file. Metadata and all other information are kept.
+
+        @param str file_path: path of the data file
+        @param tuple shape: optional, new shape of the data in the file
+        @param tuple appended_shape: optional, shape of the data appended along the first axis.
+                                     Used to calculate the new shape if shape is not given.
+
+        @return bool: True if the entry has been updated, False if there is no entry for the file
+        """
+        file_path = os.path.abspath(file_path)
+        try:
+            stat = os.stat(file_path)
+            mtime, size = stat.st_mtime, stat.st_size
+        except FileNotFoundError:
+            mtime = size = None
+        with self._lock:
+            with self._connection:
+                row = self._connection.execute('SELECT shape FROM files WHERE path = ?',
+                                               (file_path,)).fetchone()
+                if row is None:
+                    return False
+                if shape is None and appended_shape is not None:
+                    old_shape = None if row[0] is None else eval(row[0])
+                    if old_shape:
+                        shape = (old_shape[0] + appended_shape[0], *appended_shape[1:])
+                    else:
+                        shape = appended_shape
+                self._connection.execute(
+                    'UPDATE files SET shape = ?, mtime = ?, size = ? WHERE path = ?',
+                    (row[0] if shape is None else repr(tuple(shape)), mtime, size, file_path)
+                )
+        return True
+
+    def index_file(self,
+                   file_path: str,
+                   *,
+                   text_extensions: Optional[Iterable[str]] = ('.dat', '.csv', '.txt')) -> bool:
+        """ Add a single data file to the catalog (or update its entry) by reading back all
+        information from the file itself.
+
+        @param str file_path: path of the data file
+        @param iterable text_extensions: optional, file extensions of text data files to consider
+
+        @return bool: True if the file has been indexed, False if the file type is not supported
+        """
+        text_extensions = tuple(ext.lower() for ext in text_extensions)
+        info = self._read_file_info(os.path.abspath(file_path), text_extensions)
+        if info is None:
+            return False
+        self.add_file(file_path, **info)
+        return True
+
+    def remove_file(self, file_path: str) -> None:
+        """ Remove a data file entry from the catalog. Does not raise an error if not found. """
+        with self._lock:
+            with self._connection:
+                self._connection.execute('DELETE FROM files WHERE path = ?',
+                                         (os.path.abspath(file_path),))
+
+    def query(self,
+              *,
+              nametag: Optional[str] = None,
+              start: Optional[datetime] = None,
+              stop: Optional[datetime] = None,
+              root_dir: Optional[str] = None,
+              metadata: Optional[Mapping[str, Any]] = None,
+              metadata_range: Optional[Mapping[str, Tuple[_RealNumber, _RealNumber]]] = None,
+              limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """ Query the catalog for data files. All given criteria must apply.
+        Results are sorted by timestamp.
+
+        @param str nametag: optional, nametag to match. SQL "LIKE" wildcards (%, _) are allowed.
+        @param datetime.datetime start: optional, earliest timestamp (inclusive)
+        @param datetime.datetime stop: optional, latest timestamp (inclusive)
+        @param str root_dir: optional, only return files located in this directory tree
+        @param dict metadata: optional, flattened metadata key-value pairs that must match exactly
+        @param dict metadata_range: optional, flattened metadata keys with (min, max) value range
+        @param int limit: optional, maximum number of results
+
+        @return list: List of result dicts with keys "path", "timestamp", "nametag", "storage",
+                      "shape", "dtype" and "metadata" (flattened)
+        """
+        conditions = list()
+        parameters = list()
+        if nametag is not None:
+            conditions.append('f.nametag LIKE ?')
+            parameters.append(nametag)
+        if start is not None:
+            conditions.append('f.timestamp >= ?')
+            parameters.append(start.isoformat())
+        if stop is not None:
+            conditions.append('f.timestamp <= ?')
+            parameters.append(stop.isoformat())
+        if root_dir is not None:
+            # Exact, case-sensitive prefix match (LIKE would treat "_" and "%" as wildcards)
+            prefix = os.path.join(os.path.abspath(root_dir), '')
+            conditions.append('substr(f.path, 1, ?) = ?')
+            parameters.extend((len(prefix), prefix))
+        for key, value in (metadata.items() if metadata else tuple()):
+            conditions.append('EXISTS (SELECT 1 FROM metadata m WHERE m.file_id = f.id AND '
+                              'm.key = ? AND m.value = ?)')
+            parameters.extend((key, repr(value)))
+        for key, (min_value, max_value) in (metadata_range.items() if metadata_range else tuple()):
+            conditions.append('EXISTS (SELECT 1 FROM metadata m WHERE m.file_id = f.id AND '
+                              'm.key = ? AND m.number BETWEEN ? AND ?)')
+            parameters.extend((key, min_value, max_value))
+        sql = 'SELECT f.id, f.path, f.timestamp, f.nametag, f.storage, f.shape, f.dtype ' \
+              'FROM files f'
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        sql += ' ORDER BY f.timestamp'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            parameters.append(int(limit))
+
+        with self._lock:
+            files = self._connection.execute(sql, parameters).fetchall()
+            results = list()
+            for file_id, path, timestamp, tag, storage, shape, dtype in files:
+                meta_rows = self._connection.execute(
+                    'SELECT key, value FROM metadata WHERE file_id = ?', (file_id,)
+                ).fetchall()
+                results.append({
+                    'path': path,
+                    'timestamp': None if timestamp is None else datetime.fromisoformat(timestamp),
+                    'nametag': tag,
+                    'storage': storage,
+                    'shape': None if shape is None else eval(shape),
+                    'dtype': dtype,
+                    'metadata': str_dict_to_metadata(dict(meta_rows))
+                })
+        return results
+
+    def reindex(self,
+                root_dir: str,
+                *,
+                text_extensions: Optional[Iterable[str]] = ('.dat', '.csv', '.txt'),
+                prune: Optional[bool] = True) -> Tuple[int, int]:
+        """ Incrementally (re-)index all qudi data files found in a directory tree.
+        Files that did not change since they have been indexed (modification time and size) are
+        skipped.
+
+        @param str root_dir: root directory of the tree to index
+        @param iterable text_extensions: optional, file extensions of text data files to consider
+        @param bool prune: optional, remove entries of files that do not exist anymore (default)
+
+        @return (int, int): number of added/updated entries, number of removed entries
+        """
+        root_dir = os.path.abspath(root_dir)
+        prefix = os.path.join(root_dir, '')
+        text_extensions = tuple(ext.lower() for ext in text_extensions)
+        with self._lock:
+            known = {path: (mtime, size) for path, mtime, size in self._connection.execute(
+                'SELECT path, mtime, size FROM files WHERE substr(path, 1, ?) = ?',
+                (len(prefix), prefix)
+            )}
+        updated = 0
+        found = set()
+        for dir_path, dir_names, file_names in os.walk(root_dir):
+            if NpyChunkDataStorage._manifest_filename in file_names:
+                # Run directory of NpyChunkDataStorage is indexed as a single data set
+                dir_names.clear()
+                file_names = [None]
+            for file_name in file_names:
+                file_path = dir_path if file_name is None else os.path.join(dir_path, file_name)
+                try:
+                    stat = os.stat(file_path)
+                except OSError:
+                    # File removed during the walk, broken link or missing permissions
+                    continue
+                if known.get(file_path, None) == (stat.st_mtime, stat.st_size):
+                    found.add(file_path)
+                    continue
+                try:
+                    info = self._read_file_info(file_path, text_extensions)
+                except Exception:
+                    # Not a qudi data file or broken file
+                    continue
+                if info is not None:
+                    found.add(file_path)
+                    self.add_file(file_path, **info)
+                    updated += 1
+        removed = 0
+        if prune:
+            for file_path in set(known).difference(found):
+                if not os.path.exists(file_path):
+                    self.remove_file(file_path)
+                    removed += 1
+        return updated, removed
+
+    @staticmethod
+    def _read_file_info(file_path: str, text_extensions: Tuple[str, ...]
+                        ) -> Union[None, Dict[str, Any]]:
+        """ Helper to read back catalog information from a qudi data file. Returns None if the
+        file type is not supported.
+        """
+        root, extension = os.path.splitext(file_path)
+        extension = extension.lower()
+        if extension in _compression_suffixes:
+            # Compressed text data file
+            extension = os.path.splitext(root)[1].lower()
+        if os.path.isdir(file_path):
+            data, metadata, general = NpyChunkDataStorage.load_data(file_path)
+            info = {'shape': data.shape, 'dtype': data.dtype, 'storage': 'NpyChunkDataStorage'}
+        elif extension == '.npy':
+            data, metadata, general = NpyDataStorage.load_data(file_path, mmap=True)
+            info = {'shape': data.shape, 'dtype': data.dtype, 'storage': 'NpyDataStorage'}
+            del data
+        elif extension == '.h5':
+            if h5py is None:
+                return None
+            _, metadata, general = Hdf5DataStorage.load_data(file_path, index=slice(0, 0))
+            info = {'shape': general['shape'],
+                    'dtype': general['dtype'],
+                    'storage': 'Hdf5DataStorage'}
+        elif extension in text_extensions and not file_path.endswith('_metadata.txt'):
+            header, header_lines = get_header_from_file(file_path)
+            general, metadata = get_info_from_header(header)
+            with _open_text_file(file_path) as file:
+                rows = sum(chunk.count('\n') for chunk in iter(lambda: file.read(1 << 20), ''))
+            rows -= header_lines + 1
+            if extension == '.csv' and general['column_headers']:
+                rows -= 1
+            dtypes = general['column_dtypes']
+            if dtypes is None:
+                shape = None
+            elif isinstance(dtypes, type):
+                shape = (rows,)
+            else:
+                shape = (rows, len(dtypes))
+            info = {'shape': shape,
+                    'dtype': dtypes,
+                    'storage': 'CsvDataStorage' if extension == '.csv' else 'TextDataStorage'}
+        else:
+            return None
+        info['timestamp'] = general.get('timestamp', None)
+        info['metadata'] = metadata
+        return info
+
+    @staticmethod
+    def _dtype_to_str(dtype: Any) -> str:
+        if isinstance(dtype, type):
+            return dtype.__name__
+        if isinstance(dtype, (tuple, list)):
+            return ';;'.join(DataCatalog._dtype_to_str(typ) for typ in dtype)
+        return str(np.dtype(dtype))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog='python -m qudi.util.datacatalog',
+                                     description='Incrementally (re-)index a qudi data directory '
+                                                 'tree into an SQLite data catalog.')
+    parser.add_argument('root_dir', help='Root directory of the data directory tree to index.')
+    parser.add_argument('-c',
+                        '--catalog',
+                        default=None,
+                        help=f'Path to the catalog file to use instead of the default one '
+                             f'"{get_default_catalog_path()}"')
+    parser.add_argument('--no-prune',
+                        action='store_true',
+                        help='Do not remove catalog entries of files that do not exist anymore.')
+    args = parser.parse_args(argv)
+    with DataCatalog(args.catalog) as catalog:
+        updated, removed = catalog.reindex(args.root_dir, prune=not args.no_prune)
+        print(f'Indexed {updated:d} new or changed files and removed {removed:d} stale entries '
+              f'in data catalog "{catalog.catalog_path}".')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -23,25 +23,50 @@ If not, see <https://www.gnu.org/licenses/>.
 __all__ = ('get_timestamp_filename', 'format_column_headers', 'format_header',
            'metadata_to_str_dict', 'str_dict_to_metadata', 'get_header_from_file',
            'get_info_from_header', 'CsvDataStorage', 'create_dir_for_file', 'DataStorageBase',
-           'ImageFormat', 'NpyDataStorage', 'TextDataStorage')
+           'AsyncSaveQueue', 'ChunkedArrayView', 'Hdf5DataStorage', 'ImageFormat', 'NpyDataStorage',
+           'NpyChunkDataStorage', 'QueueFullPolicy', 'TextDataStorage', 'TextDataStreamWriter')
 
 import os
 import re
+import bz2
 import copy
+import gzip
+import functools
+import json
+import lzma
+import bisect
+import time
+import queue
+import pickle
+import atexit
+import itertools
+import logging
+import threading
+import multiprocessing
 import numpy as np
 import matplotlib.pyplot as plt
 
 from enum import Enum
+from types import MappingProxyType
 from datetime import datetime
 from abc import ABCMeta, abstractmethod
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from matplotlib.backends.backend_pdf import PdfPages
 from configparser import ConfigParser
 from io import StringIO
 
+try:
+    import h5py
+except ImportError:
+    h5py = None
+
 from qudi.util.mutex import Mutex
 from qudi.util.helpers import is_string_type, is_integer_type, is_float_type, is_complex_type
 from qudi.util.helpers import is_string, is_integer, is_float, is_complex, is_number
 
+_log = logging.getLogger(__name__)
+
 
 class ImageFormat(Enum):
     """ Image format to use for saving data thumbnails.
@@ -162,14 +187,46 @@ def _is_1d_array(array):
         raise ValueError('Checking if empty array is 1D is not allowed.')
 
 
+def _flatten_rows(rows):
+    """ Helper to flatten a sequence of data rows into a single list of values (row-major).
+    Numpy arrays of numeric or str dtype are converted to Python scalars in one go, which does not
+    alter the outcome of str.format but is considerably faster than formatting numpy scalars.
+    """
+    if isinstance(rows, np.ndarray):
+        if rows.dtype.names is None:
+            if rows.dtype.kind in 'biufcU':
+                return rows.ravel().tolist()
+        elif all(rows.dtype[name].kind in 'biufcU' for name in rows.dtype.names):
+            return list(itertools.chain.from_iterable(rows.tolist()))
+    return list(itertools.chain.from_iterable(rows))
+
+
+def _render_config_section(name, str_dict):
+    """ Helper to render a single header section (config format) from a dict of str values.
+
+    @return list: Lines of the section including the "[name]" line
+    """
+    # Collect all data to include in the header into a config parser
+    config = ConfigParser(comment_prefixes=None, delimiters=('=',))
+    config[name] = str_dict
+    # Write config to string buffer instead of a temporary file
+    buffer = StringIO()
+    config.write(buffer, space_around_delimiters=False)
+    lines = buffer.getvalue().splitlines()
+    buffer.close()
+    # Strip trailing empty line
+    return lines[:-1]
+
+
 def format_header(timestamp, number_format=None, metadata=None, notes=None, column_dtypes=None,
-                  column_headers=None, comments=None, delimiter=None):
+                  column_headers=None, comments=None, delimiter=None, *, rendered_metadata=None):
     """
+    @param sequence rendered_metadata: optional, pre-rendered metadata section lines to put in front
+                                       of the lines for metadata (e.g. cached global metadata).
+                                       Keys must not collide with the keys in metadata.
     """
     if comments is None:
         comments = ''
-    # Collect all data to include in the header into a config parser
-    config = ConfigParser(comment_prefixes=None, delimiters=('=',))
 
     # write general section
     general_dict = {'timestamp': timestamp.isoformat()}
@@ -196,30 +253,69 @@ def format_header(timestamp, number_format=None, metadata=None, notes=None, colu
         general_dict['column_headers'] = repr(format_column_headers(column_headers))
     if notes:
         general_dict['notes'] = repr(notes)
-    config['General'] = general_dict
+    header_lines = _render_config_section('General', general_dict)
 
     # Write user metadata section
+    metadata_lines = list(rendered_metadata) if rendered_metadata else list()
     if metadata:
-        config['Metadata'] = metadata_to_str_dict(metadata)
-
-    # Write config to string buffer instead of a temporary file
-    buffer = StringIO()
-    config.write(buffer, space_around_delimiters=False)
-    buffer.seek(0)
-    header_lines = buffer.read().splitlines()
-    buffer.close()
+        metadata_lines.extend(
+            _render_config_section('Metadata', metadata_to_str_dict(metadata))[1:]
+        )
+    if metadata_lines:
+        header_lines.extend(['', '[Metadata]', *metadata_lines])
 
     # Include comment specifiers at the beginning of each line
     # Also add an "end header" marker for easier custom header parsing
-    header_lines.append('---- END HEADER ----')
+    header_lines.extend(['', '---- END HEADER ----'])
     line_sep = f'\n{comments}'
     return f'{comments}{line_sep.join(header_lines)}\n'
 
 
+# Supported compression methods for text data files with file name suffix, magic bytes and
+# module providing "open" and "compress" functions.
+_text_compression = {'gzip': ('.gz', b'\x1f\x8b', gzip),
+                     'bz2': ('.bz2', b'BZh', bz2),
+                     'lzma': ('.xz', b'\xfd7zXZ\x00', lzma)}
+
+
+def _detect_compression(file_path):
+    """ Helper to determine the compression method of a text data file by its magic bytes.
+
+    @return str: compression method name (see _text_compression) or None for uncompressed files
+    """
+    with open(file_path, 'rb') as file:
+        magic = file.read(6)
+    for compression, (_, compression_magic, _) in _text_compression.items():
+        if magic.startswith(compression_magic):
+            return compression
+    return None
+
+
+def _open_text_file(file_path):
+    """ Helper to open a (compressed) text data file for reading in text mode.
+    Compressed files are detected automatically and must be UTF-8 encoded.
+    """
+    compression = _detect_compression(file_path)
+    if compression is None:
+        return open(file_path, 'r')
+    return _text_compression[compression][2].open(file_path, 'rt', encoding='utf-8')
+
+
+def _compress_text(text, compression):
+    """ Helper to compress a string (UTF-8 encoded) into a self-contained compressed stream.
+    Compressed streams can be concatenated in a file and will be decompressed as a whole.
+    """
+    if compression == 'gzip':
+        # Use the zlib default level instead of gzip's maximum level 9 which is about twice as slow
+        # for only marginally smaller files.
+        return gzip.compress(text.encode('utf-8'), compresslevel=6)
+    return _text_compression[compression][2].compress(text.encode('utf-8'))
+
+
 def get_header_from_file(file_path):
     offset = 0
     comments = None
-    with open(file_path, 'r') as file:
+    with _open_text_file(file_path) as file:
         for line in file:
             # Determine comments specifier (if there is any)
             if line.endswith('---- END HEADER ----\n'):
@@ -281,6 +377,185 @@ def get_info_from_header(header):
     return general, metadata
 
 
+def _read_npy_header(file):
+    """ Helper to read the header of an open .npy file (version 1.0 or 2.0).
+    Leaves the file position at the start of the array data.
+
+    @return (tuple, tuple, bool, numpy.dtype, int): version, shape, fortran_order, dtype and the
+                                                    offset of the array data in bytes
+    """
+    file.seek(0)
+    version = np.lib.format.read_magic(file)
+    if version == (1, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(file)
+    elif version == (2, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(file)
+    else:
+        raise ValueError(f'Unsupported .npy file format version {version}')
+    return version, shape, fortran_order, dtype, file.tell()
+
+
+def _write_npy_header_shape(file, version, dtype, shape, data_offset):
+    """ Helper to overwrite the header dict of an open .npy file in place with a new shape.
+    The total header length (and hence the data offset) stays the same. Raises ValueError if the
+    header does not have enough spare room for the new shape.
+    """
+    # Header dict starts after magic string (6 bytes), version (2 bytes) and header length field
+    dict_start = 10 if version == (1, 0) else 12
+    max_length = data_offset - dict_start - 1  # Header must end with newline
+    header = f"{{'descr': {np.lib.format.dtype_to_descr(dtype)!r}, 'fortran_order': False, " \
+             f"'shape': {shape!r}, }}"
+    if len(header) > max_length:
+        raise ValueError('Not enough spare room in .npy file header to store new array shape.')
+    file.seek(dict_start)
+    file.write(header.ljust(max_length).encode('latin1') + b'\n')
+
+
+def _get_text_file_info(file_path, column_headers_row):
+    """ Helper to read back the header of a text data file and determine how to parse the data.
+
+    @param str file_path: path to text data file
+    @param bool column_headers_row: flag indicating an uncommented column headers row (CSV)
+
+    @return (dict, dict, int, dict, bool): general header info, metadata, number of lines before
+                                           the first data row, numpy loader keyword arguments and
+                                           flag indicating if the fast typed loader can be used
+    """
+    try:
+        header, header_lines = get_header_from_file(file_path)
+    except UnicodeError as err:
+        raise ValueError(_unicode_error_msg(file_path)) from err
+    general, metadata = get_info_from_header(header)
+    # Data starts after the header and the "---- END HEADER ----" line
+    start_line = header_lines + 1
+    if column_headers_row and general['column_headers']:
+        start_line += 1
+    # Determine dtype specifier from general header section
+    dtype = general['column_dtypes']
+    typed = True
+    if dtype is None:
+        # Column dtypes unknown. Let numpy.genfromtxt infer them like for mixed dtypes.
+        typed = False
+    elif not isinstance(dtype, type):
+        # If dtypes differ, construct a structured array
+        if all(dtype[0] == typ for typ in dtype):
+            dtype = dtype[0]
+        elif str in dtype:
+            # handle str type separately since this is (arguably) a bug in numpy.genfromtxt
+            dtype = None
+            typed = False
+        else:
+            dtype = [(f'f{col:d}', typ) for col, typ in enumerate(dtype)]
+    loader_kwargs = {'dtype': dtype,
+                     'comments': general['comments'],
+                     'delimiter': general['delimiter']}
+    return general, metadata, start_line, loader_kwargs, typed
+
+
+def _parse_text_data(source, loader_kwargs, typed, ndmin=0):
+    """ Helper to parse data rows from a file path or a sequence of lines with numpy.
+    Uses the fast typed numpy.loadtxt if possible and numpy.genfromtxt otherwise.
+    """
+    if typed:
+        return np.loadtxt(source, encoding=None, ndmin=ndmin, **loader_kwargs)
+    return np.genfromtxt(source, encoding=None, ndmin=ndmin, **loader_kwargs)
+
+
+def _unicode_error_msg(file_path):
+    return f'Loading data from file "{file_path}" failed. The file you are trying to load is ' \
+           f'most likely no unicode textfile.'
+
+
+def _load_text_data(file_path, column_headers_row):
+    """ Helper to load data, metadata and general header info from a qudi text data file.
+    """
+    general, metadata, start_line, loader_kwargs, typed = _get_text_file_info(file_path,
+                                                                              column_headers_row)
+    try:
+        with _open_text_file(file_path) as file:
+            for _ in range(start_line):
+                file.readline()
+            data = _parse_text_data(file, loader_kwargs, typed)
+    except UnicodeError as err:
+        raise ValueError(_unicode_error_msg(file_path)) from err
+    return data, metadata, general
+
+
+def _iter_text_data(file_path, chunk_rows, column_headers_row):
+    """ Generator helper to load data from a qudi text data file in chunks of rows.
+    """
+    if chunk_rows < 1:
+        raise ValueError('chunk_rows must be integer >= 1')
+    _, _, start_line, loader_kwargs, typed = _get_text_file_info(file_path, column_headers_row)
+    # Do not squeeze single rows in order to yield consistent chunk dimensions
+    dtype = loader_kwargs['dtype']
+    ndmin = 1 if isinstance(dtype, list) else 2
+    with _open_text_file(file_path) as file:
+        try:
+            for _ in range(start_line):
+                file.readline()
+            while True:
+                lines = list(itertools.islice(file, chunk_rows))
+                if not lines:
+                    break
+                data = _parse_text_data(lines, loader_kwargs, typed, ndmin)
+                if ndmin == 2 and data.shape[1] == 1:
+                    data = data[:, 0]
+                yield data
+        except UnicodeError as err:
+            raise ValueError(_unicode_error_msg(file_path)) from err
+
+
+def _save_figure(mpl_figure, file_path, image_format, preview_scale=None):
+    """ Helper to save a matplotlib figure to file in the given image format and optionally a
+    downscaled PNG preview image.
+
+    @return (str, str): Full path of the image and the preview image (or None)
+    """
+    image_path = file_path + image_format.value
+    if image_format is ImageFormat.PDF:
+        with PdfPages(image_path) as pdf:
+            pdf.savefig(mpl_figure, bbox_inches='tight', pad_inches=0.05)
+    elif image_format is ImageFormat.PNG:
+        mpl_figure.savefig(image_path, bbox_inches='tight', pad_inches=0.05)
+    else:
+        raise RuntimeError(f'Unknown image format selected: "{image_format}"')
+    if preview_scale is None:
+        return image_path, None
+    if preview_scale <= 0:
+        raise ValueError('preview_scale must be float > 0')
+    preview_path = file_path + '_preview' + ImageFormat.PNG.value
+    mpl_figure.savefig(preview_path,
+                       dpi=mpl_figure.dpi * preview_scale,
+                       bbox_inches='tight',
+                       pad_inches=0.05)
+    return image_path, preview_path
+
+
+def _render_pickled_figure(figure_bytes, file_path, image_format, preview_scale=None):
+    """ Helper to render a pickled matplotlib figure to file. Executed in a worker process.
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    mpl_figure = pickle.loads(figure_bytes)
+    try:
+        return _save_figure(mpl_figure, file_path, image_format, preview_scale)
+    finally:
+        plt.close(mpl_figure)
+
+
+def _descr_from_json(descr):
+    """ Helper to restore a numpy dtype descriptor (see numpy.lib.format.dtype_to_descr) that has
+    been serialized to JSON, i.e. with all tuples converted to lists.
+    """
+    if isinstance(descr, str):
+        return descr
+    return [(tuple(name) if isinstance(name, list) else name,
+             _descr_from_json(field_type),
+             *(tuple(shape) for shape in field_shape))
+            for name, field_type, *field_shape in descr]
+
+
 def create_dir_for_file(file_path):
     """ Helper method to create the directory (recursively) for a given file path.
     Will NOT raise an error if the directory already exists.
@@ -290,6 +565,248 @@ def create_dir_for_file(file_path):
     os.makedirs(os.path.dirname(file_path), exist_ok=True)
 
 
+class QueueFullPolicy(Enum):
+    """ Behaviour of AsyncSaveQueue upon submitting a job while the queue is full.
+    BLOCK: Wait until there is room in the queue.
+    DROP_OLDEST: Cancel the oldest pending job to make room.
+    RAISE: Raise queue.Full exception.
+    """
+    BLOCK = 'block'
+    DROP_OLDEST = 'drop_oldest'
+    RAISE = 'raise'
+
+
+class AsyncSaveQueue:
+    """ Bounded job queue executing (data saving) jobs one after the other in a dedicated writer
+    thread. Each submitted job returns a concurrent.futures.Future object.
+    The writer thread is started upon first job submission and the queue is drained upon
+    interpreter exit.
+    """
+
+    def __init__(self, max_size=100, policy=QueueFullPolicy.BLOCK):
+        """
+        @param int max_size: Maximum number of pending jobs in the queue
+        @param QueueFullPolicy policy: Behaviour upon submitting a job to a full queue
+        """
+        if not isinstance(policy, QueueFullPolicy):
+            raise TypeError('policy must be QueueFullPolicy Enum')
+        self.policy = policy
+
+        self._jobs = deque()
+        self._condition = threading.Condition()
+        self._thread = None
+        self._busy = False
+        self._current_job = None
+        self._max_size = 1
+        self.max_size = max_size
+        self._stopped = False
+        self._stats = {'peak_queue_depth': 0,
+                       'submitted': 0,
+                       'completed': 0,
+                       'failed': 0,
+                       'dropped': 0,
+                       'total_write_time': 0.,
+                       'max_write_time': 0.,
+                       'total_latency': 0.,
+                       'max_latency': 0.}
+
+    @property
+    def max_size(self):
+        """ Maximum number of pending jobs in the queue
+        """
+        return self._max_size
+
+    @max_size.setter
+    def max_size(self, value):
+        value = int(value)
+        if value < 1:
+            raise ValueError('max_size must be integer >= 1')
+        with self._condition:
+            self._max_size = value
+            # Wake up submitters waiting for room in the queue
+            self._condition.notify_all()
+
+    @property
+    def queue_depth(self):
+        """ Number of pending jobs (excluding the job currently executed)
+        """
+        with self._condition:
+            return len(self._jobs)
+
+    def get_stats(self):
+        """ Returns queue depth and write latency statistics. "write_time" denotes the time spent
+        executing a job while "latency" denotes the time between job submission and completion.
+        All times in seconds.
+
+        @return dict: statistics dict
+        """
+        with self._condition:
+            stats = self._stats.copy()
+            stats['queue_depth'] = len(self._jobs)
+            stats['busy'] = self._busy
+        finished = stats['completed'] + stats['failed']
+        stats['mean_write_time'] = stats.pop('total_write_time') / finished if finished else 0.
+        stats['mean_latency'] = stats.pop('total_latency') / finished if finished else 0.
+        return stats
+
+    def get_pending_jobs(self):
+        """ Returns a description of the job currently executed (if any) and all pending jobs.
+
+        @return list: Description strings of unfinished jobs in order of execution
+        """
+        with self._condition:
+            jobs = list(self._jobs)
+            if self._current_job is not None:
+                jobs.insert(0, self._current_job)
+        now = time.perf_counter()
+        return [self._describe_job(func, kwargs, now - submit_time)
+                for _, submit_time, func, _, kwargs in jobs]
+
+    @staticmethod
+    def _describe_job(func, kwargs, age):
+        name = getattr(func, '__qualname__', repr(func))
+        arguments = ', '.join(f'{key}={kwargs[key]!r}' for key in ('filename', 'nametag')
+                              if kwargs.get(key, None) is not None)
+        return f'{name}({arguments}) submitted {age:.1f} s ago'
+
+    def submit(self, func, *args, **kwargs):
+        """ Submit a job to be executed in the writer thread as func(*args, **kwargs).
+
+        @return concurrent.futures.Future: Future object representing the submitted job
+        """
+        future = Future()
+        with self._condition:
+            if self._stopped:
+                raise RuntimeError('Can not submit job to AsyncSaveQueue after shutdown.')
+            if len(self._jobs) >= self.max_size:
+                if self.policy is QueueFullPolicy.RAISE:
+                    raise queue.Full(f'AsyncSaveQueue is full ({self.max_size:d} pending jobs).')
+                elif self.policy is QueueFullPolicy.DROP_OLDEST:
+                    self._jobs.popleft()[0].cancel()
+                    self._stats['dropped'] += 1
+                else:
+                    self._condition.wait_for(
+                        lambda: len(self._jobs) < self.max_size or self._stopped
+                    )
+                    if self._stopped:
+                        raise RuntimeError('AsyncSaveQueue has been shut down while waiting.')
+            self._jobs.append((future, time.perf_counter(), func, args, kwargs))
+            self._stats['submitted'] += 1
+            self._stats['peak_queue_depth'] = max(self._stats['peak_queue_depth'],
+                                                  len(self._jobs))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run,
+                                                name='qudi-async-save-queue',
+                                                daemon=True)
+                self._thread.start()
+                atexit.register(self.shutdown)
+            self._condition.notify_all()
+        return future
+
+    def drain(self, timeout=None):
+        """ Wait until all pending jobs have been executed.
+
+        @param float timeout: optional, maximum time in seconds to wait (None for no timeout)
+
+        @return bool: True if all jobs have been executed, False if timeout occurred
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._jobs and not self._busy, timeout)
+
+    def shutdown(self, timeout=None):
+        """ Stop accepting new jobs, wait for all pending jobs to finish and stop the writer thread.
+
+        @param float timeout: optional, maximum time in seconds to wait (None for no timeout)
+
+        @return bool: True if all jobs have been executed, False if timeout occurred
+        """
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        drained = self.drain(timeout)
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return drained
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._jobs or self._stopped)
+                if not self._jobs:
+                    return
+                job = self._jobs.popleft()
+                future, submit_time, func, args, kwargs = job
+                if not future.set_running_or_notify_cancel():
+                    continue
+                self._busy = True
+                self._current_job = job
+                self._condition.notify_all()
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except BaseException as err:
+                failed = True
+                future.set_exception(err)
+            else:
+                failed = False
+                future.set_result(result)
+            stop = time.perf_counter()
+            with self._condition:
+                self._busy = False
+                self._current_job = None
+                self._stats['failed' if failed else 'completed'] += 1
+                self._stats['total_write_time'] += stop - start
+                self._stats['max_write_time'] = max(self._stats['max_write_time'], stop - start)
+                self._stats['total_latency'] += stop - submit_time
+                self._stats['max_latency'] = max(self._stats['max_latency'], stop - submit_time)
+                self._condition.notify_all()
+
+
+def _is_same_metadata_value(value, other):
+    """ Helper to check if two metadata values are identical, i.e. of the same type and equal.
+    Values that can not be compared (e.g. containers of arrays) are considered different.
+    """
+    if value is other:
+        return True
+    if type(value) is not type(other):
+        return False
+    if isinstance(value, np.ndarray):
+        return value.dtype == other.dtype and np.array_equal(value, other)
+    try:
+        return bool(value == other)
+    except (TypeError, ValueError):
+        return False
+
+
+class _GlobalMetadataSnapshot:
+    """ Immutable version of the global metadata shared by all DataStorageBase instances.
+    A new snapshot is created whenever the global metadata changes. The repr strings of the values
+    and the rendered header section lines are created lazily once per snapshot.
+    """
+
+    __slots__ = ('version', 'metadata', 'header_keys', '_str_dict', '_header_lines')
+
+    def __init__(self, version=0, metadata=None):
+        self.version = version
+        self.metadata = MappingProxyType(dict() if metadata is None else metadata)
+        # Keys as written to file headers (case-insensitive)
+        self.header_keys = frozenset(key.lower() for key in self.metadata)
+        self._str_dict = None
+        self._header_lines = None
+
+    @property
+    def str_dict(self):
+        if self._str_dict is None:
+            self._str_dict = MappingProxyType(metadata_to_str_dict(self.metadata))
+        return self._str_dict
+
+    @property
+    def header_lines(self):
+        if self._header_lines is None:
+            self._header_lines = tuple(_render_config_section('Metadata', self.str_dict)[1:])
+        return self._header_lines
+
+
 class DataStorageBase(metaclass=ABCMeta):
     """ Base helper class to store/load (measurement)data to/from disk.
     Subclasses handle saving and loading of measurement data (including metadata) for specific file
@@ -302,8 +819,16 @@ class DataStorageBase(metaclass=ABCMeta):
     If the storage type is file based and root_dir is not initialized, each call to save_data must
     provide the full save path information and not just a file name or name tag.
     """
-    _global_metadata = dict()
+    _global_metadata = _GlobalMetadataSnapshot()
     _global_metadata_lock = Mutex()
+    # Global metadata snapshot in use by an asynchronous saving job in the current thread
+    _global_metadata_override = threading.local()
+    _async_save_queue = None
+    _async_save_queue_lock = Mutex()
+    _thumbnail_pool = None
+    _thumbnail_pool_workers = 2
+    _thumbnail_pool_lock = Mutex()
+    _catalog = None
 
     def __init__(self, *, root_dir=None, include_global_metadata=True,
                  image_format=ImageFormat.PNG):
@@ -319,29 +844,81 @@ class DataStorageBase(metaclass=ABCMeta):
         self.include_global_metadata = bool(include_global_metadata)
         self.image_format = image_format
 
-    def save_thumbnail(self, mpl_figure, file_path):
+    def save_thumbnail(self, mpl_figure, file_path, preview_scale=None):
         """ Save a matplotlib figure visualizing the saved data in the image format configured.
         It is recommended to use the same file_path as the corresponding data file (if applicable)
         and exclude the file extension (will be added according to image format).
 
         @param matplotlib.figure.Figure mpl_figure: The matplotlib figure object to save as image
         @param str file_path: full file path to use without file extension
+        @param float preview_scale: optional, additionally save a downscaled PNG preview image
+                                    ("<file_path>_preview.png") with this scaling factor
 
         @return str: Full absolute path of the saved image
         """
-        file_path += self.image_format.value
+        try:
+            return _save_figure(mpl_figure, file_path, self.image_format, preview_scale)[0]
+        finally:
+            # close matplotlib figure
+            plt.close(mpl_figure)
 
-        if self.image_format is ImageFormat.PDF:
-            with PdfPages(file_path) as pdf:
-                pdf.savefig(mpl_figure, bbox_inches='tight', pad_inches=0.05)
-        elif self.image_format is ImageFormat.PNG:
-            mpl_figure.savefig(file_path, bbox_inches='tight', pad_inches=0.05)
-        else:
-            raise RuntimeError(f'Unknown image format selected: "{self.image_format}"')
+    def save_thumbnail_async(self, mpl_figure, file_path, preview_scale=None):
+        """ Same as save_thumbnail but the figure is serialized and rendered in a separate process
+        (using the non-GUI matplotlib "Agg" backend). The figure is closed before this method
+        returns. Use configure_thumbnail_pool to set the number of worker processes.
 
-        # close matplotlib figure and return
-        plt.close(mpl_figure)
-        return file_path
+        For parameters see: qudi.util.datastorage.DataStorageBase.save_thumbnail
+
+        @return concurrent.futures.Future: Future object. Result is a tuple containing the full
+                                           path of the image and the preview image (or None)
+        """
+        try:
+            figure_bytes = pickle.dumps(mpl_figure)
+        finally:
+            plt.close(mpl_figure)
+        return self.get_thumbnail_pool().submit(_render_pickled_figure,
+                                                figure_bytes,
+                                                file_path,
+                                                self.image_format,
+                                                preview_scale)
+
+    @classmethod
+    def get_thumbnail_pool(cls):
+        """ Returns the process pool shared by all data storage objects for rendering thumbnails.
+        Creates a new one with default settings if needed.
+        """
+        with cls._thumbnail_pool_lock:
+            if DataStorageBase._thumbnail_pool is None:
+                DataStorageBase._thumbnail_pool = ProcessPoolExecutor(
+                    max_workers=DataStorageBase._thumbnail_pool_workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            return DataStorageBase._thumbnail_pool
+
+    @classmethod
+    def configure_thumbnail_pool(cls, max_workers=2):
+        """ Set the number of worker processes used to render thumbnails (see
+        save_thumbnail_async). Takes effect after pending renderings have finished.
+        """
+        if max_workers < 1:
+            raise ValueError('max_workers must be integer >= 1')
+        with cls._thumbnail_pool_lock:
+            DataStorageBase._thumbnail_pool_workers = int(max_workers)
+            pool = DataStorageBase._thumbnail_pool
+            DataStorageBase._thumbnail_pool = None
+        if pool is not None:
+            pool.shutdown(wait=False)
+
+    @classmethod
+    def shutdown_thumbnail_pool(cls, wait=True):
+        """ Shut down the thumbnail worker processes. If wait is True, wait for all pending
+        renderings to finish first. A new pool will be created upon the next thumbnail to render.
+        """
+        with cls._thumbnail_pool_lock:
+            pool = DataStorageBase._thumbnail_pool
+            DataStorageBase._thumbnail_pool = None
+        if pool is not None:
+            pool.shutdown(wait=wait)
 
     def get_unified_metadata(self, local_metadata=None):
         """ Helper method to return a dict containing provided local_metadata as well as global
@@ -351,11 +928,50 @@ class DataStorageBase(metaclass=ABCMeta):
 
         @return dict: New dict containing local_metadata and global metadata
         """
-        metadata = self.get_global_metadata() if self.include_global_metadata else dict()
+        if self.include_global_metadata:
+            metadata = dict(self._get_global_metadata_snapshot().metadata)
+        else:
+            metadata = dict()
         if local_metadata is not None:
             metadata.update(local_metadata)
         return metadata
 
+    def get_unified_metadata_str_dict(self, local_metadata=None):
+        """ Same as get_unified_metadata but returns the repr strings of the metadata values (see
+        metadata_to_str_dict). The global metadata strings are cached.
+
+        @param dict local_metadata: Metadata to include in addition to global metadata
+
+        @return dict: New dict containing local_metadata and global metadata repr strings
+        """
+        if self.include_global_metadata:
+            str_dict = dict(self._get_global_metadata_snapshot().str_dict)
+        else:
+            str_dict = dict()
+        str_dict.update(metadata_to_str_dict(local_metadata))
+        return str_dict
+
+    def get_header_metadata(self, local_metadata=None):
+        """ Helper method to prepare metadata for format_header. Returns the metadata to format
+        along with the cached, pre-rendered header lines of the global metadata (see
+        format_header argument "rendered_metadata").
+        If local metadata overrides global metadata, the unified metadata is returned instead
+        with no pre-rendered lines.
+
+        @param dict local_metadata: Metadata to include in addition to global metadata
+
+        @return dict, tuple: Metadata to format, pre-rendered global metadata lines
+        """
+        snapshot = self._get_global_metadata_snapshot()
+        if not self.include_global_metadata or not snapshot.metadata:
+            return dict() if local_metadata is None else local_metadata, tuple()
+        if local_metadata and not snapshot.header_keys.isdisjoint(
+                str(key).lower() for key in local_metadata):
+            metadata = dict(snapshot.metadata)
+            metadata.update(local_metadata)
+            return metadata, tuple()
+        return dict() if local_metadata is None else local_metadata, snapshot.header_lines
+
     @abstractmethod
     def save_data(self, data, *, metadata=None, notes=None, nametag=None, timestamp=None, **kwargs):
         """ This method must be implemented in a subclass. It should provide the facility to save an
@@ -385,36 +1001,186 @@ class DataStorageBase(metaclass=ABCMeta):
         """
         pass
 
+    def save_data_async(self, data, **kwargs):
+        """ Same as save_data but executed in a dedicated writer thread shared by all data storage
+        instances. Data array and metadata are copied before this method returns, so the caller is
+        free to alter them afterwards. The timestamp (if not given) and the global metadata are
+        also taken upon submission of the job, so later changes will not affect the saved file.
+        Use configure_async_save_queue to set the queue size and behaviour of a full queue.
+
+        For parameters see: qudi.util.datastorage.DataStorageBase.save_data
+
+        @return concurrent.futures.Future: Future object. Result is the return value of save_data
+        """
+        data = np.array(data, copy=True)
+        kwargs = copy.deepcopy(kwargs)
+        if kwargs.get('timestamp', None) is None:
+            kwargs['timestamp'] = datetime.now()
+        snapshot = DataStorageBase._global_metadata
+
+        @functools.wraps(self.save_data)
+        def save_job(*args, **kw):
+            DataStorageBase._global_metadata_override.snapshot = snapshot
+            try:
+                return self.save_data(*args, **kw)
+            finally:
+                DataStorageBase._global_metadata_override.snapshot = None
+
+        return self.get_async_save_queue().submit(save_job, data, **kwargs)
+
+    @classmethod
+    def get_async_save_queue(cls):
+        """ Returns the AsyncSaveQueue instance shared by all data storage objects in this process.
+        Creates a new one with default settings if needed.
+        """
+        with cls._async_save_queue_lock:
+            if DataStorageBase._async_save_queue is None:
+                DataStorageBase._async_save_queue = AsyncSaveQueue()
+            return DataStorageBase._async_save_queue
+
     @classmethod
-    def get_global_metadata(cls):
+    def configure_async_save_queue(cls, max_size=100, policy=QueueFullPolicy.BLOCK):
+        """ Set maximum number of pending jobs and behaviour of a full queue for all asynchronous
+        saving operations (see save_data_async).
+        """
+        save_queue = cls.get_async_save_queue()
+        save_queue.max_size = max_size
+        save_queue.policy = QueueFullPolicy(policy)
+
+    @classmethod
+    def get_async_save_stats(cls):
+        """ Returns queue depth and write latency statistics for asynchronous saving operations.
+        See: qudi.util.datastorage.AsyncSaveQueue.get_stats
+        """
+        return cls.get_async_save_queue().get_stats()
+
+    @classmethod
+    def drain_async_save_queue(cls, timeout=None):
+        """ Wait for all pending asynchronous saving operations to finish.
+
+        @param float timeout: optional, maximum time in seconds to wait (None for no timeout)
+
+        @return bool: True if all pending jobs have been executed, False if timeout occurred
+        """
+        with cls._async_save_queue_lock:
+            save_queue = DataStorageBase._async_save_queue
+        if save_queue is None:
+            return True
+        return save_queue.drain(timeout)
+
+    @classmethod
+    def get_pending_async_save_jobs(cls):
+        """ Returns a description of all unfinished asynchronous saving operations.
+        See: qudi.util.datastorage.AsyncSaveQueue.get_pending_jobs
+        """
+        with cls._async_save_queue_lock:
+            save_queue = DataStorageBase._async_save_queue
+        if save_queue is None:
+            return list()
+        return save_queue.get_pending_jobs()
+
+    @classmethod
+    def set_catalog(cls, catalog):
+        """ Set a data catalog to register every file saved by any data storage instance in.
+        Pass None to disable cataloging.
+
+        @param qudi.util.datacatalog.DataCatalog catalog: The catalog to use (or None)
+        """
+        DataStorageBase._catalog = catalog
+
+    @classmethod
+    def get_catalog(cls):
+        """ Returns the data catalog currently used (or None if cataloging is disabled).
+        """
+        return DataStorageBase._catalog
+
+    def _add_to_catalog(self, file_path, *, timestamp, shape, dtype, metadata):
+        """ Helper method to register a saved file in the data catalog (if set).
+        The nametag is derived from the file name by the catalog.
+        Errors are logged but will not interrupt saving data.
+        """
+        catalog = DataStorageBase._catalog
+        if catalog is None:
+            return
+        try:
+            catalog.add_file(file_path,
+                             timestamp=timestamp,
+                             shape=shape,
+                             dtype=dtype,
+                             metadata=self.get_unified_metadata(metadata),
+                             storage=type(self).__name__)
+        except Exception:
+            _log.exception(f'Unable to add file "{file_path}" to data catalog:')
+
+    @staticmethod
+    def _update_catalog(file_path, *, shape=None, appended_shape=None):
+        """ Helper method to update the shape of a file in the data catalog (if set) after data
+        has been appended. Files not registered yet are indexed by reading back the file.
+        Errors are logged but will not interrupt saving data.
+        """
+        catalog = DataStorageBase._catalog
+        if catalog is None:
+            return
+        try:
+            if not catalog.update_file(file_path, shape=shape, appended_shape=appended_shape):
+                catalog.index_file(file_path)
+        except Exception:
+            _log.exception(f'Unable to update file "{file_path}" in data catalog:')
+
+    @staticmethod
+    def get_global_metadata():
         """ Return a copy of the global metadata dict.
         """
-        with cls._global_metadata_lock:
-            return cls._global_metadata.copy()
+        return dict(DataStorageBase._global_metadata.metadata)
+
+    @staticmethod
+    def _get_global_metadata_snapshot():
+        """ Returns the global metadata snapshot to use in the current thread. This is the snapshot
+        taken upon submission while executing an asynchronous saving job (see save_data_async).
+        """
+        snapshot = getattr(DataStorageBase._global_metadata_override, 'snapshot', None)
+        return DataStorageBase._global_metadata if snapshot is None else snapshot
+
+    @staticmethod
+    def get_global_metadata_version():
+        """ Return the version number of the global metadata. It is incremented each time the
+        global metadata is changed by "add_global_metadata" or "remove_global_metadata".
+        """
+        return DataStorageBase._global_metadata.version
 
     @classmethod
     def add_global_metadata(cls, name, value=None, *, overwrite=False):
         """ Set a single global metadata key-value pair or alternatively multiple ones as dict.
         Metadata added this way will persist for all data storage instances in this process until
         being selectively removed by calls to "remove_global_metadata".
+        Overwriting keys with identical values does not change the global metadata version.
         """
         if isinstance(name, str):
             metadata = {name: copy.deepcopy(value)}
         elif isinstance(name, dict):
             if any(not isinstance(key, str) for key in name):
-                TypeError('Metadata dict must contain only str type keys.')
+                raise TypeError('Metadata dict must contain only str type keys.')
             metadata = copy.deepcopy(name)
         else:
             raise TypeError('add_global_metadata expects either a single dict as first argument or '
                             'a str key and a value as first two arguments.')
 
         with cls._global_metadata_lock:
+            snapshot = DataStorageBase._global_metadata
             if not overwrite:
-                duplicate_keys = set(metadata).intersection(cls._global_metadata)
+                duplicate_keys = set(metadata).intersection(snapshot.metadata)
                 if duplicate_keys:
                     raise KeyError(f'global metadata keys "{duplicate_keys}" already set while '
                                    f'overwrite flag is False.')
-            cls._global_metadata.update(metadata)
+            # Keep the current snapshot (and its rendered header) if nothing changes
+            metadata = {key: value for key, value in metadata.items() if
+                        key not in snapshot.metadata or
+                        not _is_same_metadata_value(snapshot.metadata[key], value)}
+            if metadata:
+                new_metadata = dict(snapshot.metadata)
+                new_metadata.update(metadata)
+                DataStorageBase._global_metadata = _GlobalMetadataSnapshot(snapshot.version + 1,
+                                                                           new_metadata)
 
     @classmethod
     def remove_global_metadata(cls, names):
@@ -424,8 +1190,151 @@ class DataStorageBase(metaclass=ABCMeta):
         if isinstance(names, str):
             names = [names]
         with cls._global_metadata_lock:
-            for name in names:
-                cls._global_metadata.pop(name, None)
+            snapshot = DataStorageBase._global_metadata
+            names = set(names).intersection(snapshot.metadata)
+            if names:
+                new_metadata = {key: value for key, value in snapshot.metadata.items()
+                                if key not in names}
+                DataStorageBase._global_metadata = _GlobalMetadataSnapshot(snapshot.version + 1,
+                                                                           new_metadata)
+
+
+class TextDataStreamWriter:
+    """ File writer object returned by TextDataStorage.new_stream (and subclasses) to append data
+    rows to a single text file at a high rate.
+    Keeps the file handle open and buffers formatted rows in memory until either flush_rows rows
+    are buffered or flush_interval seconds have passed since the last flush (checked upon write).
+    Closing the writer flushes the buffer and forces the file content to disk (fsync).
+    If the file is compressed, each flush appends a separate compressed stream to the file.
+
+    Can be used as context manager which will close the writer upon exit.
+    Just like the storage objects themselves, instances of this class are not thread-safe.
+    """
+
+    def __init__(self, storage, file_path, timestamp, *, flush_rows=1000, flush_interval=1.):
+        """
+        @param TextDataStorage storage: The storage instance used to format data rows
+        @param str file_path: Path of the already created data file to append to
+        @param datetime.datetime timestamp: Timestamp of the data file
+        @param int flush_rows: optional, max number of buffered rows before flushing to file
+        @param float flush_interval: optional, max time in seconds between flushes (None to
+                                     disable time-based flushing)
+        """
+        if flush_rows is not None and flush_rows < 1:
+            raise ValueError('flush_rows must be integer >= 1 or None')
+        if flush_interval is not None and flush_interval < 0:
+            raise ValueError('flush_interval must be float >= 0 or None')
+        self._storage = storage
+        self._file_path = file_path
+        self._timestamp = timestamp
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+
+        self._row_fmt_str = None
+        self._number_of_columns = None
+        self._buffer = list()
+        self._buffered_rows = 0
+        self._rows_written = 0
+        self._last_flush = time.monotonic()
+        # Use the compression of the existing file which might differ from the storage instance
+        self._compression = _detect_compression(file_path)
+        if self._compression is None:
+            self._file = open(file_path, 'a')
+        else:
+            self._file = open(file_path, 'ab')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def file_path(self):
+        return self._file_path
+
+    @property
+    def timestamp(self):
+        return self._timestamp
+
+    @property
+    def closed(self):
+        return self._file.closed
+
+    @property
+    def rows_written(self):
+        """ Total number of rows written by this writer including rows that are still buffered.
+        """
+        return self._rows_written + self._buffered_rows
+
+    def write(self, data):
+        """ Append single or multiple rows to the buffer and flush to file if needed.
+
+        @param numpy.ndarray data: data array to be appended (1D: single row, 2D: multiple rows)
+
+        @return (int, int): Number of rows written, Number of columns written
+        """
+        if self._file.closed:
+            raise ValueError(f'Stream writer for "{self._file_path}" is already closed.')
+        try:
+            is_1d = _is_1d_array(data)
+        except ValueError:
+            # Data array is empty
+            return 0, self._number_of_columns
+        first_row = data if is_1d else data[0]
+        if self._row_fmt_str is None:
+            self._row_fmt_str = self._storage._get_row_format_str(first_row)
+            self._number_of_columns = len(first_row)
+        elif len(first_row) != self._number_of_columns:
+            raise ValueError(f'Stream writer expects {self._number_of_columns:d} data columns but '
+                             f'{len(first_row):d} were given.')
+
+        if is_1d:
+            self._buffer.append(self._row_fmt_str.format(*data))
+            rows = 1
+        else:
+            self._buffer.extend(self._storage._iter_formatted_blocks(data,
+                                                                     self._row_fmt_str,
+                                                                     self._number_of_columns))
+            rows = len(data)
+        self._buffered_rows += rows
+
+        if self.flush_rows is not None and self._buffered_rows >= self.flush_rows:
+            self.flush()
+        elif self.flush_interval is not None and \
+                (time.monotonic() - self._last_flush) >= self.flush_interval:
+            self.flush()
+        return rows, self._number_of_columns
+
+    def flush(self):
+        """ Write all buffered rows to file.
+        """
+        if self._buffer:
+            if self._compression is None:
+                self._file.writelines(self._buffer)
+            else:
+                self._file.write(_compress_text(''.join(self._buffer), self._compression))
+            self._buffer.clear()
+            self._rows_written += self._buffered_rows
+            self._buffered_rows = 0
+        self._file.flush()
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        """ Flush all buffered rows, force the file content to disk and close the file handle.
+        Calling this method on an already closed writer has no effect.
+        """
+        if self._file.closed:
+            return
+        try:
+            self.flush()
+            os.fsync(self._file.fileno())
+        finally:
+            self._file.close()
+        if self._rows_written > 0:
+            self._storage._update_catalog(self._file_path,
+                                          appended_shape=(self._rows_written,
+                                                          self._number_of_columns))
 
 
 class TextDataStorage(DataStorageBase):
@@ -440,9 +1349,11 @@ class TextDataStorage(DataStorageBase):
 
     # Default format specifiers for all dtypes
     _default_fmt_for_type = {int: 'd', float: '.15e', complex: 'r', str: 's'}
+    # Number of rows to format at once when appending in bulk
+    _bulk_block_rows = 10000
 
     def __init__(self, *, root_dir, comments='# ', delimiter='\t', file_extension='.dat',
-                 column_formats=None, **kwargs):
+                 column_formats=None, compression=None, **kwargs):
         """
         @param str root_dir: Root directory for this storage instance to save files into
         @param str comments: optional, string to put at the beginning of comment and header lines
@@ -450,6 +1361,8 @@ class TextDataStorage(DataStorageBase):
         @param str file_extension: optional, file extension to use for text files
         @param str|sequence column_formats: optional, value format specifier (mini-language) for each
                                             column. Single string case will be used for all columns.
+        @param str compression: optional, compress files using "gzip", "bz2" or "lzma". The
+                                respective suffix (".gz", ".bz2" or ".xz") is added to file names.
         @param str|sequence column_headers: optional, sequence of strings containing column headers.
                                             If a single string is given, write it to file header
                                             without formatting.
@@ -461,8 +1374,10 @@ class TextDataStorage(DataStorageBase):
 
         self._file_extension = ''
         self._delimiter = '\t'
+        self._compression = None
         self.file_extension = file_extension
         self.delimiter = delimiter
+        self.compression = compression
         self.comments = comments if isinstance(comments, str) else None
         self.column_formats = column_formats
 
@@ -491,19 +1406,30 @@ class TextDataStorage(DataStorageBase):
             raise ValueError('delimiter must be non-empty string')
         self._delimiter = value
 
+    @property
+    def compression(self):
+        return self._compression
+
+    @compression.setter
+    def compression(self, value):
+        if value is not None and value not in _text_compression:
+            raise ValueError(f'compression must be None or one of {list(_text_compression)}')
+        self._compression = value
+
     def create_header(self, timestamp=None, metadata=None, notes=None, column_headers=None,
                       column_dtypes=None):
         """
         """
-        # Gather all metadata (both global and locally provided) into a single dict
-        metadata = self.get_unified_metadata(metadata)
+        # Gather all metadata (both global and locally provided). Global metadata is pre-rendered.
+        metadata, rendered_metadata = self.get_header_metadata(metadata)
         return format_header(timestamp,
                              metadata=metadata,
                              notes=notes,
                              column_headers=column_headers,
                              column_dtypes=column_dtypes,
                              comments=self.comments,
-                             delimiter=self.delimiter)
+                             delimiter=self.delimiter,
+                             rendered_metadata=rendered_metadata)
 
     def new_file(self, *, timestamp=None, metadata=None, notes=None, nametag=None,
                  column_headers=None, column_dtypes=None, filename=None):
@@ -519,6 +1445,27 @@ class TextDataStorage(DataStorageBase):
 
         @return (str, datetime.datetime): Full file path, timestamp used
         """
+        file_path, timestamp = self._create_file(timestamp=timestamp,
+                                                 metadata=metadata,
+                                                 notes=notes,
+                                                 nametag=nametag,
+                                                 column_headers=column_headers,
+                                                 column_dtypes=column_dtypes,
+                                                 filename=filename)
+        if column_dtypes is None or isinstance(column_dtypes, (type, str)):
+            # Number of columns unknown until data is appended
+            shape = None
+        else:
+            shape = (0, len(column_dtypes))
+        self._add_to_catalog(file_path,
+                             timestamp=timestamp,
+                             shape=shape,
+                             dtype=column_dtypes,
+                             metadata=metadata)
+        return file_path, timestamp
+
+    def _create_file(self, *, timestamp, metadata, notes, nametag, column_headers, column_dtypes,
+                     filename):
         # Create timestamp if missing
         if timestamp is None:
             timestamp = datetime.now()
@@ -526,6 +1473,8 @@ class TextDataStorage(DataStorageBase):
         if filename is None:
             filename = get_timestamp_filename(timestamp=timestamp,
                                               nametag=nametag) + self.file_extension
+            if self.compression is not None:
+                filename += _text_compression[self.compression][0]
         # Create header
         header = self.create_header(timestamp=timestamp,
                                     metadata=metadata,
@@ -536,18 +1485,54 @@ class TextDataStorage(DataStorageBase):
         file_path = os.path.join(self.root_dir, filename)
         create_dir_for_file(file_path)
         # Write to file. Overwrite silently.
-        with open(file_path, 'w') as file:
-            file.write(header)
+        if self.compression is None:
+            with open(file_path, 'w') as file:
+                file.write(header)
+        else:
+            with open(file_path, 'wb') as file:
+                file.write(_compress_text(header, self.compression))
         return file_path, timestamp
 
-    def append_file(self, data, file_path):
+    def new_stream(self, *, flush_rows=1000, flush_interval=1., **kwargs):
+        """ Create a new data file on disk (see new_file) and return a writer object to
+        successively append data rows to it. The writer keeps the file open and buffers rows in
+        memory. It should be used as context manager in order to reliably close it, e.g.:
+
+            with storage.new_stream(nametag='trace') as writer:
+                for row in data:
+                    writer.write(row)
+
+        @param int flush_rows: optional, max number of buffered rows before flushing to file
+        @param float flush_interval: optional, max time in seconds between flushes (None to
+                                     disable time-based flushing)
+        @param kwargs: keyword-only arguments passed on to new_file
+
+        @return TextDataStreamWriter: Writer object to append data rows to the new file
+        """
+        file_path, timestamp = self.new_file(**kwargs)
+        return TextDataStreamWriter(self,
+                                    file_path,
+                                    timestamp,
+                                    flush_rows=flush_rows,
+                                    flush_interval=flush_interval)
+
+    def append_file(self, data, file_path, *, bulk=True):
         """ Append single or multiple rows to an existing data file.
 
         @param numpy.ndarray data: data array to be appended (1D: single row, 2D: multiple rows)
         @param str file_path: file path to append to
+        @param bool bulk: optional, format and write multiple rows in blocks instead of row-by-row
+                          (default). The file content is identical in both cases. Ignored for
+                          compressed files which are always written in blocks.
 
         @return (int, int): Number of rows written, Number of columns written
         """
+        rows_columns = self._append_rows(data, file_path, bulk=bulk)
+        if rows_columns is not None:
+            self._update_catalog(file_path, appended_shape=rows_columns)
+        return rows_columns
+
+    def _append_rows(self, data, file_path, *, bulk=True):
         if not os.path.isfile(file_path):
             raise FileNotFoundError(f'File to append data to not found: "{file_path}"\n'
                                     f'Create a new file to append to by calling "new_file".')
@@ -562,31 +1547,70 @@ class TextDataStorage(DataStorageBase):
         # Deduce from first data row if no column_formats is configured
         first_row = data if is_1d else data[0]
         number_of_columns = len(first_row)
-        if not self.column_formats:
-            column_formats = [self._default_fmt_for_type[_value_to_dtype(val)] for val in first_row]
-        elif isinstance(self.column_formats, str):
-            column_formats = [self.column_formats] * number_of_columns
-        elif len(self.column_formats) != number_of_columns:
-            raise ValueError(
-                'column_formats sequence has not the same length as number of data columns.'
-            )
-        else:
-            column_formats = self.column_formats
-        row_fmt_str = self.delimiter.join(f'{{:{fmt}}}' for fmt in column_formats) + '\n'
+        row_fmt_str = self._get_row_format_str(first_row)
+
+        # Append data to file. Compressed files get one additional compressed stream per block.
+        # Use the compression of the existing file which might differ from this storage instance.
+        compression = _detect_compression(file_path)
+        if compression is not None:
+            with open(file_path, 'ab') as file:
+                if is_1d:
+                    file.write(_compress_text(row_fmt_str.format(*data), compression))
+                    rows_written = 1
+                else:
+                    rows_written = len(data)
+                    for block in self._iter_formatted_blocks(data, row_fmt_str, number_of_columns):
+                        file.write(_compress_text(block, compression))
+            return rows_written, number_of_columns
 
-        # Append data to file
         with open(file_path, 'a') as file:
-            # Write data row-by-row
             if is_1d:
                 file.write(row_fmt_str.format(*data))
                 rows_written = 1
+            elif bulk:
+                # Write data in blocks of rows with a single buffered call
+                rows_written = len(data)
+                file.writelines(
+                    self._iter_formatted_blocks(data, row_fmt_str, number_of_columns)
+                )
             else:
+                # Write data row-by-row
                 rows_written = 0
                 for data_row in data:
                     file.write(row_fmt_str.format(*data_row))
                     rows_written += 1
         return rows_written, number_of_columns
 
+    def _get_row_format_str(self, first_row):
+        """ Helper method to construct the format string for a single data row (including newline)
+        from the configured column_formats or from the value dtypes of the first data row.
+        """
+        number_of_columns = len(first_row)
+        if not self.column_formats:
+            column_formats = [self._default_fmt_for_type[_value_to_dtype(val)] for val in first_row]
+        elif isinstance(self.column_formats, str):
+            column_formats = [self.column_formats] * number_of_columns
+        elif len(self.column_formats) != number_of_columns:
+            raise ValueError(
+                'column_formats sequence has not the same length as number of data columns.'
+            )
+        else:
+            column_formats = self.column_formats
+        return self.delimiter.join(f'{{:{fmt}}}' for fmt in column_formats) + '\n'
+
+    def _iter_formatted_blocks(self, data, row_fmt_str, number_of_columns):
+        """ Generator formatting 2D data into text blocks of up to _bulk_block_rows rows each.
+        Each block is formatted with a single call to str.format using the flattened data values,
+        so the per-column format specifiers are applied exactly as in the row-by-row case.
+        """
+        block_size = self._bulk_block_rows
+        for start in range(0, len(data), block_size):
+            block = data[start:start + block_size]
+            values = _flatten_rows(block)
+            if len(values) != len(block) * number_of_columns:
+                raise ValueError('All data rows must have the same number of columns.')
+            yield (row_fmt_str * len(block)).format(*values)
+
     def save_data(self, data, *, timestamp=None, metadata=None, notes=None, nametag=None,
                   column_headers=None, column_dtypes=None, filename=None):
         """ See: DataStorageBase.save_data() for more information
@@ -599,15 +1623,20 @@ class TextDataStorage(DataStorageBase):
             column_dtypes = [_value_to_dtype(val) for val in first_row]
 
         # Create new data file (overwrite old one if it exists)
-        file_path, timestamp = self.new_file(timestamp=timestamp,
-                                             metadata=metadata,
-                                             notes=notes,
-                                             nametag=nametag,
-                                             column_headers=column_headers,
-                                             column_dtypes=column_dtypes,
-                                             filename=filename)
+        file_path, timestamp = self._create_file(timestamp=timestamp,
+                                                 metadata=metadata,
+                                                 notes=notes,
+                                                 nametag=nametag,
+                                                 column_headers=column_headers,
+                                                 column_dtypes=column_dtypes,
+                                                 filename=filename)
         # Append data to file
-        rows_columns = self.append_file(data, file_path=file_path)
+        rows_columns = self._append_rows(data, file_path=file_path)
+        self._add_to_catalog(file_path,
+                             timestamp=timestamp,
+                             shape=rows_columns,
+                             dtype=column_dtypes,
+                             metadata=metadata)
         return file_path, timestamp, rows_columns
 
     @staticmethod
@@ -616,31 +1645,20 @@ class TextDataStorage(DataStorageBase):
 
         @param str file_path: optional, path to file to load data from
         """
-        # Read back metadata
-        try:
-            header, header_lines = get_header_from_file(file_path)
-            general, metadata = get_info_from_header(header)
-            # Determine dtype specifier from general header section
-            dtype = general['column_dtypes']
-            if dtype is not None and not isinstance(dtype, type):
-                # If dtypes differ, construct a structured array
-                if all(dtype[0] == typ for typ in dtype):
-                    dtype = dtype[0]
-                elif str in dtype:
-                    # handle str type separately since this is (arguably) a bug in numpy.genfromtxt
-                    dtype = None
-                else:
-                    dtype = [(f'f{col:d}', typ) for col, typ in enumerate(dtype)]
-            # Load data from file
-            data = np.genfromtxt(file_path,
-                                 dtype=dtype,
-                                 comments=general['comments'],
-                                 delimiter=general['delimiter'],
-                                 skip_header=header_lines + 2)
-        except UnicodeError as err:
-            raise ValueError(f'Loading data from file "{file_path}" failed. The file you are '
-                             f'trying to load is most likely no unicode textfile.') from err
-        return data, metadata, general
+        return _load_text_data(file_path, column_headers_row=False)
+
+    @staticmethod
+    def iter_data(file_path, chunk_rows=10000):
+        """ Generator to load data from file in chunks of rows without reading the entire file into
+        memory. Header information can be loaded separately via get_header_from_file and
+        get_info_from_header.
+
+        @param str file_path: path to file to load data from
+        @param int chunk_rows: optional, max number of data rows per chunk
+
+        @return np.ndarray: data chunks
+        """
+        yield from _iter_text_data(file_path, chunk_rows, column_headers_row=False)
 
 
 class CsvDataStorage(TextDataStorage):
@@ -688,34 +1706,18 @@ class CsvDataStorage(TextDataStorage):
 
         @param str file_path: optional, path to file to load data from
         """
-        # Read back metadata
-        header, header_lines = get_header_from_file(file_path)
-        general, metadata = get_info_from_header(header)
-        # Determine dtype specifier from general header section
-        dtype = general['column_dtypes']
-        if dtype is not None and not isinstance(dtype, type):
-            # If dtypes differ, construct a structured array
-            if all(dtype[0] == typ for typ in dtype):
-                dtype = dtype[0]
-            elif str in dtype:
-                # handle str type separately since this is (arguably) a bug in numpy.genfromtxt
-                dtype = None
-            else:
-                dtype = [(f'f{col:d}', typ) for col, typ in enumerate(dtype)]
-        # Load data from file and skip header
-        start_line = header_lines + 2
-        if general['column_headers']:
-            start_line += 1
-        data = np.genfromtxt(file_path,
-                             dtype=dtype,
-                             comments=general['comments'],
-                             delimiter=general['delimiter'],
-                             skip_header=start_line)
-        return data, metadata, general
+        return _load_text_data(file_path, column_headers_row=True)
+
+    @staticmethod
+    def iter_data(file_path, chunk_rows=10000):
+        """ See: qudi.util.datastorage.TextDataStorage.iter_data()
+        """
+        yield from _iter_text_data(file_path, chunk_rows, column_headers_row=True)
 
 
 class NpyDataStorage(DataStorageBase):
     """ Helper class to store (measurement)data on disk as binary .npy file.
+    Data can be appended along the first axis and loaded as memory-mapped array.
     """
 
     def __init__(self, *, root_dir, **kwargs):
@@ -728,13 +1730,71 @@ class NpyDataStorage(DataStorageBase):
     def create_header(self, timestamp, dtype, metadata=None, notes=None, column_headers=None):
         """
         """
-        # Gather all metadata (both global and locally provided) into a single dict
-        metadata = self.get_unified_metadata(metadata)
+        # Gather all metadata (both global and locally provided). Global metadata is pre-rendered.
+        metadata, rendered_metadata = self.get_header_metadata(metadata)
         return format_header(timestamp,
                              dtype,
                              metadata=metadata,
                              notes=notes,
-                             column_headers=column_headers)
+                             column_headers=column_headers,
+                             rendered_metadata=rendered_metadata)
+
+    def new_file(self, *, dtype=float, shape=tuple(), timestamp=None, metadata=None, notes=None,
+                 nametag=None, column_headers=None, filename=None):
+        """ Create a new binary file on disk containing an empty data array to append data to.
+        Will overwrite old files silently if they have the same path.
+
+        @param numpy.dtype dtype: optional, the data type of the array
+        @param tuple shape: optional, shape of a single data entry (all axes except the first one)
+
+        For all other parameters see: qudi.util.datastorage.NpyDataStorage.save_data
+
+        @return (str, datetime.datetime): Full file path, timestamp used
+        """
+        file_path, timestamp, _ = self.save_data(np.empty((0, *shape), dtype=dtype),
+                                                 timestamp=timestamp,
+                                                 metadata=metadata,
+                                                 notes=notes,
+                                                 nametag=nametag,
+                                                 column_headers=column_headers,
+                                                 filename=filename)
+        return file_path, timestamp
+
+    @classmethod
+    def append_file(cls, data, file_path):
+        """ Append data along the first axis of the array in an existing binary file.
+        A data array with one dimension less than the stored array is appended as single entry.
+        The file is grown in place and only the shape field of the .npy header is rewritten.
+
+        @param numpy.ndarray data: data array to be appended
+        @param str file_path: file path to append to
+
+        @return tuple: New shape of the array in the file
+        """
+        if not os.path.isfile(file_path):
+            raise FileNotFoundError(f'File to append data to not found: "{file_path}"\n'
+                                    f'Create a new file to append to by calling "new_file".')
+        with open(file_path, 'r+b') as file:
+            version, shape, fortran_order, dtype, data_offset = _read_npy_header(file)
+            if fortran_order or len(shape) == 0:
+                raise ValueError(f'Can not append to Fortran-ordered or 0-dimensional array in '
+                                 f'"{file_path}".')
+            data = np.asarray(data, dtype=dtype)
+            if data.ndim == len(shape) - 1:
+                data = data[np.newaxis, ...]
+            if data.shape[1:] != shape[1:]:
+                raise ValueError(f'Data shape {data.shape} can not be appended to array of shape '
+                                 f'{shape}.')
+            new_shape = (shape[0] + data.shape[0], *shape[1:])
+            # Write data first and update the header afterwards. This way an interrupted append
+            # will leave a valid file containing the previous data.
+            file.seek(data_offset + dtype.itemsize * int(np.prod(shape)))
+            file.truncate()
+            file.write(np.ascontiguousarray(data).tobytes())
+            file.flush()
+            _write_npy_header_shape(file, version, dtype, new_shape, data_offset)
+        cls._update_catalog(file_path, shape=new_shape)
+        return new_shape
 
     def save_data(self, data, *, metadata=None, notes=None, nametag=None, timestamp=None,
                   column_headers=None, filename=None):
@@ -772,21 +1832,526 @@ class NpyDataStorage(DataStorageBase):
             np.save(file, data, allow_pickle=False, fix_imports=False)
         with open(meta_file_path, 'w') as file:
             file.write(header)
+        self._add_to_catalog(file_path,
+                             timestamp=timestamp,
+                             shape=data.shape,
+                             dtype=data.dtype,
+                             metadata=metadata)
         return file_path, timestamp, data.shape
 
     @staticmethod
-    def load_data(file_path):
+    def load_data(file_path, mmap=False):
         """ See: DataStorageBase.load_data()
 
         @param str file_path: path to file to load data from
+        @param bool mmap: optional, return a read-only memory-mapped array instead of loading the
+                          entire array into memory (default: False)
         """
         # Load numpy array
-        data = np.load(file_path, allow_pickle=False, fix_imports=False)
+        data = np.load(file_path,
+                       mmap_mode='r' if mmap else None,
+                       allow_pickle=False,
+                       fix_imports=False)
         # Try to find and load metadata from text file
         metadata_path = file_path.split('.npy')[0] + '_metadata.txt'
         try:
-            header = get_header_from_file(metadata_path)
+            header, _ = get_header_from_file(metadata_path)
+        except FileNotFoundError:
+            return data, dict(), dict()
+        general, metadata = get_info_from_header(header)
+        return data, metadata, general
+
+
+class ChunkedArrayView:
+    """ Read-only virtual array concatenating the .npy chunk files of a NpyChunkDataStorage run
+    directory along the first axis. Returned by NpyChunkDataStorage.load_data.
+
+    Chunks are memory-mapped lazily upon first access. Indexing the first axis with an integer or a
+    slice that falls within a single chunk returns a memory-mapped view without copying data.
+    Slices spanning multiple chunks are concatenated into a new array. Any other index expression
+    is applied to the fully loaded array.
+    Iterating over the view yields entries along the first axis chunk by chunk.
+
+    Call refresh to pick up chunks that have been appended since the view was created, e.g. to
+    follow a run that is still being written.
+    """
+
+    def __init__(self, run_dir):
+        """
+        @param str run_dir: path of the run directory containing the manifest and chunk files
+        """
+        self._run_dir = run_dir
+        self._dtype = None
+        self._entry_shape = tuple()
+        self._chunk_files = list()
+        self._offsets = [0]
+        self._chunks = dict()
+        self.refresh()
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(shape={self.shape}, dtype={self.dtype})'
+
+    def __len__(self):
+        return self._offsets[-1]
+
+    def __array__(self, dtype=None):
+        if self.number_of_chunks == 0:
+            data = np.empty(self.shape, dtype=self._dtype)
+        else:
+            data = np.concatenate(list(self.iter_chunks()))
+        return data if dtype is None else data.astype(dtype, copy=False)
+
+    def __iter__(self):
+        for chunk in self.iter_chunks():
+            yield from chunk
+
+    def __getitem__(self, index):
+        index_tuple = index if isinstance(index, tuple) else (index,)
+        if len(index_tuple) == 0 or any(idx is Ellipsis for idx in index_tuple):
+            return np.asarray(self)[index]
+        first, remainder = index_tuple[0], index_tuple[1:]
+        if isinstance(first, slice):
+            return self._get_slice(first, remainder)
+        if isinstance(first, (bool, np.bool_)) or not is_integer(first):
+            # Advanced indexing or field access
+            return np.asarray(self)[index]
+        first = int(first) + len(self) if first < 0 else int(first)
+        if not 0 <= first < len(self):
+            raise IndexError(f'index {index_tuple[0]} is out of bounds for axis 0 with size '
+                             f'{len(self)}')
+        chunk_index = bisect.bisect_right(self._offsets, first) - 1
+        return self._get_chunk(chunk_index)[(first - self._offsets[chunk_index], *remainder)]
+
+    @property
+    def run_dir(self):
+        return self._run_dir
+
+    @property
+    def dtype(self):
+        return self._dtype
+
+    @property
+    def shape(self):
+        return (len(self), *self._entry_shape)
+
+    @property
+    def ndim(self):
+        return 1 + len(self._entry_shape)
+
+    @property
+    def size(self):
+        return int(np.prod(self.shape))
+
+    @property
+    def number_of_chunks(self):
+        return len(self._chunk_files)
+
+    def refresh(self):
+        """ Re-read the run manifest to include chunks appended in the meantime.
+
+        @return tuple: The new shape of the virtual array
+        """
+        manifest = NpyChunkDataStorage.read_manifest(self._run_dir)
+        self._dtype = np.lib.format.descr_to_dtype(_descr_from_json(manifest['dtype']))
+        self._entry_shape = tuple(manifest['shape'])
+        self._chunk_files = [chunk['file'] for chunk in manifest['chunks']]
+        self._offsets = list(itertools.accumulate((chunk['length'] for chunk in manifest['chunks']),
+                                                  initial=0))
+        return self.shape
+
+    def iter_chunks(self):
+        """ Generator yielding the memory-mapped chunk arrays in order.
+        """
+        for chunk_index in range(self.number_of_chunks):
+            yield self._get_chunk(chunk_index)
+
+    def _get_chunk(self, chunk_index):
+        try:
+            return self._chunks[chunk_index]
+        except KeyError:
+            chunk = np.load(os.path.join(self._run_dir, self._chunk_files[chunk_index]),
+                            mmap_mode='r',
+                            allow_pickle=False,
+                            fix_imports=False)
+            self._chunks[chunk_index] = chunk
+            return chunk
+
+    def _get_slice(self, first, remainder):
+        indices = range(*first.indices(len(self)))
+        reverse = indices.step < 0
+        if reverse:
+            indices = indices[::-1]
+        # Collect the parts of all chunks overlapping with the requested index range
+        parts = list()
+        for chunk_index in range(self.number_of_chunks):
+            begin, end = self._offsets[chunk_index], self._offsets[chunk_index + 1]
+            start = max(0, -((indices.start - begin) // indices.step))
+            stop = min(len(indices), max(0, -((indices.start - end) // indices.step)))
+            if stop > start:
+                local = slice(indices[start] - begin, indices[stop - 1] - begin + 1, indices.step)
+                parts.append(self._get_chunk(chunk_index)[(local, *remainder)])
+        if not parts:
+            data = np.empty((0, *self._entry_shape), dtype=self._dtype)[(slice(None), *remainder)]
+        elif len(parts) == 1:
+            data = parts[0]
+        else:
+            data = np.concatenate(parts)
+        return data[::-1] if reverse else data
+
+
+class NpyChunkDataStorage(DataStorageBase):
+    """ Helper class to store (measurement)data on disk as a "run directory" of binary .npy chunk
+    files, e.g. for continuous streaming acquisition.
+    Each call to append_file writes the data block as new chunk file. Existing files are never
+    rewritten except for the small JSON manifest listing the chunks, which is replaced atomically
+    after each new chunk has been written completely. Notes, (global) metadata and column headers
+    are saved in a text file inside the run directory.
+
+    load_data returns a ChunkedArrayView memory-mapping the chunks lazily, which can also be used
+    to follow a run that is still being written.
+    """
+
+    _manifest_filename = 'manifest.json'
+    _metadata_filename = 'run_metadata.txt'
+    _chunk_filename = 'chunk_{0:06d}.npy'
+
+    def __init__(self, *, root_dir, file_extension='.chunks', **kwargs):
+        """
+        @param str root_dir: Root directory for this storage instance to save run directories into
+        @param str file_extension: optional, suffix to use for run directory names
+
+        @param kwargs: optional, for additional keyword arguments see DataStorageBase.__init__
+        """
+        super().__init__(root_dir=root_dir, **kwargs)
+        if not file_extension:
+            self.file_extension = ''
+        elif file_extension.startswith('.'):
+            self.file_extension = file_extension
+        else:
+            self.file_extension = '.' + file_extension
+
+    def create_header(self, timestamp, metadata=None, notes=None, column_headers=None):
+        """
+        """
+        # Gather all metadata (both global and locally provided). Global metadata is pre-rendered.
+        metadata, rendered_metadata = self.get_header_metadata(metadata)
+        return format_header(timestamp,
+                             metadata=metadata,
+                             notes=notes,
+                             column_headers=column_headers,
+                             rendered_metadata=rendered_metadata)
+
+    def new_file(self, *, dtype=float, shape=tuple(), timestamp=None, metadata=None, notes=None,
+                 nametag=None, column_headers=None, filename=None):
+        """ Create a new run directory on disk without any chunks to append data to.
+        Will remove the chunks of an old run silently if it has the same path.
+
+        @param numpy.dtype dtype: optional, the data type of the array
+        @param tuple shape: optional, shape of a single data entry (all axes except the first one)
+
+        For all other parameters see: qudi.util.datastorage.NpyChunkDataStorage.save_data
+
+        @return (str, datetime.datetime): Full run directory path, timestamp used
+        """
+        file_path, timestamp, _ = self.save_data(np.empty((0, *shape), dtype=dtype),
+                                                 timestamp=timestamp,
+                                                 metadata=metadata,
+                                                 notes=notes,
+                                                 nametag=nametag,
+                                                 column_headers=column_headers,
+                                                 filename=filename)
+        return file_path, timestamp
+
+    @classmethod
+    def append_file(cls, data, file_path):
+        """ Append data along the first axis by writing it as new chunk into an existing run
+        directory. A data array with one dimension less than the stored array is appended as
+        single entry.
+
+        @param numpy.ndarray data: data array to be appended
+        @param str file_path: run directory path to append to
+
+        @return tuple: New shape of the virtual array in the run directory
+        """
+        try:
+            manifest = cls.read_manifest(file_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f'Run directory to append data to not found: "{file_path}"\n'
+                                    f'Create a new run to append to by calling "new_file".')
+        dtype = np.lib.format.descr_to_dtype(_descr_from_json(manifest['dtype']))
+        entry_shape = tuple(manifest['shape'])
+        data = np.asarray(data, dtype=dtype)
+        if data.ndim == len(entry_shape):
+            data = data[np.newaxis, ...]
+        if data.shape[1:] != entry_shape:
+            raise ValueError(f'Data shape {data.shape} can not be appended to array of shape '
+                             f'{(manifest["length"], *entry_shape)}.')
+        if len(data) > 0:
+            cls._write_chunk(file_path, manifest, data)
+        new_shape = (manifest['length'], *entry_shape)
+        cls._update_catalog(file_path, shape=new_shape)
+        return new_shape
+
+    def save_data(self, data, *, metadata=None, notes=None, nametag=None, timestamp=None,
+                  column_headers=None, filename=None):
+        """ Saves a run directory containing the data array as first chunk along with a text file
+        containing the notes, (global) metadata and column headers for this data set.
+
+        For more information see: qudi.util.datastorage.DataStorageBase.save_data
+
+        @param str|list column_headers: optional, data column header strings or single string
+        """
+        data = np.asarray(data)
+        if data.ndim < 1:
+            raise ValueError('NpyChunkDataStorage can only save data arrays with at least 1 '
+                             'dimension')
+        if timestamp is None:
+            timestamp = datetime.now()
+        # Construct directory name if none is given explicitly
+        if filename is None:
+            filename = get_timestamp_filename(timestamp=timestamp,
+                                              nametag=nametag) + self.file_extension
+        # Create header
+        header = self.create_header(timestamp,
+                                    metadata=metadata,
+                                    notes=notes,
+                                    column_headers=column_headers)
+        # Determine full directory path and remove chunks of an old run with the same path
+        file_path = os.path.join(self.root_dir, filename)
+        os.makedirs(file_path, exist_ok=True)
+        for name in os.listdir(file_path):
+            if re.fullmatch(r'chunk_\d+\.npy', name):
+                os.remove(os.path.join(file_path, name))
+        with open(os.path.join(file_path, self._metadata_filename), 'w') as file:
+            file.write(header)
+        manifest = {'dtype': np.lib.format.dtype_to_descr(data.dtype),
+                    'shape': data.shape[1:],
+                    'length': 0,
+                    'chunks': list()}
+        if len(data) > 0:
+            self._write_chunk(file_path, manifest, data)
+        else:
+            self._write_manifest(file_path, manifest)
+        self._add_to_catalog(file_path,
+                             timestamp=timestamp,
+                             shape=data.shape,
+                             dtype=data.dtype,
+                             metadata=metadata)
+        return file_path, timestamp, data.shape
+
+    @classmethod
+    def load_data(cls, file_path, lazy=True):
+        """ See: DataStorageBase.load_data()
+
+        @param str file_path: path of the run directory to load data from
+        @param bool lazy: optional, return a ChunkedArrayView memory-mapping the chunks (default)
+                          instead of loading the entire array into memory
+
+        @return ChunkedArrayView|np.ndarray, dict, dict: Data, user metadata, general data info
+        """
+        data = ChunkedArrayView(file_path)
+        if not lazy:
+            data = np.asarray(data)
+        try:
+            header, _ = get_header_from_file(os.path.join(file_path, cls._metadata_filename))
         except FileNotFoundError:
             return data, dict(), dict()
-        metadata, general = get_info_from_header(header)
+        general, metadata = get_info_from_header(header)
+        return data, metadata, general
+
+    @classmethod
+    def read_manifest(cls, file_path):
+        """ Read the JSON manifest of a run directory.
+
+        @param str file_path: path of the run directory
+
+        @return dict: manifest containing "dtype" descriptor, entry "shape", total "length" and
+                      list of "chunks" (each a dict with "file" name and "length")
+        """
+        with open(os.path.join(file_path, cls._manifest_filename), 'r') as file:
+            return json.load(file)
+
+    @classmethod
+    def _write_chunk(cls, file_path, manifest, data):
+        # Write chunk file completely before listing it in the manifest. This way readers will
+        # never see a partially written chunk.
+        chunk_file = cls._chunk_filename.format(len(manifest['chunks']))
+        with open(os.path.join(file_path, chunk_file), 'wb') as file:
+            np.save(file, np.ascontiguousarray(data), allow_pickle=False, fix_imports=False)
+        manifest['chunks'].append({'file': chunk_file, 'length': len(data)})
+        manifest['length'] += len(data)
+        cls._write_manifest(file_path, manifest)
+
+    @classmethod
+    def _write_manifest(cls, file_path, manifest):
+        manifest_path = os.path.join(file_path, cls._manifest_filename)
+        tmp_path = manifest_path + '.tmp'
+        with open(tmp_path, 'w') as file:
+            json.dump(manifest, file, indent=1)
+        os.replace(tmp_path, manifest_path)
+
+
+class Hdf5DataStorage(DataStorageBase):
+    """ Helper class to store (measurement)data on disk as HDF5 file (requires h5py package).
+    The data array is stored as chunked and optionally compressed dataset that can be appended
+    along the first axis. Metadata, notes and column headers are stored as attributes.
+    Metadata values are stored as repr strings and must be reconstructable via eval (same as for
+    text file headers).
+    """
+
+    _dataset_name = 'data'
+
+    def __init__(self, *, root_dir, file_extension='.h5', compression=None, compression_opts=None,
+                 chunks=True, **kwargs):
+        """
+        @param str root_dir: Root directory for this storage instance to save files into
+        @param str file_extension: optional, file extension to use for HDF5 files
+        @param str compression: optional, dataset compression filter name ("gzip", "lzf", ...)
+        @param compression_opts: optional, compression filter options (e.g. gzip level 0-9)
+        @param bool|tuple chunks: optional, chunk shape to use or True for automatic chunking
+
+        @param kwargs: optional, for additional keyword arguments see DataStorageBase.__init__
+        """
+        if h5py is None:
+            raise RuntimeError('Hdf5DataStorage requires the "h5py" package to be installed.')
+        if not chunks:
+            raise ValueError('Hdf5DataStorage requires chunked datasets in order to append data')
+        super().__init__(root_dir=root_dir, **kwargs)
+        if not file_extension:
+            self.file_extension = ''
+        elif file_extension.startswith('.'):
+            self.file_extension = file_extension
+        else:
+            self.file_extension = '.' + file_extension
+        self.compression = compression
+        self.compression_opts = compression_opts
+        self.chunks = chunks
+
+    def new_file(self, *, dtype=float, shape=tuple(), timestamp=None, metadata=None, notes=None,
+                 nametag=None, column_headers=None, filename=None):
+        """ Create a new HDF5 file on disk containing an empty dataset to append data to.
+        Will overwrite old files silently if they have the same path.
+
+        @param numpy.dtype dtype: optional, the data type of the dataset
+        @param tuple shape: optional, shape of a single data entry (all axes except the first one)
+        @param dict metadata: optional, named metadata values to be saved as attributes
+        @param str notes: optional, string that is included in the file "as-is"
+        @param str nametag: optional, nametag to include in the generic filename
+        @param datetime.datetime timestamp: optional, timestamp to use. Will create one if missing.
+        @param str|list column_headers: optional, data column header strings or single string
+        @param str filename: optional, custom filename to use (nametag, timestamp and configured
+                             file_extension will not be included for file naming)
+
+        @return (str, datetime.datetime): Full file path, timestamp used
+        """
+        file_path, timestamp = self._create_file(np.empty((0, *shape), dtype=dtype),
+                                                 timestamp=timestamp,
+                                                 metadata=metadata,
+                                                 notes=notes,
+                                                 nametag=nametag,
+                                                 column_headers=column_headers,
+                                                 filename=filename)
+        return file_path, timestamp
+
+    def append_file(self, data, file_path):
+        """ Append data along the first axis of the dataset in an existing HDF5 file.
+        A data array with one dimension less than the dataset is appended as single entry.
+
+        @param numpy.ndarray data: data array to be appended
+        @param str file_path: file path to append to
+
+        @return tuple: New shape of the dataset in the file
+        """
+        if not os.path.isfile(file_path):
+            raise FileNotFoundError(f'File to append data to not found: "{file_path}"\n'
+                                    f'Create a new file to append to by calling "new_file".')
+        data = np.asarray(data)
+        with h5py.File(file_path, 'a') as file:
+            dataset = file[self._dataset_name]
+            if data.ndim == dataset.ndim - 1:
+                data = data[np.newaxis, ...]
+            if data.shape[1:] != dataset.shape[1:]:
+                raise ValueError(f'Data shape {data.shape} can not be appended to dataset of '
+                                 f'shape {dataset.shape}.')
+            old_length = dataset.shape[0]
+            dataset.resize(old_length + data.shape[0], axis=0)
+            dataset[old_length:] = data
+            new_shape = dataset.shape
+        self._update_catalog(file_path, shape=new_shape)
+        return new_shape
+
+    def save_data(self, data, *, metadata=None, notes=None, nametag=None, timestamp=None,
+                  column_headers=None, filename=None):
+        """ Saves a HDF5 file containing the data array as appendable dataset.
+
+        For more information see: qudi.util.datastorage.DataStorageBase.save_data
+
+        @param str|list column_headers: optional, data column header strings or single string
+        """
+        data = np.asarray(data)
+        file_path, timestamp = self._create_file(data,
+                                                 timestamp=timestamp,
+                                                 metadata=metadata,
+                                                 notes=notes,
+                                                 nametag=nametag,
+                                                 column_headers=column_headers,
+                                                 filename=filename)
+        return file_path, timestamp, data.shape
+
+    def _create_file(self, data, *, timestamp, metadata, notes, nametag, column_headers,
+                     filename):
+        if data.ndim < 1:
+            raise ValueError('Hdf5DataStorage can only save data arrays with at least 1 dimension')
+        if timestamp is None:
+            timestamp = datetime.now()
+        # Construct file name if none is given explicitly
+        if filename is None:
+            filename = get_timestamp_filename(timestamp=timestamp,
+                                              nametag=nametag) + self.file_extension
+        # Determine full file path and create containing directories if needed
+        file_path = os.path.join(self.root_dir, filename)
+        create_dir_for_file(file_path)
+        # Gather all metadata (both global and locally provided) into a single dict
+        metadata_str_dict = self.get_unified_metadata_str_dict(metadata)
+        # Write data and metadata to file. Overwrite silently.
+        with h5py.File(file_path, 'w') as file:
+            dataset = file.create_dataset(self._dataset_name,
+                                          data=data,
+                                          maxshape=(None, *data.shape[1:]),
+                                          chunks=self.chunks,
+                                          compression=self.compression,
+                                          compression_opts=self.compression_opts)
+            dataset.attrs['timestamp'] = timestamp.isoformat()
+            if notes:
+                dataset.attrs['notes'] = notes
+            if column_headers:
+                dataset.attrs['column_headers'] = format_column_headers(column_headers)
+            file.attrs.update(metadata_str_dict)
+        self._add_to_catalog(file_path,
+                             timestamp=timestamp,
+                             shape=data.shape,
+                             dtype=data.dtype,
+                             metadata=metadata)
+        return file_path, timestamp
+
+    @classmethod
+    def load_data(cls, file_path, index=None):
+        """ See: DataStorageBase.load_data()
+
+        @param str file_path: path to file to load data from
+        @param index: optional, index or slice to read only a part of the dataset from disk
+
+        @return np.ndarray, dict, dict: Data as numpy array, user metadata, general data info
+        """
+        with h5py.File(file_path, 'r') as file:
+            dataset = file[cls._dataset_name]
+            data = dataset[()] if index is None else dataset[index]
+            general = {'timestamp': datetime.fromisoformat(dataset.attrs['timestamp']),
+                       'notes': dataset.attrs.get('notes', None),
+                       'column_headers': dataset.attrs.get('column_headers', None),
+                       'shape': dataset.shape,
+                       'dtype': dataset.dtype}
+            metadata = str_dict_to_metadata(dict(file.attrs))
+        if general['column_headers']:
+            general['column_headers'] = tuple(general['column_headers'].split(';;'))
         return data, metadata, general
@@ -27,24 +27,118 @@ You should have received a copy of the GNU Lesser General Public License along w
 If not, see <https://www.gnu.org/licenses/>.
 """
 
-__all__ = ['loadUi']
+__all__ = ['build_ui_cache', 'clear_ui_cache', 'compile_ui', 'get_ui_cache_dir', 'loadUi']
 
 import os
 import re
+import sys
+import hashlib
+import argparse
 import tempfile
+import threading
 import subprocess
 from importlib.util import spec_from_loader, module_from_spec
-from qudi.util.paths import get_artwork_dir
+from typing import Optional, Iterable, List
+from qudi.util.paths import get_artwork_dir, get_appdata_dir
 
 __ui_class_pattern = re.compile(r'class (Ui_.*?)\(')
 __artwork_path_pattern = re.compile(r'>(.*?/artwork/.*?)</')
 
+# Code objects of compiled .ui files by cache key
+_code_objects = dict()
+_code_objects_lock = threading.Lock()
+
+
+def get_ui_cache_dir() -> str:
+    """ Returns the directory the python code generated from .ui files is cached in """
+    return os.path.join(get_appdata_dir(), 'uic_cache')
+
+
+def _uic_version() -> str:
+    import PySide2
+    return PySide2.__version__
+
+
+def _cache_key(ui_content: str) -> str:
+    content = f'{_uic_version()}\n{ui_content}'.encode('utf-8')
+    return hashlib.blake2b(content, digest_size=20).hexdigest()
+
+
+def _run_uic(ui_content: str) -> str:
+    """ Compiles .ui file content into python code in a pyside2-uic subprocess """
+    fd, file_path = tempfile.mkstemp(suffix='.ui', text=True)
+    try:
+        with open(fd, mode='w', closefd=True) as tmp_file:
+            tmp_file.write(ui_content)
+        result = subprocess.run(['pyside2-uic', file_path],
+                                capture_output=True,
+                                text=True,
+                                check=True)
+    finally:
+        os.remove(file_path)
+    compiled = result.stdout
+    # Find class name
+    match = __ui_class_pattern.search(compiled)
+    if match is None:
+        raise RuntimeError('Failed to match regex for finding class name in generated python code.')
+    # Workaround (again) because pyside2-uic forgot to include objects from PySide2 that can be
+    # used by Qt Designer. So we inject import statements here just before the class declaration.
+    insert = match.start()
+    return compiled[:insert] + 'from PySide2.QtCore import QLocale\n\n' + compiled[insert:]
+
+
+def _compile_ui(file_path: str, use_cache: bool = True) -> tuple:
+    # This step is a workaround because Qt Designer will only specify relative paths which is very
+    # error prone if the user changes the cwd (e.g. os.chdir)
+    with open(file_path, 'r') as file:
+        ui_content = file.read()
+    converted = _convert_ui_content(ui_content)
+    if converted is not None:
+        ui_content = converted
+    key = _cache_key(ui_content)
+    cache_path = os.path.join(get_ui_cache_dir(), f'{key}.py')
+    if use_cache:
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as file:
+                return key, file.read()
+        except OSError:
+            pass
+    compiled = _run_uic(ui_content)
+    if use_cache:
+        tmp_path = f'{cache_path}.{os.getpid():d}.tmp'
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as file:
+                file.write(compiled)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+    return key, compiled
+
+
+def compile_ui(file_path: str, use_cache: Optional[bool] = True) -> str:
+    """ Compiles a given .ui-file at <file_path> into python code and returns it.
+    The generated code is cached in the qudi AppData directory (see get_ui_cache_dir) using the
+    content of the .ui file and the PySide2 version as key. If a cached version is available, no
+    pyside2-uic subprocess is started.
+
+    @param str file_path: The full path to the .ui-file to compile
+    @param bool use_cache: optional, flag indicating if the cache should be used (default: True)
+
+    @return str: The generated python code
+    """
+    return _compile_ui(file_path, use_cache)[1]
+
 
 def loadUi(file_path, base_widget):
     """ Compiles a given .ui-file at <file_path> into python code. This code will be executed and
     the generated class will be used to initialize the widget given in <base_widget>.
     Creates a temporary file in the systems tmp directory using the tempfile module.
     The original .ui file will remain untouched.
+    The generated python code is cached, so each .ui file is only compiled once (see compile_ui).
 
     WARNING: base_widget must be of the same class as the top-level widget in the .ui file.
              Compatible subclasses of the top-level widget in the .ui file will also work.
@@ -52,44 +146,24 @@ def loadUi(file_path, base_widget):
     @param str file_path: The full path to the .ui-file to load
     @param object base_widget: Instance of the base widget represented by the .ui-file
     """
-    # This step is a workaround because Qt Designer will only specify relative paths which is very
-    # error prone if the user changes the cwd (e.g. os.chdir)
-    converted = _convert_ui_to_absolute_paths(file_path)
-
-    # Compile (converted) .ui-file into python code
-    # If file needed conversion, write temporary file to be used in subprocess
-    if converted is not None:
-        fd, file_path = tempfile.mkstemp(text=True)
-        try:
-            with open(fd, mode='w', closefd=True) as tmp_file:
-                tmp_file.write(converted)
-        except:
-            os.remove(file_path)
-            raise
-    try:
-        result = subprocess.run(['pyside2-uic', file_path],
-                                capture_output=True,
-                                text=True,
-                                check=True)
-        compiled = result.stdout
-    finally:
-        if converted is not None:
-            os.remove(file_path)
+    key, compiled = _compile_ui(file_path)
+    with _code_objects_lock:
+        code = _code_objects.get(key, None)
+    if code is None:
+        code = compile(compiled, f'<ui:{os.path.basename(file_path)}>', 'exec')
+        with _code_objects_lock:
+            _code_objects[key] = code
 
     # Find class name
     match = __ui_class_pattern.search(compiled)
     if match is None:
         raise RuntimeError('Failed to match regex for finding class name in generated python code.')
     class_name = match.groups()[0]
-    # Workaround (again) because pyside2-uic forgot to include objects from PySide2 that can be
-    # used by Qt Designer. So we inject import statements here just before the class declaration.
-    insert = match.start()
-    compiled = compiled[:insert] + 'from PySide2.QtCore import QLocale\n\n' + compiled[insert:]
 
     # Execute python code in order to obtain a module object from it
     spec = spec_from_loader('ui_module', loader=None)
     ui_module = module_from_spec(spec)
-    exec(compiled, ui_module.__dict__)
+    exec(code, ui_module.__dict__)
 
     loader = getattr(ui_module, class_name, None)()
     if loader is None:
@@ -103,6 +177,49 @@ def loadUi(file_path, base_widget):
     base_widget.__dict__.update(to_merge)
 
 
+def build_ui_cache(paths: Optional[Iterable[str]] = None) -> List[str]:
+    """ Compiles all .ui files found in the given directories (recursively) into the cache.
+    By default all directories of the installed qudi namespace package are searched.
+    Errors are printed to stderr and skipped.
+
+    @param iterable paths: optional, directories to search for .ui files
+
+    @return list: paths of all .ui files that are cached now
+    """
+    if paths is None:
+        import qudi
+        paths = qudi.__path__
+    cached = list()
+    for root_dir in paths:
+        for root, dirs, files in os.walk(root_dir):
+            dirs[:] = [d for d in dirs if not d.startswith(('.', '__'))]
+            for name in files:
+                if not name.endswith('.ui'):
+                    continue
+                ui_path = os.path.join(root, name)
+                try:
+                    _compile_ui(ui_path)
+                except (OSError, subprocess.CalledProcessError, RuntimeError) as err:
+                    print(f'Unable to compile "{ui_path}": {err}', file=sys.stderr)
+                else:
+                    cached.append(ui_path)
+    return cached
+
+
+def clear_ui_cache() -> None:
+    """ Removes all cached python code generated from .ui files """
+    with _code_objects_lock:
+        _code_objects.clear()
+    cache_dir = get_ui_cache_dir()
+    if os.path.isdir(cache_dir):
+        for name in os.listdir(cache_dir):
+            if name.endswith('.py'):
+                try:
+                    os.remove(os.path.join(cache_dir, name))
+                except OSError:
+                    pass
+
+
 def _convert_ui_to_absolute_paths(file_path):
     """ Converts the .ui file in order to change all relative path declarations containing the
     keyword "/artwork/" into absolute paths pointing to the qudi artwork data directory.
@@ -110,9 +227,18 @@ def _convert_ui_to_absolute_paths(file_path):
     @param str file_path: The path to the .ui file to convert
     @return str|NoneType: Converted file content of the .ui file, None if conversion is not needed
     """
-    path_prefix = get_artwork_dir()
     with open(file_path, 'r') as file:
         ui_content = file.read()
+    return _convert_ui_content(ui_content)
+
+
+def _convert_ui_content(ui_content):
+    """ See _convert_ui_to_absolute_paths.
+
+    @param str ui_content: The content of the .ui file to convert
+    @return str|NoneType: Converted file content of the .ui file, None if conversion is not needed
+    """
+    path_prefix = get_artwork_dir()
     chunks = __artwork_path_pattern.split(ui_content)
     # Iterate over odd indices. Remember if changes were needed
     has_changed = False
@@ -124,3 +250,23 @@ def _convert_ui_to_absolute_paths(file_path):
     if has_changed:
         return ''.join(chunks)
     return None
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog='python -m qudi.util.uic',
+                                     description='Compile all Qt Designer .ui files of the '
+                                                 'installed qudi packages into the qudi .ui cache.')
+    parser.add_argument('paths',
+                        nargs='*',
+                        help='Directories to search for .ui files instead of the installed qudi '
+                             'namespace package directories.')
+    parser.add_argument('--clear', action='store_true', help='Clear the cache before building.')
+    args = parser.parse_args(argv)
+    if args.clear:
+        clear_ui_cache()
+    cached = build_ui_cache(args.paths if args.paths else None)
+    print(f'Cached {len(cached):d} .ui files in "{get_ui_cache_dir()}".')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
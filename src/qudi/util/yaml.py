@@ -21,21 +21,30 @@ You should have received a copy of the GNU Lesser General Public License along w
 If not, see <https://www.gnu.org/licenses/>.
 """
 
-__all__ = ['SafeRepresenter', 'SafeConstructor', 'YAML', 'yaml_load', 'yaml_dump', 'ParserError',
-           'YAMLError', 'MarkedYAMLError', 'YAMLStreamError', 'ScannerError', 'ConstructorError',
-           'DuplicateKeyError']
+__all__ = ['SafeRepresenter', 'SafeConstructor', 'YAML', 'YamlLoadCache', 'yaml_load',
+           'yaml_dump', 'yaml_load_cache', 'ParserError', 'YAMLError', 'MarkedYAMLError',
+           'YAMLStreamError', 'ScannerError', 'ConstructorError', 'DuplicateKeyError']
 
 import os
+import time
+import pickle
+import struct
+import hashlib
+import zipfile
+import threading
 import numpy as np
 import ruamel.yaml as _yaml
 from ruamel.yaml.error import YAMLError, MarkedYAMLError, YAMLStreamError
 from ruamel.yaml.parser import ParserError, ScannerError
 from ruamel.yaml.constructor import ConstructorError, DuplicateKeyError
 from enum import Enum, IntEnum, IntFlag, Flag
+from uuid import uuid4
 from importlib import import_module
 from collections import OrderedDict
-from io import BytesIO, TextIOWrapper
-from typing import Optional, Any, Mapping, Dict, Union
+from io import BytesIO, StringIO, TextIOWrapper
+from typing import Optional, Any, Mapping, Dict, Union, Tuple
+
+from qudi.util.paths import get_appdata_dir
 
 
 _FilePath = Union[str, bytes, os.PathLike]
@@ -49,6 +58,9 @@ class SafeRepresenter(_yaml.SafeRepresenter):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._extndarray_count = 0
+        # Optional dict to collect large arrays in to be saved in a separate .npz file
+        self.array_store = None
+        self.array_key_prefix = 'array'
 
     def ignore_aliases(self, ignore_data):
         """ Ignore aliases and anchors. Overwrites base class implementation.
@@ -121,7 +133,16 @@ class SafeRepresenter(_yaml.SafeRepresenter):
         If the output stream to dump to is a "regular" open text file handle (io.TextIOWrapper) and
         the array size exceeds the specified maximum ndarray size, it is dumped into a separate
         binary .npy file and is represented in YAML as file path string.
+        If the array_store dict is set, arrays exceeding the maximum ndarray size are collected in
+        it instead and are represented in YAML by their key in array_store (see yaml_dump).
         """
+        # Collect array in array_store if possible and required
+        if self.array_store is not None and data.size > self.ndarray_max_size and \
+                not data.dtype.hasobject:
+            key = f'{self.array_key_prefix}_{len(self.array_store):06d}'
+            self.array_store[key] = data
+            return self.represent_scalar(tag='tag:yaml.org,2002:npzarray', value=key)
+
         # Write to separate file if possible and required (array size > self.ndarray_max_size)
         # FIXME: Find a better way... this is a mean hack to get the file path to dump,
         if isinstance(self.dumper._output, TextIOWrapper) and data.size > self.ndarray_max_size:
@@ -151,6 +172,7 @@ SafeRepresenter.add_representer(complex, SafeRepresenter.represent_complex)
 SafeRepresenter.add_representer(dict, SafeRepresenter.represent_dict_no_sort)
 SafeRepresenter.add_representer(OrderedDict, SafeRepresenter.represent_dict_no_sort)
 SafeRepresenter.add_representer(np.ndarray, SafeRepresenter.represent_ndarray)
+SafeRepresenter.add_multi_representer(np.ndarray, SafeRepresenter.represent_ndarray)
 SafeRepresenter.add_multi_representer(Enum, SafeRepresenter.represent_enum)
 SafeRepresenter.add_multi_representer(IntEnum, SafeRepresenter.represent_enum)
 SafeRepresenter.add_multi_representer(Flag, SafeRepresenter.represent_flag)
@@ -164,6 +186,15 @@ class SafeConstructor(_yaml.SafeConstructor):
     """ Custom YAML constructor for qudi config files
     """
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Optional mapping to get arrays from that are saved in a separate .npz file
+        self.array_source = None
+        # Flag indicating if arrays stored in separate files are memory-mapped instead of loaded
+        self.mmap_arrays = False
+        # Flag indicating if the loaded data depends on other files than the YAML file itself
+        self.uses_external_files = False
+
     def construct_ndarray(self, node):
         """ The constructor for a numpy array that is saved as binary string with ASCII-encoding
         """
@@ -174,7 +205,35 @@ class SafeConstructor(_yaml.SafeConstructor):
     def construct_extndarray(self, node):
         """ The constructor for a numpy array that is saved in a separate file.
         """
-        return np.load(self.construct_yaml_str(node), allow_pickle=False, fix_imports=False)
+        file_path = self.construct_yaml_str(node)
+        self.uses_external_files = True
+        if self.mmap_arrays:
+            try:
+                return np.load(file_path, mmap_mode='c', allow_pickle=False, fix_imports=False)
+            except ValueError:
+                # Arrays that can not be memory-mapped (e.g. empty arrays)
+                pass
+        return np.load(file_path, allow_pickle=False, fix_imports=False)
+
+    def construct_npzarray(self, node):
+        """ The constructor for a numpy array that is saved in a separate .npz file.
+        """
+        key = self.construct_yaml_str(node)
+        self.uses_external_files = True
+        if self.array_source is None:
+            raise ConstructorError(None,
+                                   None,
+                                   f'No .npz file given to load array "{key}" from',
+                                   node.start_mark)
+        try:
+            if self.mmap_arrays and isinstance(self.array_source, _LazyNpzFile):
+                return self.array_source.memmap(key)
+            return self.array_source[key]
+        except KeyError:
+            raise ConstructorError(None,
+                                   None,
+                                   f'Array "{key}" not found in .npz file',
+                                   node.start_mark) from None
 
     def construct_frozenset(self, node):
         """ The frozenset constructor.
@@ -215,6 +274,7 @@ SafeConstructor.add_constructor('tag:yaml.org,2002:complex', SafeConstructor.con
 SafeConstructor.add_constructor('tag:yaml.org,2002:ndarray', SafeConstructor.construct_ndarray)
 SafeConstructor.add_constructor('tag:yaml.org,2002:extndarray',
                                 SafeConstructor.construct_extndarray)
+SafeConstructor.add_constructor('tag:yaml.org,2002:npzarray', SafeConstructor.construct_npzarray)
 SafeConstructor.add_constructor('tag:yaml.org,2002:enum', SafeConstructor.construct_enum)
 SafeConstructor.add_constructor('tag:yaml.org,2002:flag', SafeConstructor.construct_flag)
 
@@ -235,35 +295,306 @@ class YAML(_yaml.YAML):
         self.Constructor = SafeConstructor
 
 
-def yaml_load(file_path: _FilePath, ignore_missing: Optional[bool] = False) -> Dict[str, Any]:
+class _LazyNpzFile(Mapping):
+    """ Read-only mapping to access the arrays in a .npz file. The file is only opened upon first
+    access and each array is only read from file when it is accessed.
+    """
+
+    def __init__(self, file_path: _FilePath):
+        self._file_path = file_path
+        self._npz_file = None
+
+    def _open(self) -> Any:
+        if self._npz_file is None:
+            self._npz_file = np.load(self._file_path, allow_pickle=False, fix_imports=False)
+        return self._npz_file
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        return self._open()[key]
+
+    def __iter__(self):
+        return iter(self._open().files)
+
+    def __len__(self) -> int:
+        return len(self._open().files)
+
+    def memmap(self, key: str) -> np.ndarray:
+        """ Returns the array as copy-on-write memory-mapped array if it is stored uncompressed.
+        Falls back to loading the array otherwise.
+        """
+        try:
+            with zipfile.ZipFile(self._file_path) as zip_file:
+                info = zip_file.getinfo(f'{key}.npy')
+        except KeyError:
+            raise KeyError(key) from None
+        if info.compress_type != zipfile.ZIP_STORED:
+            return self[key]
+        with open(self._file_path, 'rb') as f:
+            # Skip local file header (30 bytes + file name + extra field) of the zip member
+            f.seek(info.header_offset + 26)
+            name_length, extra_length = struct.unpack('<HH', f.read(4))
+            f.seek(name_length + extra_length, os.SEEK_CUR)
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            offset = f.tell()
+        if dtype.hasobject or not np.prod(shape, dtype=np.int64):
+            return self[key]
+        return np.memmap(self._file_path,
+                         dtype=dtype,
+                         mode='c',
+                         shape=shape,
+                         order='F' if fortran_order else 'C',
+                         offset=offset)
+
+    def close(self) -> None:
+        if self._npz_file is not None:
+            self._npz_file.close()
+            self._npz_file = None
+
+
+class YamlLoadCache:
+    """ Cache for the data of parsed YAML files to skip parsing files that did not change.
+
+    Entries are identified by the absolute file path and validated by inode, modification time and
+    size of the file. Data is stored as pickle, so each cache hit returns a new deep copy of the
+    data. Entries are held in memory (least recently used entries are dropped if max_entries is
+    exceeded) and, if a cache directory is set, as pickle files in this directory in order to
+    persist between qudi sessions.
+    Data that can not be pickled is not cached. Files modified less than racy_interval seconds
+    ago are not cached either, since a modification within the timestamp resolution of the file
+    system could go unnoticed.
+    """
+    _format_version = 1
+    racy_interval = 2.
+
+    def __init__(self, cache_dir: Optional[_FilePath] = None, max_entries: Optional[int] = 128):
+        """
+        @param str cache_dir: optional, directory to persist cache entries in (None: memory only)
+        @param int max_entries: optional, maximum number of entries held in memory
+        """
+        self.cache_dir = cache_dir
+        self.max_entries = max(1, int(max_entries))
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._statistics = dict()
+        self.reset_statistics()
+
+    @staticmethod
+    def file_key(stat_result: os.stat_result) -> Tuple[int, int, int]:
+        """ Returns the key to validate a cache entry from the os.stat result of the YAML file """
+        return stat_result.st_ino, stat_result.st_mtime_ns, stat_result.st_size
+
+    @property
+    def statistics(self) -> Dict[str, Union[int, float]]:
+        """ Number of cache hits/misses and the accumulated time in seconds spent for loading
+        files from cache (hit_time) or by parsing them (miss_time).
+        """
+        with self._lock:
+            return self._statistics.copy()
+
+    def reset_statistics(self) -> None:
+        with self._lock:
+            self._statistics = {'hits': 0, 'misses': 0, 'hit_time': 0., 'miss_time': 0.}
+
+    def _record(self, hit: bool, duration: float) -> None:
+        with self._lock:
+            if hit:
+                self._statistics['hits'] += 1
+                self._statistics['hit_time'] += duration
+            else:
+                self._statistics['misses'] += 1
+                self._statistics['miss_time'] += duration
+
+    def _entry_path(self, file_path: str) -> Optional[str]:
+        if self.cache_dir is None:
+            return None
+        name = hashlib.blake2b(os.fsencode(file_path), digest_size=16).hexdigest()
+        return os.path.join(self.cache_dir, f'{name}.pickle')
+
+    def get(self, file_path: str, key: Tuple[int, int, int]) -> Optional[Any]:
+        """ Returns a copy of the cached data for the given absolute file path or None if there is
+        no valid cache entry.
+        """
+        with self._lock:
+            entry = self._entries.get(file_path, None)
+            if entry is not None:
+                self._entries.move_to_end(file_path)
+        if entry is None:
+            entry_path = self._entry_path(file_path)
+            if entry_path is None:
+                return None
+            try:
+                with open(entry_path, 'rb') as f:
+                    version, cached_path, cached_key, payload = pickle.load(f)
+            except Exception:
+                return None
+            if version != self._format_version or cached_path != file_path:
+                return None
+            entry = (tuple(cached_key), payload)
+            self._store(file_path, entry)
+        if entry[0] != key:
+            return None
+        try:
+            return pickle.loads(entry[1])
+        except Exception:
+            # e.g. classes that can no longer be imported
+            return None
+
+    def put(self, file_path: str, key: Tuple[int, int, int], data: Any) -> bool:
+        """ Adds data of the given absolute file path to the cache. Returns False if the data can
+        not be pickled or if the file has been modified too recently (see racy_interval).
+        """
+        if time.time_ns() - key[1] < self.racy_interval * 1e9:
+            return False
+        try:
+            payload = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return False
+        entry = (key, payload)
+        self._store(file_path, entry)
+        entry_path = self._entry_path(file_path)
+        if entry_path is not None:
+            tmp_path = f'{entry_path}.{uuid4().hex[:8]}.tmp'
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                with open(tmp_path, 'wb') as f:
+                    pickle.dump((self._format_version, file_path, key, payload),
+                                f,
+                                protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, entry_path)
+            except OSError:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+        return True
+
+    def _store(self, file_path: str, entry: Tuple[Tuple[int, int, int], bytes]) -> None:
+        with self._lock:
+            self._entries[file_path] = entry
+            self._entries.move_to_end(file_path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """ Removes all entries from memory and from the cache directory """
+        with self._lock:
+            self._entries.clear()
+        if self.cache_dir is not None and os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                if name.endswith('.pickle'):
+                    try:
+                        os.remove(os.path.join(self.cache_dir, name))
+                    except OSError:
+                        pass
+
+
+# Default cache used by yaml_load
+yaml_load_cache = YamlLoadCache(cache_dir=os.path.join(get_appdata_dir(), 'yaml_cache'))
+
+
+def yaml_load(file_path: _FilePath, ignore_missing: Optional[bool] = False, *,
+              array_file_path: Optional[_FilePath] = None,
+              mmap: Optional[bool] = False,
+              cache: Optional[bool] = False) -> Dict[str, Any]:
     """ Loads a qudi style YAML file.
     Raises OSError if the file does not exist or can not be accessed.
 
+    If mmap is True, arrays stored in separate .npy or .npz files are returned as copy-on-write
+    memory-mapped arrays (numpy.memmap) instead of being read into memory. The data is only read
+    from disk when it is accessed and changes to the arrays are not written back to the files.
+    Note that on Windows the array files can not be replaced (e.g. by yaml_dump) as long as arrays
+    mapped from them exist.
+
+    If cache is True, the parsed data is stored in yaml_load_cache and returned from there (as deep
+    copy) as long as the file does not change. Data referring to arrays in separate files is never
+    cached.
+
     @param str file_path: path to config file
     @param bool ignore_missing: optional, flag to suppress FileNotFoundError
+    @param str array_file_path: optional, path to .npz file containing the arrays that have been
+                                stored separately by yaml_dump. Only accessed if needed.
+    @param bool mmap: optional, flag to memory-map arrays stored in separate files (default: False)
+    @param bool cache: optional, flag to use the YAML load cache (default: False)
 
     @return dict: The data as python/numpy objects in a dict
     """
+    array_source = None if array_file_path is None else _LazyNpzFile(array_file_path)
     try:
         with open(file_path, 'r') as f:
-            data = YAML().load(f)
+            start = time.perf_counter()
+            if cache and not mmap:
+                abs_path = os.path.abspath(os.fsdecode(file_path))
+                key = YamlLoadCache.file_key(os.fstat(f.fileno()))
+                data = yaml_load_cache.get(abs_path, key)
+                if data is not None:
+                    yaml_load_cache._record(True, time.perf_counter() - start)
+                    return data
+            yaml = YAML()
+            yaml.constructor.array_source = array_source
+            yaml.constructor.mmap_arrays = bool(mmap)
+            data = yaml.load(f)
             # yaml returns None if the stream was empty
-            return dict() if data is None else data
+            data = dict() if data is None else data
+            if cache and not mmap:
+                yaml_load_cache._record(False, time.perf_counter() - start)
+                if not yaml.constructor.uses_external_files:
+                    yaml_load_cache.put(abs_path, key, data)
+            return data
     except OSError:
         if ignore_missing:
             return dict()
         else:
             raise
+    finally:
+        if array_source is not None:
+            array_source.close()
 
 
-def yaml_dump(file_path: _FilePath, data: Mapping[str, Any]) -> None:
+def yaml_dump(file_path: _FilePath, data: Mapping[str, Any], *,
+              array_file_path: Optional[_FilePath] = None) -> None:
     """ Saves data to file_path in qudi style YAML format. Creates subdirectories if needed.
 
+    If array_file_path is given, numpy arrays with more elements than
+    SafeRepresenter.ndarray_max_size are saved in binary format into this (uncompressed) .npz file
+    instead of the YAML file. The .npz file is removed if there are no such arrays.
+    In this case both files are replaced atomically (temporary file and rename) and the array keys
+    are unique for each dump. So an interrupted dump either leaves the previous state or a YAML file
+    that fails to load instead of one referring to the wrong arrays.
+
     @param str file_path: path to YAML file to save data into
     @param dict data: Dict containing the data to save to file
+    @param str array_file_path: optional, path to .npz file to save large arrays into
     """
     file_dir = os.path.dirname(file_path)
     if file_dir:
         os.makedirs(file_dir, exist_ok=True)
-    with open(file_path, 'w') as f:
-        YAML().dump(data, f)
+    if array_file_path is None:
+        with open(file_path, 'w') as f:
+            YAML().dump(data, f)
+        return
+
+    yaml = YAML()
+    yaml.representer.array_store = arrays = dict()
+    yaml.representer.array_key_prefix = f'array_{uuid4().hex[:8]}'
+    with StringIO() as f:
+        yaml.dump(data, f)
+        yaml_str = f.getvalue()
+    # Replace files in one step in order to not leave a corrupted file behind
+    if arrays:
+        tmp_path = f'{array_file_path}.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, array_file_path)
+    tmp_path = f'{file_path}.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write(yaml_str)
+    os.replace(tmp_path, file_path)
+    if not arrays:
+        try:
+            os.remove(array_file_path)
+        except FileNotFoundError:
+            pass
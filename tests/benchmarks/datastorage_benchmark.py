@@ -0,0 +1,370 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark script for qudi data storage classes. Run as standalone script:
+
+    python datastorage_benchmark.py [--scale SCALE] [--output REPORT] [--compare BASELINE]
+
+Measures save, append and load throughput as well as peak memory of all data storage backends for
+different data shapes and dtypes. Results are written to a JSON report that can be compared to
+the report of another commit in order to detect performance regressions.
+
+Copyright (c) 2021, the qudi developers. See the AUTHORS.md file at the top-level directory of this
+distribution and on <https://github.com/Ulm-IQO/qudi-core/>
+
+This file is part of qudi.
+
+Qudi is free software: you can redistribute it and/or modify it under the terms of
+the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+
+Qudi is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with qudi.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import tracemalloc
+import subprocess
+import numpy as np
+from datetime import datetime
+
+from qudi.util.datastorage import TextDataStorage, CsvDataStorage, NpyDataStorage
+from qudi.util.datastorage import NpyChunkDataStorage, Hdf5DataStorage, h5py
+
+
+def benchmark_text_append(rows=1000000, columns=2):
+    """ Compare row-by-row and bulk appending of a 2D float array to a text file.
+
+    @return dict: rows per second for each append mode
+    """
+    data = np.random.rand(rows, columns)
+    results = dict()
+    with tempfile.TemporaryDirectory() as root_dir:
+        storage = TextDataStorage(root_dir=root_dir, include_global_metadata=False)
+        for bulk in (False, True):
+            file_path, _ = storage.new_file(filename=f'append_bulk_{bulk}.dat')
+            start = time.perf_counter()
+            storage.append_file(data, file_path, bulk=bulk)
+            elapsed = time.perf_counter() - start
+            results['bulk' if bulk else 'row-by-row'] = rows / elapsed
+    return results
+
+
+def benchmark_text_compression(rows=1000000, columns=2, append_rows=10000):
+    """ Compare file size, write and read throughput of uncompressed and compressed text files.
+    Data is appended in portions of append_rows rows to emulate a streaming measurement.
+
+    @return dict: (file size in bytes, rows/s written, rows/s loaded) for each codec
+    """
+    data = np.random.rand(rows, columns)
+    results = dict()
+    with tempfile.TemporaryDirectory() as root_dir:
+        for compression in (None, 'gzip', 'bz2', 'lzma'):
+            storage = TextDataStorage(root_dir=root_dir,
+                                      include_global_metadata=False,
+                                      compression=compression)
+            file_path, _ = storage.new_file(nametag=str(compression))
+            start = time.perf_counter()
+            for index in range(0, rows, append_rows):
+                storage.append_file(data[index:index + append_rows], file_path)
+            write_rate = rows / (time.perf_counter() - start)
+            start = time.perf_counter()
+            storage.load_data(file_path)
+            read_rate = rows / (time.perf_counter() - start)
+            results[str(compression)] = (os.path.getsize(file_path), write_rate, read_rate)
+    return results
+
+
+# Data shapes to benchmark (for scale=1) by name
+BENCHMARK_SHAPES = {'trace': (1000000,), 'image': (1024, 1024), 'table': (20000, 50)}
+BENCHMARK_DTYPES = ('float64', 'int64', 'complex128')
+# Number of blocks to split data into along the first axis for append benchmarks
+APPEND_BLOCKS = 10
+# Explicit text column formats by dtype kind (default formats are used for other kinds)
+TEXT_COLUMN_FORMATS = {'c': '.15e'}
+
+
+def _binary_storage_factory(storage_cls, **kwargs):
+    """ Creates benchmark operations for storage classes appending along the first axis of
+    arbitrary arrays (NpyDataStorage, NpyChunkDataStorage, Hdf5DataStorage).
+    """
+    def operations(root_dir):
+        storage = storage_cls(root_dir=root_dir, include_global_metadata=False, **kwargs)
+
+        def save(data):
+            return storage.save_data(data, nametag='save')[0]
+
+        def append(data):
+            file_path, _ = storage.new_file(dtype=data.dtype, shape=data.shape[1:], nametag='append')
+            for block in np.array_split(data, APPEND_BLOCKS):
+                storage.append_file(block, file_path)
+            return file_path
+
+        def load(file_path):
+            if storage_cls is NpyChunkDataStorage:
+                return storage.load_data(file_path, lazy=False)[0]
+            return storage.load_data(file_path)[0]
+        return save, append, load
+    return operations
+
+
+def _text_storage_factory(storage_cls, **kwargs):
+    """ Creates benchmark operations for text based storage classes. 1D traces are saved as single
+    column tables. Complex data is written with an explicit column format since the default format
+    for complex values does not support numpy scalars.
+    """
+    def operations(root_dir):
+        storages = dict()
+
+        def get_storage(data):
+            if data.dtype.kind not in storages:
+                storages[data.dtype.kind] = storage_cls(
+                    root_dir=root_dir,
+                    include_global_metadata=False,
+                    column_formats=TEXT_COLUMN_FORMATS.get(data.dtype.kind, None),
+                    **kwargs
+                )
+            return storages[data.dtype.kind]
+
+        def save(data):
+            storage = get_storage(data)
+            return storage.save_data(data.reshape(len(data), -1), nametag='save')[0]
+
+        def append(data):
+            storage = get_storage(data)
+            data = data.reshape(len(data), -1)
+            file_path, _ = storage.new_file(nametag='append')
+            for block in np.array_split(data, APPEND_BLOCKS):
+                storage.append_file(block, file_path)
+            return file_path
+
+        def load(file_path):
+            return storage_cls.load_data(file_path)[0]
+        return save, append, load
+    return operations
+
+
+def get_benchmark_backends():
+    """ Returns all data storage backends available for benchmarking.
+
+    @return dict: backend name as keys and factory creating (save, append, load) functions as values
+    """
+    backends = {'TextDataStorage': _text_storage_factory(TextDataStorage),
+                'TextDataStorage(gzip)': _text_storage_factory(TextDataStorage,
+                                                               compression='gzip'),
+                'CsvDataStorage': _text_storage_factory(CsvDataStorage),
+                'NpyDataStorage': _binary_storage_factory(NpyDataStorage),
+                'NpyChunkDataStorage': _binary_storage_factory(NpyChunkDataStorage)}
+    if h5py is not None:
+        backends['Hdf5DataStorage'] = _binary_storage_factory(Hdf5DataStorage)
+    return backends
+
+
+def _create_data(shape, dtype):
+    rng = np.random.default_rng(42)
+    dtype = np.dtype(dtype)
+    if dtype.kind == 'c':
+        return (rng.random(shape) + 1j * rng.random(shape)).astype(dtype)
+    if dtype.kind in 'iu':
+        return rng.integers(-1000000, 1000000, size=shape).astype(dtype)
+    return rng.random(shape).astype(dtype)
+
+
+def _get_path_size(path):
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+    return os.path.getsize(path)
+
+
+def _measure(func, arg, repeat):
+    """ Run func(arg) repeatedly and return the return value, the best run time in seconds and the
+    peak memory (tracemalloc) in bytes of an additional run. Memory tracing slows down Python
+    allocations and is therefore not active during timing.
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(arg)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        del result
+    tracemalloc.start()
+    try:
+        result = func(arg)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, best, peak
+
+
+def run_benchmark_suite(scale=1., repeat=3, backends=None, shapes=None, dtypes=None, log=None):
+    """ Benchmark save, append and load throughput and peak memory of data storage backends.
+
+    @param float scale: optional, scaling factor for the first axis of all benchmark data shapes
+    @param int repeat: optional, number of runs per measurement (best run time is reported)
+    @param iterable backends: optional, names of backends to benchmark (default: all available)
+    @param iterable shapes: optional, names of data shapes to benchmark (default: all)
+    @param iterable dtypes: optional, dtype names to benchmark (default: all)
+    @param callable log: optional, function called with a progress message string
+
+    @return dict: Benchmark results by case name "<backend>/<shape>/<dtype>"
+    """
+    all_backends = get_benchmark_backends()
+    backends = list(all_backends) if backends is None else backends
+    shapes = list(BENCHMARK_SHAPES) if shapes is None else shapes
+    dtypes = list(BENCHMARK_DTYPES) if dtypes is None else dtypes
+    results = dict()
+    for shape_name in shapes:
+        shape = BENCHMARK_SHAPES[shape_name]
+        shape = (max(APPEND_BLOCKS, int(round(shape[0] * scale))), *shape[1:])
+        for dtype in dtypes:
+            data = _create_data(shape, dtype)
+            for backend in backends:
+                case = f'{backend}/{shape_name}/{dtype}'
+                result = {'shape': list(shape), 'dtype': dtype, 'nbytes': data.nbytes}
+                with tempfile.TemporaryDirectory() as root_dir:
+                    save, append, load = all_backends[backend](root_dir)
+                    try:
+                        file_path, save_time, save_peak = _measure(save, data, repeat)
+                        _, append_time, append_peak = _measure(append, data, repeat)
+                        loaded, load_time, load_peak = _measure(load, file_path, repeat)
+                        if loaded.size != data.size:
+                            raise AssertionError(f'Loaded {loaded.size:d} values instead of '
+                                                 f'{data.size:d}')
+                        del loaded
+                    except Exception as err:
+                        result['error'] = f'{type(err).__name__}: {err}'
+                    else:
+                        result['file_size'] = _get_path_size(file_path)
+                        for operation, seconds, peak in [('save', save_time, save_peak),
+                                                         ('append', append_time, append_peak),
+                                                         ('load', load_time, load_peak)]:
+                            result[operation] = {'seconds': seconds,
+                                                 'mb_per_s': data.nbytes / seconds / 2**20,
+                                                 'peak_memory': peak}
+                results[case] = result
+                if log is not None:
+                    log(format_result(case, result))
+    return results
+
+
+def format_result(case, result):
+    """ Returns a single line summary string of a benchmark result """
+    if 'error' in result:
+        return f'{case:<45} {result["error"]}'
+    operations = '  '.join(
+        f'{op} {result[op]["mb_per_s"]:8.1f} MB/s ({result[op]["peak_memory"] / 2**20:7.1f} MiB)'
+        for op in ('save', 'append', 'load')
+    )
+    return f'{case:<45} {operations}'
+
+
+def _get_git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'],
+                              cwd=os.path.dirname(os.path.abspath(__file__)),
+                              capture_output=True,
+                              text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def create_report(results, **parameters):
+    """ Wrap benchmark results into a report dict including information about the environment.
+    Cases that failed are listed separately under "errors" with their error message.
+    """
+    return {'info': {'timestamp': datetime.now().isoformat(),
+                     'git_commit': _get_git_commit(),
+                     'python': platform.python_version(),
+                     'numpy': np.__version__,
+                     'h5py': None if h5py is None else h5py.__version__,
+                     'platform': platform.platform(),
+                     **parameters},
+            'results': {case: res for case, res in results.items() if 'error' not in res},
+            'errors': {case: res['error'] for case, res in results.items() if 'error' in res}}
+
+
+def compare_reports(baseline, report, threshold=0.2):
+    """ Compare the run times of two benchmark reports.
+
+    @param dict baseline: benchmark report to compare against
+    @param dict report: new benchmark report
+    @param float threshold: optional, relative run time increase to be considered a regression
+
+    @return list: (case, operation, baseline seconds, new seconds) tuples of all regressions
+    """
+    regressions = list()
+    for case, result in report['results'].items():
+        base_result = baseline['results'].get(case, None)
+        if base_result is None or 'error' in base_result or 'error' in result:
+            continue
+        if base_result['nbytes'] != result['nbytes']:
+            continue
+        for operation in ('save', 'append', 'load'):
+            base_seconds = base_result[operation]['seconds']
+            seconds = result[operation]['seconds']
+            if seconds > base_seconds * (1 + threshold):
+                regressions.append((case, operation, base_seconds, seconds))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark qudi data storage backends.')
+    parser.add_argument('--scale', type=float, default=1., help='data size scaling factor')
+    parser.add_argument('--repeat', type=int, default=3, help='number of runs per measurement')
+    parser.add_argument('--backends', nargs='+', default=None, help='backends to benchmark')
+    parser.add_argument('--shapes', nargs='+', default=None, choices=list(BENCHMARK_SHAPES))
+    parser.add_argument('--dtypes', nargs='+', default=None, choices=list(BENCHMARK_DTYPES))
+    parser.add_argument('--output', default=None, help='JSON report file path to write')
+    parser.add_argument('--compare', default=None, help='JSON baseline report to compare with')
+    parser.add_argument('--threshold',
+                        type=float,
+                        default=0.2,
+                        help='relative run time increase to report as regression')
+    parser.add_argument('--codecs',
+                        action='store_true',
+                        help='also compare text append modes and compression codecs')
+    args = parser.parse_args(argv)
+
+    results = run_benchmark_suite(scale=args.scale,
+                                  repeat=args.repeat,
+                                  backends=args.backends,
+                                  shapes=args.shapes,
+                                  dtypes=args.dtypes,
+                                  log=print)
+    report = create_report(results, scale=args.scale, repeat=args.repeat)
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+    if args.codecs:
+        rows = int(1000000 * args.scale)
+        for mode, rate in benchmark_text_append(rows).items():
+            print(f'TextDataStorage.append_file ({mode}): {rate:.0f} rows/s')
+        for codec, (size, write_rate, read_rate) in benchmark_text_compression(rows).items():
+            print(f'TextDataStorage compression={codec}: {size / 2**20:.1f} MiB, '
+                  f'write {write_rate:.0f} rows/s, load {read_rate:.0f} rows/s')
+    regressions = list()
+    if args.compare:
+        with open(args.compare, 'r') as file:
+            baseline = json.load(file)
+        regressions = compare_reports(baseline, report, args.threshold)
+        for case, operation, base_seconds, seconds in regressions:
+            print(f'REGRESSION {case} {operation}: {base_seconds:.4f} s -> {seconds:.4f} s')
+    for case, error in report['errors'].items():
+        print(f'ERROR {case}: {error}')
+    return 1 if regressions or report['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
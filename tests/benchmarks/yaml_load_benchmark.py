@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark script for loading qudi configuration files with and without the YAML load cache. Run as
+standalone script:
+
+    python yaml_load_benchmark.py [--modules MODULES] [--repeat REPEAT]
+
+Creates a configuration file with the given number of modules and measures the time to parse it
+with qudi.util.yaml.yaml_load compared to loading it from the YAML load cache (in memory and from
+the cache directory).
+
+Copyright (c) 2021, the qudi developers. See the AUTHORS.md file at the top-level directory of this
+distribution and on <https://github.com/Ulm-IQO/qudi-core/>
+
+This file is part of qudi.
+
+Qudi is free software: you can redistribute it and/or modify it under the terms of
+the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+
+Qudi is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with qudi.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import qudi.util.yaml as qudi_yaml
+from qudi.util.yaml import YamlLoadCache, yaml_dump, yaml_load
+
+
+def create_config(modules=60):
+    """ Create a qudi configuration dict with the given number of hardware, logic and GUI modules.
+    """
+    config = {'global': {'startup_modules': [f'gui_{ii}' for ii in range(0, modules // 3, 4)],
+                         'namespace_server_port': 18861,
+                         'extension_paths': list()}}
+    for base in ('hardware', 'logic', 'gui'):
+        config[base] = dict()
+        for ii in range(modules // 3):
+            module_cfg = {'module.Class': f'dummy.{base}_module.Dummy{base.capitalize()}{ii}',
+                          'options': {'channels': {f'ch{jj}': {'unit': 'V',
+                                                                 'range': [-10.0, 10.0],
+                                                                 'resolution': 16,
+                                                                 'enabled': bool(jj % 2)}
+                                                   for jj in range(8)},
+                                      'sample_rate': 1e6,
+                                      'description': f'Dummy {base} module number {ii}'}}
+            if base != 'hardware':
+                module_cfg['connect'] = {'device': f'hardware_{ii}'}
+            config[base][f'{base}_{ii}'] = module_cfg
+    return config
+
+
+def benchmark_yaml_load(modules=60, repeat=20):
+    """ Measure the mean time to load a config file without cache and with in-memory and on-disk
+    cache hits.
+
+    @return dict: mean load time in seconds for each load mode
+    """
+    default_cache = qudi_yaml.yaml_load_cache
+    results = dict()
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, 'benchmark.cfg')
+            yaml_dump(file_path, create_config(modules))
+            # Make sure the file is not considered as recently modified by the cache
+            mtime = time.time() - 10
+            os.utime(file_path, (mtime, mtime))
+            cache_dir = os.path.join(tmp_dir, 'cache')
+            qudi_yaml.yaml_load_cache = YamlLoadCache(cache_dir=cache_dir)
+
+            start = time.perf_counter()
+            for _ in range(repeat):
+                yaml_load(file_path)
+            results['parse'] = (time.perf_counter() - start) / repeat
+
+            yaml_load(file_path, cache=True)
+            start = time.perf_counter()
+            for _ in range(repeat):
+                yaml_load(file_path, cache=True)
+            results['memory cache'] = (time.perf_counter() - start) / repeat
+
+            start = time.perf_counter()
+            for _ in range(repeat):
+                qudi_yaml.yaml_load_cache = YamlLoadCache(cache_dir=cache_dir)
+                yaml_load(file_path, cache=True)
+            results['disk cache'] = (time.perf_counter() - start) / repeat
+            results['file size'] = os.path.getsize(file_path)
+    finally:
+        qudi_yaml.yaml_load_cache = default_cache
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark qudi YAML load cache.')
+    parser.add_argument('--modules', type=int, default=60, help='number of configured modules')
+    parser.add_argument('--repeat', type=int, default=20, help='number of loads per measurement')
+    args = parser.parse_args(argv)
+
+    results = benchmark_yaml_load(modules=args.modules, repeat=args.repeat)
+    print(f'Config with {args.modules} modules ({results.pop("file size") / 1024:.0f} KiB):')
+    for mode, seconds in results.items():
+        print(f'  {mode:>12}: {seconds * 1e3:8.2f} ms  ({results["parse"] / seconds:6.1f}x)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+
+"""
+This file contains unit tests for the qudi configuration validation.
+
+Copyright (c) 2021, the qudi developers. See the AUTHORS.md file at the top-level directory of this
+distribution and on <https://github.com/Ulm-IQO/qudi-core/>
+
+This file is part of qudi.
+
+Qudi is free software: you can redistribute it and/or modify it under the terms of
+the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+
+Qudi is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with qudi.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import copy
+import unittest
+
+from qudi.core.config import Configuration, ValidationError
+from qudi.core.config.validator import validate_config, clear_validation_cache
+
+
+class TestConfigValidation(unittest.TestCase):
+
+    def setUp(self):
+        clear_validation_cache()
+        self.config = {
+            'global': {'startup_modules': ['my_gui']},
+            'gui': {'my_gui': {'module.Class': 'dummy.DummyGui', 'connect': {'logic': 'my_logic'}}},
+            'logic': {'my_logic': {'module.Class': 'dummy.DummyLogic',
+                                   'options': {'values': [1, 2, 3]}},
+                      'remote_logic': {'native_module_name': 'other_logic',
+                                       'address': 'localhost',
+                                       'port': 12345}}
+        }
+
+    def test_validate_config(self):
+        config = copy.deepcopy(self.config)
+        validate_config(config)
+        self.assertEqual(config['hardware'], dict())
+        self.assertEqual(config['global']['extension_paths'], list())
+        self.assertEqual(config['logic']['my_logic']['allow_remote'], False)
+        self.assertEqual(config['logic']['my_logic']['connect'], dict())
+        self.assertIsNone(config['logic']['remote_logic']['certfile'])
+        # Validate again with cached module configurations
+        cached_config = copy.deepcopy(self.config)
+        validate_config(cached_config)
+        self.assertEqual(cached_config, config)
+        # Mutating the validated config must not affect later validations
+        cached_config['logic']['my_logic']['options']['values'].append(4)
+        cached_config['logic']['my_logic']['connect']['x'] = 'y'
+        config = copy.deepcopy(self.config)
+        validate_config(config)
+        self.assertEqual(config['logic']['my_logic']['options']['values'], [1, 2, 3])
+        self.assertEqual(config['logic']['my_logic']['connect'], dict())
+        self.assertEqual(config['hardware'], dict())
+
+    def test_invalid_config(self):
+        config = copy.deepcopy(self.config)
+        config['logic']['my_logic']['unknown'] = 42
+        with self.assertRaises(ValidationError) as context:
+            validate_config(config)
+        self.assertEqual(list(context.exception.path)[:2], ['logic', 'my_logic'])
+        config = copy.deepcopy(self.config)
+        config['gui']['remote_gui'] = copy.deepcopy(self.config['logic']['remote_logic'])
+        with self.assertRaises(ValidationError):
+            validate_config(config)
+        config = copy.deepcopy(self.config)
+        config['hardware'] = {'1_invalid_name': {'module.Class': 'dummy.DummyHardware'}}
+        with self.assertRaises(ValidationError):
+            validate_config(config)
+        config = copy.deepcopy(self.config)
+        config['global']['namespace_server_port'] = 'invalid'
+        with self.assertRaises(ValidationError):
+            validate_config(config)
+
+    def test_module_changes(self):
+        configuration = Configuration(config=self.config)
+        configuration.add_local_module('hardware', 'my_hardware', 'dummy.DummyHardware')
+        configuration.add_remote_module('hardware', 'remote_hw', 'other_hw', 'localhost', 12345)
+        configuration.rename_module('my_logic', 'renamed_logic')
+        configuration.remove_module('remote_logic')
+        # Incrementally validated config must equal fully validated config
+        config = configuration.config_map
+        expected = copy.deepcopy(config)
+        clear_validation_cache()
+        validate_config(expected)
+        self.assertEqual(config, expected)
+        self.assertEqual(Configuration(config=config).config_map, expected)
+        with self.assertRaises(ValidationError):
+            configuration.add_remote_module('gui', 'remote_gui', 'other_gui', 'localhost', 12345)
+        with self.assertRaises(ValidationError):
+            configuration.add_local_module('logic', '1_invalid_name', 'dummy.DummyLogic')
+        with self.assertRaises(ValidationError):
+            configuration.rename_module('renamed_logic', 'invalid-name')
+        self.assertEqual(configuration.config_map, config)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+"""
+This file contains unit tests making sure headless qudi does not import the GUI stack and stays
+within its import time and memory budget.
+
+Copyright (c) 2021, the qudi developers. See the AUTHORS.md file at the top-level directory of this
+distribution and on <https://github.com/Ulm-IQO/qudi-core/>
+
+This file is part of qudi.
+
+Qudi is free software: you can redistribute it and/or modify it under the terms of
+the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+
+Qudi is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with qudi.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import sys
+import json
+import subprocess
+import unittest
+
+# Modules that must only be imported if a qudi GUI is requested
+GUI_MODULES = ('PySide2.QtWidgets', 'pyqtgraph', 'qudi.core.gui', 'qudi.util.widgets',
+               'jupyter_client', 'qtconsole', 'matplotlib.pyplot')
+
+# Budget for "import qudi.core.application" in a fresh interpreter (best of IMPORT_RUNS)
+IMPORT_TIME_BUDGET = 2.0  # seconds
+MAX_RSS_BUDGET = 200 * 1024 * 1024  # bytes
+IMPORT_RUNS = 3
+
+_IMPORT_SCRIPT = f"""
+import sys
+import json
+import time
+start = time.perf_counter()
+import qudi.core.application
+duration = time.perf_counter() - start
+try:
+    import resource
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    max_rss = max_rss if sys.platform == 'darwin' else max_rss * 1024
+except ImportError:
+    max_rss = None
+print(json.dumps({{'duration': duration,
+                  'max_rss': max_rss,
+                  'gui_modules': [m for m in {GUI_MODULES!r} if m in sys.modules]}}))
+"""
+
+
+def _measure_headless_import():
+    src_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, 'src'))
+    env = os.environ.copy()
+    env['PYTHONPATH'] = os.pathsep.join(p for p in (src_dir, env.get('PYTHONPATH')) if p)
+    output = subprocess.run([sys.executable, '-c', _IMPORT_SCRIPT],
+                            env=env,
+                            check=True,
+                            capture_output=True,
+                            text=True,
+                            timeout=60).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+class TestHeadlessImport(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.results = [_measure_headless_import() for _ in range(IMPORT_RUNS)]
+
+    def test_no_gui_modules(self):
+        self.assertListEqual(self.results[0]['gui_modules'], [])
+
+    def test_import_time_budget(self):
+        duration = min(result['duration'] for result in self.results)
+        self.assertLess(duration,
+                        IMPORT_TIME_BUDGET,
+                        f'Importing qudi.core.application took {duration:.3f} s (budget: '
+                        f'{IMPORT_TIME_BUDGET:.3f} s)')
+
+    def test_memory_budget(self):
+        max_rss = min(result['max_rss'] or 0 for result in self.results)
+        if not max_rss:
+            self.skipTest('Peak memory usage can not be measured on this platform')
+        self.assertLess(max_rss,
+                        MAX_RSS_BUDGET,
+                        f'Importing qudi.core.application used {max_rss / 2**20:.1f} MiB (budget: '
+                        f'{MAX_RSS_BUDGET / 2**20:.1f} MiB)')
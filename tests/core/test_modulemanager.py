@@ -0,0 +1,306 @@
+# -*- coding: utf-8 -*-
+
+"""
+This file contains unit tests for the qudi module manager.
+
+Copyright (c) 2021, the qudi developers. See the AUTHORS.md file at the top-level directory of this
+distribution and on <https://github.com/Ulm-IQO/qudi-core/>
+
+This file is part of qudi.
+
+Qudi is free software: you can redistribute it and/or modify it under the terms of
+the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+
+Qudi is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with qudi.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import sys
+import time
+import types
+import threading
+import unittest
+from unittest import mock
+from PySide2 import QtCore, QtWidgets
+
+from qudi.core.module import Base, LogicBase
+from qudi.core.connector import Connector
+from qudi.core.modulemanager import ModuleManager
+from qudi.core.moduletiming import module_timing_recorder
+from qudi.core.threadmanager import ThreadManager
+
+
+class _DummyQudiMain:
+    remote_modules_server = None
+    thread_manager = None
+
+
+class SlowHardware(Base):
+    """ Threaded dummy hardware module taking some time to activate """
+    _threaded = True
+    activation_delay = 0.3
+    activation_log = list()
+
+    def on_activate(self):
+        time.sleep(self.activation_delay)
+        self.activation_log.append((self.module_name, time.perf_counter()))
+
+    def on_deactivate(self):
+        time.sleep(self.activation_delay)
+        self.activation_log.append((self.module_name, time.perf_counter()))
+
+
+class BrokenHardware(SlowHardware):
+    """ Threaded dummy hardware module failing to activate """
+
+    def on_activate(self):
+        raise RuntimeError('Activation failed on purpose')
+
+
+class HangingHardware(SlowHardware):
+    """ Threaded dummy hardware module blocking deactivation until released """
+    release_event = threading.Event()
+
+    def on_deactivate(self):
+        self.release_event.wait()
+
+
+class DependentLogic(LogicBase):
+    """ Dummy logic module requiring two hardware modules """
+    _first_hardware = Connector(interface='SlowHardware', name='first')
+    _second_hardware = Connector(interface='SlowHardware', name='second')
+
+    def on_activate(self):
+        SlowHardware.activation_log.append((self.module_name, time.perf_counter()))
+
+    def on_deactivate(self):
+        SlowHardware.activation_log.append((self.module_name, time.perf_counter()))
+
+
+def _module_config(module_class, connect=None, options=None):
+    return {'module.Class': module_class,
+            'allow_remote': False,
+            'connect': dict() if connect is None else connect,
+            'options': dict() if options is None else options}
+
+
+class _ModuleManagerTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls._app = QtWidgets.QApplication.instance()
+        if cls._app is None:
+            cls._app = QtWidgets.QApplication([])
+        cls._qudi_main = _DummyQudiMain()
+        cls._qudi_main.thread_manager = ThreadManager.instance()
+        if cls._qudi_main.thread_manager is None:
+            cls._qudi_main.thread_manager = ThreadManager()
+        cls.manager = ModuleManager.instance()
+        if cls.manager is None:
+            cls.manager = ModuleManager(qudi_main=cls._qudi_main)
+
+    def tearDown(self):
+        self.manager.clear()
+
+
+class TestModuleManager(_ModuleManagerTestCase):
+
+    def setUp(self):
+        self.configurations = {
+            'hw_a': ('hardware', _module_config('dummy.HardwareA', options={'value': 1})),
+            'hw_b': ('hardware', _module_config('dummy.HardwareB')),
+            'logic': ('logic', _module_config('dummy.Logic', connect={'hw': 'hw_a'})),
+        }
+        for name, (base, cfg) in self.configurations.items():
+            self.manager.add_module(name, base, cfg)
+
+    def test_prune_unchanged(self):
+        """ Unchanged modules must be kept alive """
+        modules = self.manager.modules
+        self.assertEqual(self.manager.prune_modules(self.configurations), list())
+        self.assertEqual(self.manager.modules, modules)
+        for name, module in modules.items():
+            self.assertIs(self.manager[name], module)
+
+    def test_prune_changed(self):
+        """ Only removed modules and modules with changed base or configuration are removed """
+        modules = self.manager.modules
+        self.configurations['hw_a'][1]['options']['value'] = 2
+        self.configurations['hw_b'] = ('logic', self.configurations['hw_b'][1])
+        del self.configurations['logic']
+        removed = self.manager.prune_modules(self.configurations)
+        self.assertSetEqual(set(removed), {'hw_a', 'hw_b', 'logic'})
+        self.assertEqual(len(self.manager), 0)
+
+        for name, (base, cfg) in self.configurations.items():
+            self.manager.add_module(name, base, cfg)
+        self.configurations['logic'] = ('logic',
+                                        _module_config('dummy.Logic', connect={'hw': 'hw_b'}))
+        self.manager.add_module('logic', *self.configurations['logic'])
+        modules = self.manager.modules
+        self.configurations['logic'][1]['connect']['hw'] = 'hw_a'
+        self.assertEqual(self.manager.prune_modules(self.configurations), ['logic'])
+        self.assertIs(self.manager['hw_a'], modules['hw_a'])
+        self.assertIs(self.manager['hw_b'], modules['hw_b'])
+        self.assertNotIn('logic', self.manager)
+
+
+
+class TestParallelActivation(_ModuleManagerTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Make dummy module classes importable by the module manager
+        cls._dummy_module = types.ModuleType('qudi.hardware.dummy_slow')
+        cls._dummy_module.SlowHardware = SlowHardware
+        cls._dummy_module.BrokenHardware = BrokenHardware
+        cls._dummy_module.HangingHardware = HangingHardware
+        cls._dummy_module.DependentLogic = DependentLogic
+        sys.modules['qudi.hardware.dummy_slow'] = cls._dummy_module
+        sys.modules['qudi.logic.dummy_slow'] = cls._dummy_module
+
+    @classmethod
+    def tearDownClass(cls):
+        del sys.modules['qudi.hardware.dummy_slow']
+        del sys.modules['qudi.logic.dummy_slow']
+
+    def setUp(self):
+        SlowHardware.activation_log.clear()
+
+    def tearDown(self):
+        super().tearDown()
+        # Process queued thread cleanup
+        QtCore.QCoreApplication.processEvents()
+
+    def _add_modules(self, prefix, second_hardware='SlowHardware'):
+        names = [f'{prefix}_hw_1', f'{prefix}_hw_2', f'{prefix}_hw_3', f'{prefix}_logic']
+        self.manager.add_module(names[0], 'hardware', _module_config('dummy_slow.SlowHardware'))
+        self.manager.add_module(names[1],
+                                'hardware',
+                                _module_config(f'dummy_slow.{second_hardware}'))
+        self.manager.add_module(names[2], 'hardware', _module_config('dummy_slow.SlowHardware'))
+        self.manager.add_module(names[3],
+                                'logic',
+                                _module_config('dummy_slow.DependentLogic',
+                                               connect={'first': names[0], 'second': names[1]}))
+        return names
+
+    def test_dependency_levels(self):
+        names = self._add_modules('levels')
+        self.assertEqual(self.manager.get_dependency_levels([names[3], names[2]]),
+                         [names[:3], [names[3]]])
+        self.assertEqual(self.manager.get_dependency_levels([names[0]]), [[names[0]]])
+        with self.assertRaises(KeyError):
+            self.manager.get_dependency_levels(['not_a_module'])
+
+    def test_parallel_activation(self):
+        names = self._add_modules('parallel')
+        start = time.perf_counter()
+        results = self.manager.activate_modules([names[3], names[2]])
+        elapsed = time.perf_counter() - start
+        self.assertEqual(results, {name: None for name in names})
+        self.assertTrue(all(self.manager[name].is_active for name in names))
+        # Hardware modules are activated concurrently
+        self.assertLess(elapsed, 3 * SlowHardware.activation_delay)
+        # Logic module is activated after all its required modules
+        log = dict(SlowHardware.activation_log)
+        self.assertGreater(log[names[3]], max(log[names[0]], log[names[1]]))
+        # Lifecycle phase durations are recorded
+        timings = self.manager.module_timings
+        for phase in ('load', 'connect', 'thread', 'status_load', 'on_activate', 'activate'):
+            self.assertIn(phase, timings[names[0]])
+        self.assertGreaterEqual(timings[names[0]]['on_activate'], SlowHardware.activation_delay)
+        self.assertGreaterEqual(timings[names[0]]['activate'], timings[names[0]]['on_activate'])
+
+    def test_failed_activation(self):
+        names = self._add_modules('failed', second_hardware='BrokenHardware')
+        results = self.manager.activate_modules([names[3], names[2], 'not_a_module'],
+                                                parallel=False)
+        self.assertIsNone(results[names[0]])
+        self.assertIsNone(results[names[2]])
+        self.assertIsInstance(results[names[1]], RuntimeError)
+        self.assertIsInstance(results[names[3]], RuntimeError)
+        self.assertIsInstance(results['not_a_module'], KeyError)
+        self.assertTrue(self.manager[names[0]].is_active)
+        self.assertFalse(self.manager[names[1]].is_active)
+        self.assertFalse(self.manager[names[3]].is_loaded)
+
+
+    def test_parallel_deactivation(self):
+        names = self._add_modules('shutdown')
+        self.assertEqual(self.manager.activate_modules([names[3], names[2]]),
+                         {name: None for name in names})
+        self.assertEqual(self.manager.get_shutdown_levels(names[:3]), [[names[2], names[3]],
+                                                                       names[:2]])
+        SlowHardware.activation_log.clear()
+        start = time.perf_counter()
+        results = self.manager.deactivate_modules(names[:3])
+        elapsed = time.perf_counter() - start
+        self.assertEqual(results, {name: None for name in names})
+        self.assertFalse(any(self.manager[name].is_active for name in names))
+        # Hardware modules are deactivated concurrently
+        self.assertLess(elapsed, 3 * SlowHardware.activation_delay)
+        # Logic module is deactivated before all its required modules
+        log = dict(SlowHardware.activation_log)
+        self.assertLess(log[names[3]], min(log[names[0]], log[names[1]]))
+
+    def test_deactivation_timeout(self):
+        names = self._add_modules('timeout', second_hardware='HangingHardware')
+        self.manager.activate_modules([names[3], names[2]])
+        HangingHardware.release_event.clear()
+        hanging = self.manager[names[1]]
+        try:
+            with mock.patch.object(hanging.instance, '_dump_status_variables') as dump:
+                results = self.manager.deactivate_modules(names, timeout=0.5)
+                dump.assert_called_once()
+            self.assertIsInstance(results[names[1]], TimeoutError)
+            self.assertIsNone(results[names[0]])
+            self.assertIsNone(results[names[3]])
+            self.assertTrue(hanging.is_active)
+            self.assertFalse(self.manager[names[0]].is_active)
+            with self.assertRaises(RuntimeError):
+                hanging.deactivate()
+        finally:
+            HangingHardware.release_event.set()
+        # Deactivation is finished by the next call after the module thread is released
+        deadline = time.perf_counter() + 5
+        while True:
+            try:
+                hanging.deactivate()
+                break
+            except RuntimeError:
+                if time.perf_counter() > deadline:
+                    raise
+                time.sleep(0.01)
+        self.assertFalse(hanging.is_active)
+        # The deactivation of the hanging module is recorded only once
+        records = [rec for rec in module_timing_recorder.get_records(names[1])
+                   if rec.phase == 'deactivate']
+        self.assertEqual(len(records), 1)
+        self.assertGreaterEqual(records[0].duration, 0.5)
+
+    def test_stop_all_modules_from_thread(self):
+        names = self._add_modules('stop_all')
+        self.manager.activate_modules([names[3], names[2]])
+        results = dict()
+        thread = threading.Thread(target=lambda: results.update(self.manager.stop_all_modules()))
+        thread.start()
+        # Process events in the main thread until the call returns
+        deadline = time.perf_counter() + 10
+        while thread.is_alive() and time.perf_counter() < deadline:
+            self._app.processEvents()
+            time.sleep(0.01)
+        thread.join(1)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(results, {name: None for name in names})
+        self.assertFalse(any(self.manager[name].is_active for name in names))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+
+"""
+This file contains unit tests for the qudi module lifecycle timing recorder.
+
+Copyright (c) 2021, the qudi developers. See the AUTHORS.md file at the top-level directory of this
+distribution and on <https://github.com/Ulm-IQO/qudi-core/>
+
+This file is part of qudi.
+
+Qudi is free software: you can redistribute it and/or modify it under the terms of
+the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+
+Qudi is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with qudi.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import json
+import time
+import tempfile
+import threading
+import unittest
+
+from qudi.core.moduletiming import ModuleTimingRecorder
+
+
+class TestModuleTimingRecorder(unittest.TestCase):
+
+    def setUp(self):
+        self.recorder = ModuleTimingRecorder(max_records=100)
+
+    def test_measure(self):
+        with self.recorder.measure('hw', 'load'):
+            time.sleep(0.05)
+        with self.assertRaises(ValueError):
+            with self.recorder.measure('hw', 'on_activate'):
+                raise ValueError('failed on purpose')
+        with self.recorder.measure('logic', 'load'):
+            pass
+        records = self.recorder.get_records('hw')
+        self.assertEqual([rec.phase for rec in records], ['load', 'on_activate'])
+        self.assertGreaterEqual(records[0].duration, 0.05)
+        self.assertEqual(records[0].thread_name, threading.current_thread().name)
+        timings = self.recorder.get_timings()
+        self.assertSetEqual(set(timings), {'hw', 'logic'})
+        self.assertSetEqual(set(timings['hw']), {'load', 'on_activate'})
+        # Only the latest duration of a phase is reported
+        self.recorder.add_record('hw', 'load', time.perf_counter(), 1.5)
+        self.assertEqual(self.recorder.get_timings('hw'),
+                         {'hw': {'load': 1.5, 'on_activate': records[1].duration}})
+        self.recorder.clear('hw')
+        self.assertEqual(len(self.recorder), 1)
+        self.recorder.clear()
+        self.assertEqual(len(self.recorder), 0)
+
+    def test_max_records(self):
+        for ii in range(150):
+            self.recorder.add_record('hw', 'load', time.perf_counter(), float(ii))
+        self.assertEqual(len(self.recorder), 100)
+        self.assertEqual(self.recorder.get_timings()['hw']['load'], 149.)
+
+    def test_chrome_trace(self):
+        with self.recorder.measure('hw', 'load'):
+            pass
+        thread = threading.Thread(target=self.recorder.add_record,
+                                  args=('hw', 'on_activate', time.perf_counter(), 0.25),
+                                  name='mod-hardware-hw')
+        thread.start()
+        thread.join()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, 'trace.json')
+            self.recorder.save_chrome_trace(file_path)
+            with open(file_path, 'r') as file:
+                trace = json.load(file)
+        events = [ev for ev in trace['traceEvents'] if ev['ph'] == 'X']
+        self.assertEqual([ev['name'] for ev in events], ['hw.load', 'hw.on_activate'])
+        self.assertAlmostEqual(events[1]['dur'], 0.25e6)
+        self.assertNotEqual(events[0]['tid'], events[1]['tid'])
+        thread_names = {ev['args']['name'] for ev in trace['traceEvents'] if ev['ph'] == 'M'}
+        self.assertIn('mod-hardware-hw', thread_names)
+
+
+if __name__ == '__main__':
+    unittest.main()
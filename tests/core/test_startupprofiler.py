@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+
+"""
+This file contains unit tests for the qudi startup profiler.
+
+Copyright (c) 2021, the qudi developers. See the AUTHORS.md file at the top-level directory of this
+distribution and on <https://github.com/Ulm-IQO/qudi-core/>
+
+This file is part of qudi.
+
+Qudi is free software: you can redistribute it and/or modify it under the terms of
+the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+
+Qudi is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with qudi.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import unittest
+
+from qudi.core.moduletiming import ModuleTimingRecorder
+from qudi.core.startupprofiler import StartupProfiler, start_startup_profiler
+from qudi.core.startupprofiler import get_startup_profiler, finish_startup_profiler
+from qudi.core.startupprofiler import startup_span, startup_profiled
+
+
+class TestStartupProfiler(unittest.TestCase):
+
+    def setUp(self):
+        self.profiler = StartupProfiler()
+
+    def tearDown(self):
+        self.profiler.uninstall_import_hook()
+
+    def test_spans(self):
+        with self.profiler.span('outer'):
+            with self.profiler.span('inner'):
+                time.sleep(0.02)
+            with self.assertRaises(ValueError):
+                with self.profiler.span('failing'):
+                    raise ValueError('failed on purpose')
+        roots = self.profiler.roots
+        self.assertEqual([span.name for span in roots], ['outer'])
+        self.assertEqual([span.name for span in roots[0].children], ['inner', 'failing'])
+        self.assertGreaterEqual(roots[0].children[0].duration, 0.02)
+        self.assertGreaterEqual(roots[0].duration, roots[0].children[0].duration)
+        stacks = dict(line.rsplit(' ', 1) for line in self.profiler.get_collapsed_stacks())
+        self.assertGreaterEqual(int(stacks['outer;inner']), 20000)
+
+    def test_import_hook(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            package_dir = os.path.join(tmp_dir, 'qudi_profiled_dummy')
+            os.mkdir(package_dir)
+            with open(os.path.join(package_dir, '__init__.py'), 'w') as file:
+                file.write('import time\ntime.sleep(0.02)\nfrom . import sub\n')
+            with open(os.path.join(package_dir, 'sub.py'), 'w') as file:
+                file.write('import time\ntime.sleep(0.02)\n')
+            sys.path.insert(0, tmp_dir)
+            try:
+                self.profiler.install_import_hook()
+                with self.profiler.span('startup'):
+                    import qudi_profiled_dummy
+                self.assertTrue(hasattr(qudi_profiled_dummy, 'sub'))
+            finally:
+                self.profiler.uninstall_import_hook()
+                sys.path.remove(tmp_dir)
+                for name in ('qudi_profiled_dummy', 'qudi_profiled_dummy.sub'):
+                    sys.modules.pop(name, None)
+        # Nested imports of the same package are merged into one span
+        startup = self.profiler.roots[0]
+        self.assertEqual([(s.name, s.category) for s in startup.children],
+                         [('qudi_profiled_dummy', 'import')])
+        self.assertListEqual(startup.children[0].children, [])
+        self.assertGreaterEqual(self.profiler.get_import_times()['qudi_profiled_dummy'], 0.04)
+
+    def test_module_timings(self):
+        recorder = ModuleTimingRecorder()
+        with self.profiler.span('modules'):
+            with recorder.measure('hw', 'activate'):
+                with recorder.measure('hw', 'load'):
+                    pass
+                with recorder.measure('hw', 'on_activate'):
+                    pass
+            recorder.add_record('logic', 'load', time.perf_counter(), 0.)
+        self.profiler.add_module_timings(recorder.get_records(), parent='modules')
+        modules = self.profiler.roots[0]
+        # Only modules with a recorded activation are added
+        self.assertEqual([span.name for span in modules.children], ['module hw'])
+        self.assertEqual([span.name for span in modules.children[0].children],
+                         ['load', 'on_activate'])
+
+    def test_active_profiler(self):
+        self.assertIsNone(get_startup_profiler())
+        with startup_span('ignored'):
+            pass
+
+        @startup_profiled()
+        def profiled_function():
+            return 42
+
+        profiler = start_startup_profiler(import_hook=False)
+        try:
+            self.assertIs(get_startup_profiler(), profiler)
+            with startup_span('phase'):
+                self.assertEqual(profiled_function(), 42)
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                json_path, collapsed_path = finish_startup_profiler(tmp_dir)
+                self.assertIsNone(get_startup_profiler())
+                with open(json_path, 'r') as file:
+                    profile = json.load(file)
+                with open(collapsed_path, 'r') as file:
+                    collapsed = file.read()
+        finally:
+            finish_startup_profiler(tempfile.gettempdir())
+        self.assertEqual(profile['spans'][0]['name'], 'phase')
+        self.assertEqual(profile['spans'][0]['children'][0]['name'],
+                         profiled_function.__qualname__)
+        self.assertIn('phase;', collapsed)
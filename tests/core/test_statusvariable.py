@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+
+"""
+This file contains unit tests for saving and loading qudi status variable files.
+
+Copyright (c) 2021, the qudi developers. See the AUTHORS.md file at the top-level directory of this
+distribution and on <https://github.com/Ulm-IQO/qudi-core/>
+
+This file is part of qudi.
+
+Qudi is free software: you can redistribute it and/or modify it under the terms of
+the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+
+Qudi is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with qudi.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import unittest
+import tempfile
+import numpy as np
+
+from qudi.util.yaml import yaml_dump, yaml_load
+from qudi.core.autosave import StatusVariableAutosave
+from qudi.core.statusvariable import dump_status_variables, load_status_variables
+from qudi.core.statusvariable import migrate_status_variable_files, get_status_array_file_path
+from qudi.core.statusvariable import get_status_variables_digest, is_status_file_current
+
+
+class TestStatusVariableFiles(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self._tmp_dir.name, 'status-Dummy_logic_dummy.cfg')
+        self.variables = {'scalar': 42,
+                          'small': np.arange(3),
+                          'map': np.random.rand(200, 100),
+                          'nested': {'images': [np.ones((50, 50), dtype=np.uint16), 'text']}}
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def assertVariablesEqual(self, variables):
+        self.assertEqual(set(variables), set(self.variables))
+        self.assertEqual(variables['scalar'], 42)
+        np.testing.assert_array_equal(variables['small'], self.variables['small'])
+        np.testing.assert_array_equal(variables['map'], self.variables['map'])
+        images = variables['nested']['images']
+        self.assertEqual(images[0].dtype, np.uint16)
+        np.testing.assert_array_equal(images[0], self.variables['nested']['images'][0])
+        self.assertEqual(images[1], 'text')
+
+    def test_dump_load(self):
+        array_path = get_status_array_file_path(self.file_path)
+        dump_status_variables(self.file_path, self.variables)
+        self.assertTrue(os.path.isfile(array_path))
+        # Large arrays are not part of the YAML file
+        self.assertLess(os.path.getsize(self.file_path), 1000)
+        self.assertVariablesEqual(load_status_variables(self.file_path))
+        # Array file is removed if no longer needed
+        dump_status_variables(self.file_path, {'scalar': 1, 'small': np.arange(3)})
+        self.assertFalse(os.path.exists(array_path))
+        self.assertEqual(load_status_variables(self.file_path)['scalar'], 1)
+        self.assertEqual(load_status_variables(self.file_path + '.missing'), dict())
+
+    def test_migration(self):
+        # Legacy format with arrays in separate .npy files
+        yaml_dump(self.file_path, self.variables)
+        legacy_files = [name for name in os.listdir(self._tmp_dir.name) if name.endswith('.npy')]
+        self.assertEqual(len(legacy_files), 2)
+        self.assertVariablesEqual(load_status_variables(self.file_path))
+        self.assertEqual(migrate_status_variable_files(self._tmp_dir.name), [self.file_path])
+        self.assertEqual(sorted(os.listdir(self._tmp_dir.name)),
+                         ['status-Dummy_logic_dummy.cfg', 'status-Dummy_logic_dummy.npz'])
+        self.assertVariablesEqual(load_status_variables(self.file_path))
+        # Plain yaml_load can not resolve arrays in .npz files
+        with self.assertRaises(Exception):
+            yaml_load(self.file_path)
+
+    def test_mmap(self):
+        dump_status_variables(self.file_path, self.variables)
+        variables = load_status_variables(self.file_path, mmap=True)
+        self.assertVariablesEqual(variables)
+        self.assertIsInstance(variables['map'], np.memmap)
+        self.assertIsInstance(variables['nested']['images'][0], np.memmap)
+        self.assertNotIsInstance(variables['small'], np.memmap)
+        # Copy-on-write: changes are not written back to file
+        variables['map'][0, 0] = -1
+        self.assertVariablesEqual(load_status_variables(self.file_path))
+        # Memory-mapped arrays can be dumped again
+        dump_status_variables(self.file_path, variables)
+        self.assertEqual(load_status_variables(self.file_path)['map'][0, 0], -1)
+        del variables
+        # Legacy format with arrays in separate .npy files
+        yaml_dump(self.file_path, self.variables)
+        variables = yaml_load(self.file_path, mmap=True)
+        self.assertIsInstance(variables['map'], np.memmap)
+        self.assertVariablesEqual(variables)
+
+    def test_skip_unchanged(self):
+        digest = get_status_variables_digest(self.variables)
+        self.assertFalse(is_status_file_current(self.file_path, digest))
+        self.assertTrue(dump_status_variables(self.file_path, self.variables, digest=digest))
+        self.assertTrue(is_status_file_current(self.file_path, digest))
+        mtime = os.stat(self.file_path).st_mtime_ns
+        self.assertFalse(dump_status_variables(self.file_path, self.variables, digest=digest))
+        self.assertEqual(os.stat(self.file_path).st_mtime_ns, mtime)
+        # Changed values are written
+        self.variables['scalar'] = 43
+        new_digest = get_status_variables_digest(self.variables)
+        self.assertNotEqual(digest, new_digest)
+        self.assertFalse(is_status_file_current(self.file_path, new_digest))
+        self.assertTrue(dump_status_variables(self.file_path, self.variables, digest=new_digest))
+        self.assertEqual(load_status_variables(self.file_path)['scalar'], 43)
+        # Values that can not be pickled are always written
+        self.assertIsNone(get_status_variables_digest({'func': lambda x: x}))
+
+    def test_skip_stale_snapshot(self):
+        self.assertTrue(dump_status_variables(self.file_path, {'value': 2}, snapshot_time=2.0))
+        self.assertFalse(dump_status_variables(self.file_path, {'value': 1}, snapshot_time=1.0))
+        self.assertEqual(load_status_variables(self.file_path), {'value': 2})
+        self.assertTrue(dump_status_variables(self.file_path, {'value': 3}, snapshot_time=3.0))
+        self.assertEqual(load_status_variables(self.file_path), {'value': 3})
+        # No temporary files are left behind
+        self.assertEqual(os.listdir(self._tmp_dir.name), ['status-Dummy_logic_dummy.cfg'])
+
+
+class _DummyInstance:
+    def __init__(self, variables):
+        self.module_status_variables = variables
+
+
+class _DummyManagedModule:
+    def __init__(self, status_file_path, variables, is_active=True, is_remote=False):
+        self.status_file_path = status_file_path
+        self.instance = _DummyInstance(variables)
+        self.is_active = is_active
+        self.is_remote = is_remote
+
+
+class TestStatusVariableAutosave(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.modules = {
+            name: _DummyManagedModule(os.path.join(self._tmp_dir.name, f'status-{name}.cfg'),
+                                      {'value': index, 'array': np.arange(2000) * index},
+                                      is_active=name != 'inactive',
+                                      is_remote=name == 'remote')
+            for index, name in enumerate(['first', 'second', 'inactive', 'remote'])
+        }
+        self.autosave = StatusVariableAutosave(module_manager=self.modules, interval=10)
+
+    def tearDown(self):
+        self.autosave.stop(wait=True)
+        self._tmp_dir.cleanup()
+
+    def test_autosave_changed(self):
+        # Disabled until started
+        self.assertEqual(self.autosave.autosave_now(), dict())
+        self.autosave.start()
+        self.assertTrue(self.autosave.is_running)
+        futures = self.autosave.autosave_now()
+        self.assertEqual(set(futures), {'first', 'second'})
+        self.assertTrue(all(future.result() for future in futures.values()))
+        for name in ['first', 'second']:
+            module = self.modules[name]
+            variables = load_status_variables(module.status_file_path)
+            self.assertEqual(variables['value'], module.instance.module_status_variables['value'])
+        # Nothing changed
+        self.assertEqual(self.autosave.autosave_now(), dict())
+        # Only changed modules are written
+        self.modules['second'].instance.module_status_variables['value'] = 42
+        futures = self.autosave.autosave_now()
+        self.assertEqual(set(futures), {'second'})
+        self.assertTrue(futures['second'].result())
+        variables = load_status_variables(self.modules['second'].status_file_path)
+        self.assertEqual(variables['value'], 42)
+        self.autosave.stop()
+        self.assertFalse(self.autosave.is_running)
+
+    def test_interval(self):
+        self.assertEqual(self.autosave.interval, 10)
+        self.autosave.interval = None
+        self.autosave.start()
+        self.assertFalse(self.autosave.is_running)
+        with self.assertRaises(ValueError):
+            self.autosave.interval = 0
+
+
+if __name__ == '__main__':
+    unittest.main()
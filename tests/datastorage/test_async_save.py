@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+
+"""
+This file contains unit tests for asynchronous saving of qudi data storage classes.
+
+Copyright (c) 2021, the qudi developers. See the AUTHORS.md file at the top-level directory of this
+distribution and on <https://github.com/Ulm-IQO/qudi-core/>
+
+This file is part of qudi.
+
+Qudi is free software: you can redistribute it and/or modify it under the terms of
+the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+
+Qudi is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with qudi.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import queue
+import unittest
+import tempfile
+import threading
+import numpy as np
+import matplotlib.pyplot as plt
+from datetime import datetime
+
+from qudi.util.datastorage import NpyDataStorage, AsyncSaveQueue, QueueFullPolicy, ImageFormat
+from qudi.util.datastorage import DataStorageBase, TextDataStorage
+
+
+class TestAsyncSaveQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.queue = AsyncSaveQueue(max_size=2, policy=QueueFullPolicy.DROP_OLDEST)
+
+    def tearDown(self):
+        self.release.set()
+        self.queue.shutdown(timeout=5)
+
+    def _block(self):
+        self.started.set()
+        self.release.wait(5)
+        return 'done'
+
+    def test_policies(self):
+        blocking = self.queue.submit(self._block)
+        # Wait for the writer thread to pick up the blocking job
+        self.assertTrue(self.started.wait(5))
+        self.assertFalse(self.queue.drain(timeout=0.01))
+        futures = [self.queue.submit(lambda x: x, i) for i in range(3)]
+        self.assertTrue(futures[0].cancelled())
+        self.queue.policy = QueueFullPolicy.RAISE
+        with self.assertRaises(queue.Full):
+            self.queue.submit(lambda: None)
+        self.release.set()
+        self.assertTrue(self.queue.drain(timeout=5))
+        self.assertEqual(blocking.result(), 'done')
+        self.assertEqual([f.result() for f in futures[1:]], [1, 2])
+        stats = self.queue.get_stats()
+        self.assertEqual(stats['completed'], 3)
+        self.assertEqual(stats['dropped'], 1)
+        self.assertEqual(stats['peak_queue_depth'], 2)
+        self.assertEqual(stats['queue_depth'], 0)
+
+    def test_max_size(self):
+        for invalid in (0, -1):
+            with self.assertRaises(ValueError):
+                AsyncSaveQueue(max_size=invalid)
+            with self.assertRaises(ValueError):
+                self.queue.max_size = invalid
+            with self.assertRaises(ValueError):
+                NpyDataStorage.configure_async_save_queue(max_size=invalid)
+        self.assertEqual(self.queue.max_size, 2)
+        self.assertGreaterEqual(NpyDataStorage.get_async_save_queue().max_size, 1)
+        # Growing the queue wakes up blocked submitters
+        self.queue.policy = QueueFullPolicy.BLOCK
+        self.queue.submit(self._block)
+        self.assertTrue(self.started.wait(5))
+        self.queue.submit(lambda **kwargs: None, filename='a.dat')
+        self.queue.submit(lambda **kwargs: None, nametag='b')
+        submitted = threading.Event()
+        thread = threading.Thread(target=lambda: (self.queue.submit(lambda: None),
+                                                  submitted.set()))
+        thread.start()
+        self.assertFalse(submitted.wait(0.05))
+        pending = self.queue.get_pending_jobs()
+        self.assertEqual(len(pending), 3)
+        self.assertIn('_block', pending[0])
+        self.assertIn("filename='a.dat'", pending[1])
+        self.assertIn("nametag='b'", pending[2])
+        self.queue.max_size = 3
+        self.assertTrue(submitted.wait(5))
+        thread.join(5)
+        self.release.set()
+        self.assertTrue(self.queue.drain(timeout=5))
+        self.assertListEqual(self.queue.get_pending_jobs(), [])
+
+    def test_exception(self):
+        future = self.queue.submit(lambda: 1 / 0)
+        with self.assertRaises(ZeroDivisionError):
+            future.result(timeout=5)
+        self.assertEqual(self.queue.get_stats()['failed'], 1)
+
+
+class TestSaveDataAsync(unittest.TestCase):
+
+    def test_save_data_async(self):
+        with tempfile.TemporaryDirectory() as root_dir:
+            storage = NpyDataStorage(root_dir=root_dir, include_global_metadata=False)
+            data = np.arange(10)
+            future = storage.save_data_async(data, filename='async.npy')
+            # Altering the data after submission must not alter the saved data
+            data[:] = 0
+            file_path, _, shape = future.result(timeout=5)
+            self.assertEqual(shape, data.shape)
+            np.testing.assert_array_equal(storage.load_data(file_path)[0], np.arange(10))
+            self.assertTrue(storage.drain_async_save_queue(timeout=5))
+
+    def test_submission_state(self):
+        # Timestamp and global metadata are taken upon submission, not upon execution
+        release = threading.Event()
+        DataStorageBase.add_global_metadata('sample', 'before', overwrite=True)
+        try:
+            with tempfile.TemporaryDirectory() as root_dir:
+                storage = TextDataStorage(root_dir=root_dir)
+                blocker = storage.get_async_save_queue().submit(release.wait, 5)
+                submit_time = datetime.now()
+                future = storage.save_data_async(np.zeros((2, 2)), nametag='async')
+                DataStorageBase.add_global_metadata('sample', 'after', overwrite=True)
+                release.set()
+                self.assertTrue(blocker.result(timeout=5))
+                file_path, timestamp, _ = future.result(timeout=5)
+                self.assertLess(abs((timestamp - submit_time).total_seconds()), 1)
+                _, metadata, _ = storage.load_data(file_path)
+                self.assertEqual(metadata['sample'], 'before')
+                # Global metadata in the writer thread is not affected afterwards
+                future = storage.save_data_async(np.zeros((2, 2)), nametag='async')
+                _, metadata, _ = storage.load_data(future.result(timeout=5)[0])
+                self.assertEqual(metadata['sample'], 'after')
+        finally:
+            release.set()
+            DataStorageBase.remove_global_metadata('sample')
+
+    def test_save_thumbnail_async(self):
+        with tempfile.TemporaryDirectory() as root_dir:
+            storage = NpyDataStorage(root_dir=root_dir, image_format=ImageFormat.PNG)
+            try:
+                fig = plt.figure()
+                fig.add_subplot().plot(np.arange(10))
+                future = storage.save_thumbnail_async(fig,
+                                                      os.path.join(root_dir, 'thumb'),
+                                                      preview_scale=0.25)
+                self.assertFalse(plt.fignum_exists(fig.number))
+                image_path, preview_path = future.result(timeout=60)
+            finally:
+                storage.shutdown_thumbnail_pool()
+            self.assertEqual(image_path, os.path.join(root_dir, 'thumb.png'))
+            self.assertTrue(os.path.isfile(image_path))
+            self.assertLess(os.path.getsize(preview_path), os.path.getsize(image_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
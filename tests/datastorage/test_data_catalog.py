@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+
+"""
+This file contains unit tests for the qudi data catalog.
+
+Copyright (c) 2021, the qudi developers. See the AUTHORS.md file at the top-level directory of this
+distribution and on <https://github.com/Ulm-IQO/qudi-core/>
+
+This file is part of qudi.
+
+Qudi is free software: you can redistribute it and/or modify it under the terms of
+the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+
+Qudi is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with qudi.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import unittest
+import tempfile
+import numpy as np
+from datetime import datetime
+
+from qudi.util.datastorage import DataStorageBase, TextDataStorage, NpyDataStorage
+from qudi.util.datastorage import NpyChunkDataStorage, Hdf5DataStorage, h5py
+from qudi.util.datacatalog import DataCatalog
+
+
+class TestDataCatalog(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.root_dir = self._tmp_dir.name
+        self.catalog = DataCatalog(os.path.join(self.root_dir, 'catalog', 'catalog.sqlite'))
+        self.data_dir = os.path.join(self.root_dir, 'data')
+        DataStorageBase.set_catalog(self.catalog)
+
+    def tearDown(self):
+        DataStorageBase.set_catalog(None)
+        self.catalog.close()
+        self._tmp_dir.cleanup()
+
+    def _save_files(self):
+        text_storage = TextDataStorage(root_dir=self.data_dir, include_global_metadata=False)
+        npy_storage = NpyDataStorage(root_dir=self.data_dir, include_global_metadata=False)
+        text_storage.save_data(np.random.rand(10, 2),
+                               timestamp=datetime(2021, 5, 6, 11, 11, 11),
+                               nametag='odmr',
+                               metadata={'power': 1.5, 'sample': 'A', 'laser': {'wavelength': 532}})
+        npy_storage.save_data(np.zeros((4, 5, 6), dtype=np.int32),
+                              timestamp=datetime(2021, 5, 7, 11, 11, 11),
+                              nametag='confocal scan',
+                              metadata={'power': 3.0, 'sample': 'B'})
+
+    def test_save_and_query(self):
+        self._save_files()
+        results = self.catalog.query()
+        self.assertEqual([r['nametag'] for r in results], ['odmr', 'confocal_scan'])
+        self.assertEqual(results[0]['shape'], (10, 2))
+        self.assertEqual(results[0]['dtype'], 'float;;float')
+        self.assertEqual(results[0]['metadata']['laser.wavelength'], 532)
+        self.assertEqual(results[1]['shape'], (4, 5, 6))
+        self.assertEqual(results[1]['dtype'], 'int32')
+        self.assertEqual(results[1]['storage'], 'NpyDataStorage')
+        self.assertEqual(len(self.catalog.query(nametag='conf%')), 1)
+        self.assertEqual(len(self.catalog.query(metadata={'sample': 'A'})), 1)
+        self.assertEqual(len(self.catalog.query(metadata_range={'power': (1, 2)})), 1)
+        self.assertEqual(len(self.catalog.query(start=datetime(2021, 5, 7))), 1)
+        self.assertEqual(len(self.catalog.query(root_dir=os.path.join(self.root_dir, 'x'))), 0)
+
+    def test_append(self):
+        timestamp = datetime(2021, 5, 6, 11, 11, 11)
+        npy_storage = NpyDataStorage(root_dir=self.data_dir, include_global_metadata=False)
+        file_path, _ = npy_storage.new_file(shape=(3,), timestamp=timestamp, nametag='npy')
+        self.assertEqual(self.catalog.query(nametag='npy')[0]['shape'], (0, 3))
+        npy_storage.append_file(np.zeros((7, 3)), file_path)
+        self.assertEqual(self.catalog.query(nametag='npy')[0]['shape'], (7, 3))
+        chunk_storage = NpyChunkDataStorage(root_dir=self.data_dir, include_global_metadata=False)
+        file_path, _ = chunk_storage.new_file(shape=(2,), timestamp=timestamp, nametag='run')
+        chunk_storage.append_file(np.zeros((5, 2)), file_path)
+        chunk_storage.append_file(np.zeros(2), file_path)
+        self.assertEqual(self.catalog.query(nametag='run')[0]['shape'], (6, 2))
+        text_storage = TextDataStorage(root_dir=self.data_dir, include_global_metadata=False)
+        file_path, _ = text_storage.new_file(timestamp=timestamp,
+                                             nametag='text',
+                                             metadata={'sample': 'A'})
+        self.assertIsNone(self.catalog.query(nametag='text')[0]['shape'])
+        text_storage.append_file(np.zeros((4, 2)), file_path)
+        text_storage.append_file(np.zeros(2), file_path)
+        result = self.catalog.query(nametag='text')[0]
+        self.assertEqual(result['shape'], (5, 2))
+        self.assertEqual(result['metadata'], {'sample': 'A'})
+        with text_storage.new_stream(timestamp=timestamp,
+                                     nametag='stream',
+                                     column_dtypes=(float, float, float)) as writer:
+            self.assertEqual(self.catalog.query(nametag='stream')[0]['shape'], (0, 3))
+            writer.write(np.zeros((10, 3)))
+        self.assertEqual(self.catalog.query(nametag='stream')[0]['shape'], (10, 3))
+        if h5py is not None:
+            hdf5_storage = Hdf5DataStorage(root_dir=self.data_dir, include_global_metadata=False)
+            file_path, _ = hdf5_storage.new_file(shape=(3,), timestamp=timestamp, nametag='h5')
+            hdf5_storage.append_file(np.zeros((4, 3)), file_path)
+            self.assertEqual(self.catalog.query(nametag='h5')[0]['shape'], (4, 3))
+        # Files created while cataloging was disabled are indexed upon append
+        DataStorageBase.set_catalog(None)
+        file_path, _ = npy_storage.new_file(shape=(3,), timestamp=timestamp, nametag='late')
+        DataStorageBase.set_catalog(self.catalog)
+        self.assertEqual(self.catalog.query(nametag='late'), [])
+        npy_storage.append_file(np.zeros((2, 3)), file_path)
+        self.assertEqual(self.catalog.query(nametag='late')[0]['shape'], (2, 3))
+
+    def test_reindex(self):
+        DataStorageBase.set_catalog(None)
+        self._save_files()
+        self.assertEqual(self.catalog.query(), [])
+        self.assertEqual(self.catalog.reindex(self.root_dir), (2, 0))
+        results = self.catalog.query()
+        self.assertEqual([r['nametag'] for r in results], ['odmr', 'confocal_scan'])
+        self.assertEqual(results[0]['shape'], (10, 2))
+        self.assertEqual(results[1]['metadata'], {'power': 3.0, 'sample': 'B'})
+        # Nothing changed
+        self.assertEqual(self.catalog.reindex(self.root_dir), (0, 0))
+        os.remove(results[0]['path'])
+        self.assertEqual(self.catalog.reindex(self.root_dir), (0, 1))
+        self.assertEqual(len(self.catalog.query()), 1)
+        # Compressed text file
+        DataStorageBase.set_catalog(None)
+        TextDataStorage(root_dir=self.data_dir, compression='gzip').save_data(
+            np.random.rand(7, 3),
+            timestamp=datetime(2021, 5, 8, 11, 11, 11),
+            nametag='trace'
+        )
+        self.assertEqual(self.catalog.reindex(self.root_dir), (1, 0))
+        result = self.catalog.query(nametag='trace')[0]
+        self.assertEqual(result['shape'], (7, 3))
+        self.assertEqual(result['storage'], 'TextDataStorage')
+        # Chunked run directory is indexed as a single entry
+        storage = NpyChunkDataStorage(root_dir=self.data_dir)
+        file_path, _ = storage.new_file(shape=(2,), timestamp=datetime(2021, 5, 9), nametag='run')
+        storage.append_file(np.zeros((5, 2)), file_path)
+        storage.append_file(np.zeros((3, 2)), file_path)
+        self.assertEqual(self.catalog.reindex(self.root_dir), (1, 0))
+        result = self.catalog.query(nametag='run')[0]
+        self.assertEqual(result['path'], file_path)
+        self.assertEqual(result['shape'], (8, 2))
+        self.assertEqual(len(self.catalog.query()), 3)
+
+    def test_root_dir_filter(self):
+        # "_" and "%" in root directories must not act as wildcards
+        timestamp = datetime(2021, 5, 6, 11, 11, 11)
+        for dir_name in ('run_1', 'runX1', 'RUN_1', 'run%'):
+            NpyDataStorage(root_dir=os.path.join(self.data_dir, dir_name)).save_data(
+                np.zeros(3), timestamp=timestamp, nametag=dir_name
+            )
+        for dir_name in ('run_1', 'runX1', 'RUN_1', 'run%'):
+            results = self.catalog.query(root_dir=os.path.join(self.data_dir, dir_name))
+            self.assertEqual([r['nametag'] for r in results], [dir_name])
+        # Files that can not be accessed are skipped while reindexing
+        try:
+            os.symlink(os.path.join(self.data_dir, 'missing'),
+                       os.path.join(self.data_dir, 'run_1', 'broken_link'))
+        except (OSError, NotImplementedError):
+            pass
+        os.remove(results[0]['path'])
+        self.assertEqual(self.catalog.reindex(os.path.join(self.data_dir, 'run_1')), (0, 0))
+        self.assertEqual(self.catalog.reindex(os.path.join(self.data_dir, 'run%')), (0, 1))
+        self.assertEqual(len(self.catalog.query()), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
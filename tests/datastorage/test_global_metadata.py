@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+"""
+This file contains unit tests for the global metadata (versioned snapshots and pre-rendered
+header lines) shared by all qudi data storage classes.
+
+Copyright (c) 2021, the qudi developers. See the AUTHORS.md file at the top-level directory of this
+distribution and on <https://github.com/Ulm-IQO/qudi-core/>
+
+This file is part of qudi.
+
+Qudi is free software: you can redistribute it and/or modify it under the terms of
+the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+
+Qudi is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with qudi.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import unittest
+import tempfile
+import numpy as np
+from datetime import datetime
+
+from qudi.util.datastorage import DataStorageBase, TextDataStorage, format_header
+
+
+class TestGlobalMetadata(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.root_dir = self._tmp_dir.name
+        self.timestamp = datetime(2021, 5, 6, 11, 11, 11)
+        DataStorageBase.remove_global_metadata(list(DataStorageBase.get_global_metadata()))
+
+    def tearDown(self):
+        DataStorageBase.remove_global_metadata(list(DataStorageBase.get_global_metadata()))
+        self._tmp_dir.cleanup()
+
+    def _uncached_header(self, storage, metadata):
+        return format_header(self.timestamp,
+                             metadata=storage.get_unified_metadata(metadata),
+                             comments=storage.comments,
+                             delimiter=storage.delimiter)
+
+    def test_versioning(self):
+        version = DataStorageBase.get_global_metadata_version()
+        DataStorageBase.add_global_metadata('a', 1)
+        DataStorageBase.add_global_metadata({'b': [1, 2], 'c': np.arange(3)})
+        self.assertEqual(DataStorageBase.get_global_metadata_version(), version + 2)
+        with self.assertRaises(KeyError):
+            DataStorageBase.add_global_metadata('a', 2)
+        DataStorageBase.remove_global_metadata('not_there')
+        self.assertEqual(DataStorageBase.get_global_metadata_version(), version + 2)
+        # Returned dicts are copies
+        DataStorageBase.get_global_metadata()['d'] = 4
+        self.assertEqual(set(DataStorageBase.get_global_metadata()), {'a', 'b', 'c'})
+        TextDataStorage.remove_global_metadata(['a', 'b'])
+        self.assertEqual(DataStorageBase.get_global_metadata_version(), version + 3)
+        self.assertEqual(list(TextDataStorage.get_global_metadata()), ['c'])
+
+    def test_overwrite_identical(self):
+        DataStorageBase.add_global_metadata({'a': 1, 'b': [1, np.arange(2)], 'c': np.arange(3)})
+        version = DataStorageBase.get_global_metadata_version()
+        DataStorageBase.add_global_metadata({'a': 1, 'c': np.arange(3)}, overwrite=True)
+        self.assertEqual(DataStorageBase.get_global_metadata_version(), version)
+        # Values of different type or that can not be compared are considered changed
+        DataStorageBase.add_global_metadata('a', 1.0, overwrite=True)
+        self.assertEqual(DataStorageBase.get_global_metadata_version(), version + 1)
+        DataStorageBase.add_global_metadata('c', np.arange(3, dtype=float), overwrite=True)
+        self.assertEqual(DataStorageBase.get_global_metadata_version(), version + 2)
+        DataStorageBase.add_global_metadata('b', [1, np.arange(2)], overwrite=True)
+        self.assertEqual(DataStorageBase.get_global_metadata_version(), version + 3)
+        self.assertIsInstance(DataStorageBase.get_global_metadata()['a'], float)
+
+    def test_cached_header(self):
+        storage = TextDataStorage(root_dir=self.root_dir)
+        DataStorageBase.add_global_metadata({'sample': 'xyz', 'Power': 1.5, 'matrix': np.eye(3)})
+        metadata, rendered = storage.get_header_metadata({'local': 42})
+        self.assertEqual(metadata, {'local': 42})
+        # Pre-rendered global metadata lines are reused until the global metadata changes
+        self.assertIs(storage.get_header_metadata()[1], rendered)
+        for local_metadata in (None, {'local': 42, 'array': np.arange(4)}, {'sample': 2}):
+            self.assertEqual(storage.create_header(self.timestamp, metadata=local_metadata),
+                             self._uncached_header(storage, local_metadata))
+        DataStorageBase.add_global_metadata('sample', 'abc', overwrite=True)
+        self.assertIsNot(storage.get_header_metadata()[1], rendered)
+        file_path, _, _ = storage.save_data(np.zeros((2, 2)), metadata={'sample': 'local'})
+        _, metadata, _ = storage.load_data(file_path)
+        self.assertEqual(metadata['sample'], 'local')
+        self.assertEqual(metadata['power'], 1.5)
+        storage.include_global_metadata = False
+        self.assertEqual(storage.create_header(self.timestamp, metadata={'local': 42}),
+                         self._uncached_header(storage, {'local': 42}))
+
+
+if __name__ == '__main__':
+    unittest.main()
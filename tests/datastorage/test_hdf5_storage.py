@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+"""
+This file contains unit tests for the qudi HDF5 data storage class.
+
+Copyright (c) 2021, the qudi developers. See the AUTHORS.md file at the top-level directory of this
+distribution and on <https://github.com/Ulm-IQO/qudi-core/>
+
+This file is part of qudi.
+
+Qudi is free software: you can redistribute it and/or modify it under the terms of
+the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+
+Qudi is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with qudi.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import unittest
+import tempfile
+import numpy as np
+from datetime import datetime
+
+from qudi.util.datastorage import Hdf5DataStorage, h5py
+
+
+@unittest.skipIf(h5py is None, 'h5py package not installed')
+class TestHdf5DataStorage(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.root_dir = self._tmp_dir.name
+        self.timestamp = datetime(2021, 5, 6, 11, 11, 11)
+        self.metadata = {'sample_number': 42, 'batch': 'xyz-123', 'position': (1.5, -2.)}
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def test_save_load(self):
+        storage = Hdf5DataStorage(root_dir=self.root_dir,
+                                  compression='gzip',
+                                  include_global_metadata=False)
+        data = np.random.rand(20, 16, 8)
+        file_path, timestamp, shape = storage.save_data(data,
+                                                        timestamp=self.timestamp,
+                                                        metadata=self.metadata,
+                                                        notes='some notes',
+                                                        column_headers=('x', 'y'),
+                                                        nametag='scan')
+        self.assertTrue(file_path.endswith('20210506-1111-11_scan.h5'))
+        self.assertEqual(shape, data.shape)
+        loaded, metadata, general = storage.load_data(file_path)
+        np.testing.assert_array_equal(loaded, data)
+        self.assertDictEqual(metadata, self.metadata)
+        self.assertEqual(general['timestamp'], self.timestamp)
+        self.assertEqual(general['notes'], 'some notes')
+        self.assertEqual(general['column_headers'], ('x', 'y'))
+        # Partial read
+        loaded, _, general = storage.load_data(file_path, index=np.s_[5:7, :, 3])
+        np.testing.assert_array_equal(loaded, data[5:7, :, 3])
+        self.assertEqual(general['shape'], data.shape)
+
+    def test_append(self):
+        storage = Hdf5DataStorage(root_dir=self.root_dir, include_global_metadata=False)
+        file_path, _ = storage.new_file(dtype=np.int32, shape=(4,), filename='trace.h5')
+        data = np.arange(40, dtype=np.int32).reshape(10, 4)
+        for row in data[:5]:
+            storage.append_file(row, file_path)
+        self.assertEqual(storage.append_file(data[5:], file_path), data.shape)
+        loaded, _, _ = storage.load_data(file_path)
+        np.testing.assert_array_equal(loaded, data)
+        with self.assertRaises(ValueError):
+            storage.append_file(np.zeros((2, 3)), file_path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+"""
+This file contains unit tests for the qudi chunked numpy binary data storage class and the
+ChunkedArrayView used to lazily load its run directories.
+
+Copyright (c) 2021, the qudi developers. See the AUTHORS.md file at the top-level directory of this
+distribution and on <https://github.com/Ulm-IQO/qudi-core/>
+
+This file is part of qudi.
+
+Qudi is free software: you can redistribute it and/or modify it under the terms of
+the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+
+Qudi is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with qudi.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import unittest
+import tempfile
+import numpy as np
+from datetime import datetime
+
+from qudi.util.datastorage import NpyChunkDataStorage, ChunkedArrayView
+
+
+class TestNpyChunkDataStorage(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.root_dir = self._tmp_dir.name
+        self.timestamp = datetime(2021, 5, 6, 11, 11, 11)
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def test_save_load(self):
+        storage = NpyChunkDataStorage(root_dir=self.root_dir, include_global_metadata=False)
+        data = np.random.rand(10, 3)
+        metadata = {'sample_number': 42, 'batch': 'xyz-123'}
+        file_path, _, shape = storage.save_data(data,
+                                                timestamp=self.timestamp,
+                                                metadata=metadata,
+                                                nametag='trace',
+                                                notes='some notes')
+        self.assertEqual(shape, data.shape)
+        self.assertTrue(os.path.isdir(file_path))
+        self.assertTrue(file_path.endswith('_trace.chunks'))
+        loaded, loaded_metadata, general = storage.load_data(file_path)
+        self.assertIsInstance(loaded, ChunkedArrayView)
+        self.assertEqual(loaded.shape, data.shape)
+        np.testing.assert_array_equal(loaded, data)
+        self.assertDictEqual(loaded_metadata, metadata)
+        self.assertEqual(general['timestamp'], self.timestamp)
+        self.assertEqual(general['notes'], 'some notes')
+        loaded, _, _ = storage.load_data(file_path, lazy=False)
+        self.assertIsInstance(loaded, np.ndarray)
+        np.testing.assert_array_equal(loaded, data)
+
+    def test_append_and_view(self):
+        storage = NpyChunkDataStorage(root_dir=self.root_dir, include_global_metadata=False)
+        dtype = np.dtype([('a', np.int32, (2,)), ('b', [('c', float), ('d', 'U3')])])
+        data = np.zeros(50, dtype=dtype)
+        data['a'] = np.arange(100).reshape(50, 2)
+        data['b']['c'] = np.linspace(0, 1, 50)
+        file_path, _ = storage.new_file(dtype=dtype, filename='run.chunks')
+        view, _, _ = storage.load_data(file_path)
+        self.assertEqual(view.shape, (0,))
+        self.assertEqual(np.asarray(view).dtype, dtype)
+        storage.append_file(data[0], file_path)
+        self.assertEqual(storage.append_file(data[1:20], file_path), (20,))
+        self.assertEqual(storage.append_file(data[20:20], file_path), (20,))
+        # Follow the run while it is being written
+        self.assertEqual(view.refresh(), (20,))
+        storage.append_file(data[20:35], file_path)
+        storage.append_file(data[35:], file_path)
+        self.assertEqual(view.refresh(), data.shape)
+        self.assertEqual(view.number_of_chunks, 4)
+        np.testing.assert_array_equal(view, data)
+        self.assertEqual(list(view), list(data))
+        # Slices within a single chunk are memory-mapped views
+        self.assertIsInstance(view[21:30:2], np.memmap)
+        for index in (7, -1, -50, slice(None), slice(3, 40, 3), slice(None, None, -4),
+                      slice(45, 5, -7), slice(30, 10), 'a', np.array([3, 21]),
+                      Ellipsis):
+            np.testing.assert_array_equal(view[index], data[index])
+        with self.assertRaises(IndexError):
+            view[50]
+        with self.assertRaises(ValueError):
+            storage.append_file(np.zeros((2, 3)), file_path)
+        # Overwriting a run removes the old chunks
+        storage.save_data(data[:5], filename='run.chunks')
+        self.assertEqual(len(os.listdir(file_path)), 3)
+        np.testing.assert_array_equal(storage.load_data(file_path, lazy=False)[0], data[:5])
+
+
+if __name__ == '__main__':
+    unittest.main()
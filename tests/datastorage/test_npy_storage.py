@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+"""
+This file contains unit tests for the qudi numpy binary data storage class.
+
+Copyright (c) 2021, the qudi developers. See the AUTHORS.md file at the top-level directory of this
+distribution and on <https://github.com/Ulm-IQO/qudi-core/>
+
+This file is part of qudi.
+
+Qudi is free software: you can redistribute it and/or modify it under the terms of
+the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+
+Qudi is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with qudi.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import unittest
+import tempfile
+import numpy as np
+from datetime import datetime
+
+from qudi.util.datastorage import NpyDataStorage
+
+
+class TestNpyDataStorage(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.root_dir = self._tmp_dir.name
+        self.timestamp = datetime(2021, 5, 6, 11, 11, 11)
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def test_save_load(self):
+        storage = NpyDataStorage(root_dir=self.root_dir, include_global_metadata=False)
+        data = np.random.rand(10, 3)
+        metadata = {'sample_number': 42, 'batch': 'xyz-123'}
+        file_path, _, shape = storage.save_data(data,
+                                                timestamp=self.timestamp,
+                                                metadata=metadata,
+                                                notes='some notes')
+        self.assertEqual(shape, data.shape)
+        for mmap in (False, True):
+            loaded, loaded_metadata, general = storage.load_data(file_path, mmap=mmap)
+            self.assertEqual(isinstance(loaded, np.memmap), mmap)
+            np.testing.assert_array_equal(loaded, data)
+            self.assertDictEqual(loaded_metadata, metadata)
+            self.assertEqual(general['timestamp'], self.timestamp)
+            self.assertEqual(general['notes'], 'some notes')
+            del loaded
+
+    def test_append(self):
+        storage = NpyDataStorage(root_dir=self.root_dir, include_global_metadata=False)
+        file_path, _ = storage.new_file(dtype=np.int16, shape=(2, 3), filename='trace.npy')
+        header_size = os.path.getsize(file_path)
+        data = np.arange(1200, dtype=np.int16).reshape(200, 2, 3)
+        storage.append_file(data[0], file_path)
+        self.assertEqual(storage.append_file(data[1:150], file_path), (150, 2, 3))
+        self.assertEqual(storage.append_file(data[150:], file_path), data.shape)
+        self.assertEqual(os.path.getsize(file_path), header_size + data.nbytes)
+        np.testing.assert_array_equal(np.load(file_path), data)
+        loaded, _, _ = storage.load_data(file_path, mmap=True)
+        np.testing.assert_array_equal(loaded, data)
+        del loaded
+        with self.assertRaises(ValueError):
+            storage.append_file(np.zeros((2, 3, 2)), file_path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+
+"""
+This file contains unit tests for the qudi text file data storage classes.
+
+Copyright (c) 2021, the qudi developers. See the AUTHORS.md file at the top-level directory of this
+distribution and on <https://github.com/Ulm-IQO/qudi-core/>
+
+This file is part of qudi.
+
+Qudi is free software: you can redistribute it and/or modify it under the terms of
+the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+
+Qudi is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with qudi.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import gzip
+import unittest
+import tempfile
+import numpy as np
+from datetime import datetime
+
+from qudi.util.datastorage import TextDataStorage, CsvDataStorage, TextDataStreamWriter
+from qudi.util.datastorage import get_header_from_file
+
+
+class TestTextDataStorage(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.root_dir = self._tmp_dir.name
+        self.timestamp = datetime(2021, 5, 6, 11, 11, 11)
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def _append_both_ways(self, storage, data, **kwargs):
+        contents = list()
+        for bulk in (False, True):
+            file_path, _ = storage.new_file(timestamp=self.timestamp,
+                                            filename=f'bulk_{bulk}.dat',
+                                            **kwargs)
+            storage.append_file(data, file_path, bulk=bulk)
+            with open(file_path, 'rb') as file:
+                contents.append(file.read())
+        return contents
+
+    def test_bulk_append_float(self):
+        storage = TextDataStorage(root_dir=self.root_dir, include_global_metadata=False)
+        storage._bulk_block_rows = 7
+        data = np.random.rand(50, 3)
+        data[3, 1] = np.nan
+        data[4, 2] = -np.inf
+        row_wise, bulk = self._append_both_ways(storage, data)
+        self.assertEqual(row_wise, bulk)
+
+    def test_bulk_append_mixed_formats(self):
+        storage = TextDataStorage(root_dir=self.root_dir,
+                                  include_global_metadata=False,
+                                  column_formats=('d', '.3f', '.4e', '>8s'))
+        data = np.zeros(23, dtype=[('a', np.int32), ('b', np.float32), ('c', complex), ('d', 'U5')])
+        data['a'] = np.arange(23) - 11
+        data['b'] = np.linspace(-1, 1, 23)
+        data['c'] = np.linspace(0, 1, 23) * (1 - 2j)
+        data['d'] = [f'x{i:d}' for i in range(23)]
+        row_wise, bulk = self._append_both_ways(storage, data)
+        self.assertEqual(row_wise, bulk)
+        # Nested Python lists
+        row_wise, bulk = self._append_both_ways(storage, data.tolist())
+        self.assertEqual(row_wise, bulk)
+
+    def test_bulk_append_csv(self):
+        storage = CsvDataStorage(root_dir=self.root_dir, include_global_metadata=False)
+        data = np.arange(30).reshape(10, 3)
+        row_wise, bulk = self._append_both_ways(storage, data, column_headers=('a', 'b', 'c'))
+        self.assertEqual(row_wise, bulk)
+        file_path, _, (rows, columns) = storage.save_data(data,
+                                                          timestamp=self.timestamp,
+                                                          column_headers=('a', 'b', 'c'))
+        self.assertEqual((rows, columns), data.shape)
+        loaded, _, general = storage.load_data(file_path)
+        self.assertEqual(general['column_headers'], ('a', 'b', 'c'))
+        np.testing.assert_array_equal(loaded, data)
+        chunks = list(storage.iter_data(file_path, chunk_rows=3))
+        self.assertEqual(len(chunks), 4)
+        np.testing.assert_array_equal(np.concatenate(chunks), data)
+
+    def test_load(self):
+        storage = TextDataStorage(root_dir=self.root_dir, include_global_metadata=False)
+        metadata = {'sample_number': 42, 'batch': 'xyz-123'}
+        data = np.random.rand(25, 3)
+        file_path, _, _ = storage.save_data(data,
+                                            timestamp=self.timestamp,
+                                            metadata=metadata,
+                                            notes='some notes')
+        loaded, loaded_metadata, general = storage.load_data(file_path)
+        np.testing.assert_allclose(loaded, data, rtol=1e-14)
+        self.assertDictEqual(loaded_metadata, metadata)
+        self.assertEqual(general['timestamp'], self.timestamp)
+        self.assertEqual(general['column_dtypes'], (float, float, float))
+        chunks = list(storage.iter_data(file_path, chunk_rows=10))
+        self.assertEqual([len(chunk) for chunk in chunks], [10, 10, 5])
+        np.testing.assert_array_equal(np.concatenate(chunks), loaded)
+        # Single row and mixed column dtypes
+        file_path, _, _ = storage.save_data(data[0], column_dtypes=float, filename='row.dat')
+        self.assertEqual(storage.load_data(file_path)[0].shape, (3,))
+        mixed = np.zeros(5, dtype=[('f0', int), ('f1', float)])
+        mixed['f0'] = np.arange(5)
+        mixed['f1'] = np.linspace(0, 1, 5)
+        file_path, _, _ = storage.save_data(mixed, filename='mixed.dat')
+        loaded = storage.load_data(file_path)[0]
+        self.assertEqual(loaded.dtype, mixed.dtype)
+        np.testing.assert_array_equal(loaded['f0'], mixed['f0'])
+        np.testing.assert_allclose(loaded['f1'], mixed['f1'], rtol=1e-14)
+        np.testing.assert_array_equal(np.concatenate(list(storage.iter_data(file_path, 2))), loaded)
+
+    def test_load_without_column_dtypes(self):
+        storage = TextDataStorage(root_dir=self.root_dir, include_global_metadata=False)
+        # Integer data must not be converted to float
+        file_path, _ = storage.new_file(timestamp=self.timestamp, filename='int.dat')
+        storage.append_file(np.arange(6).reshape(3, 2), file_path)
+        loaded = storage.load_data(file_path)[0]
+        self.assertTrue(np.issubdtype(loaded.dtype, np.integer))
+        np.testing.assert_array_equal(loaded, np.arange(6).reshape(3, 2))
+        chunks = list(storage.iter_data(file_path, chunk_rows=2))
+        self.assertEqual([chunk.shape for chunk in chunks], [(2, 2), (1, 2)])
+        np.testing.assert_array_equal(np.concatenate(chunks), loaded)
+        # String columns are loaded as structured array
+        file_path, _ = storage.new_file(timestamp=self.timestamp, filename='str.dat')
+        storage.append_file([[1, 'abc'], [2, 'de']], file_path)
+        loaded = storage.load_data(file_path)[0]
+        np.testing.assert_array_equal(loaded['f0'], [1, 2])
+        np.testing.assert_array_equal(loaded['f1'], ['abc', 'de'])
+        chunks = list(storage.iter_data(file_path, chunk_rows=1))
+        self.assertEqual([chunk.shape for chunk in chunks], [(1,), (1,)])
+        np.testing.assert_array_equal(np.concatenate(chunks), loaded)
+
+    def test_stream_writer(self):
+        storage = TextDataStorage(root_dir=self.root_dir, include_global_metadata=False)
+        data = np.random.rand(40, 2)
+        file_path, _ = storage.new_file(timestamp=self.timestamp, filename='append.dat')
+        storage.append_file(data, file_path)
+        with storage.new_stream(timestamp=self.timestamp,
+                                filename='stream.dat',
+                                flush_rows=10,
+                                flush_interval=None) as writer:
+            with open(writer.file_path, 'r') as file:
+                header_lines = len(file.read().splitlines())
+            for row in data[:25]:
+                writer.write(row)
+            # 20 rows flushed, 5 rows still buffered
+            with open(writer.file_path, 'r') as file:
+                self.assertEqual(len(file.read().splitlines()), header_lines + 20)
+            self.assertEqual(writer.rows_written, 25)
+            writer.write(data[25:])
+        self.assertTrue(writer.closed)
+        with open(file_path, 'rb') as file:
+            expected = file.read()
+        with open(writer.file_path, 'rb') as file:
+            self.assertEqual(file.read(), expected)
+        with self.assertRaises(ValueError):
+            writer.write(data[0])
+
+    def test_compression(self):
+        data = np.random.rand(30, 3)
+        plain = TextDataStorage(root_dir=self.root_dir, include_global_metadata=False)
+        plain_path, _, _ = plain.save_data(data, timestamp=self.timestamp, metadata={'a': 1})
+        with open(plain_path, 'r') as file:
+            expected = file.read()
+        for compression, suffix in (('gzip', '.gz'), ('bz2', '.bz2'), ('lzma', '.xz')):
+            storage = TextDataStorage(root_dir=self.root_dir,
+                                      include_global_metadata=False,
+                                      compression=compression)
+            storage._bulk_block_rows = 7
+            file_path, _ = storage.new_file(timestamp=self.timestamp,
+                                            metadata={'a': 1},
+                                            column_dtypes=(float, float, float))
+            self.assertTrue(file_path.endswith('.dat' + suffix))
+            self.assertEqual(get_header_from_file(file_path), get_header_from_file(plain_path))
+            storage.append_file(data[:20], file_path)
+            for row in data[20:25]:
+                storage.append_file(row, file_path)
+            with storage.new_stream(filename='stream.dat' + suffix,
+                                    timestamp=self.timestamp,
+                                    metadata={'a': 1},
+                                    column_dtypes=(float, float, float),
+                                    flush_rows=4) as writer:
+                for row in data[:25]:
+                    writer.write(row)
+            for path in (file_path, writer.file_path):
+                loaded, metadata, _ = storage.load_data(path)
+                np.testing.assert_array_equal(loaded, plain.load_data(plain_path)[0][:25])
+                self.assertDictEqual(metadata, {'a': 1})
+                chunks = list(storage.iter_data(path, chunk_rows=10))
+                self.assertEqual([len(chunk) for chunk in chunks], [10, 10, 5])
+            storage.append_file(data[25:], file_path)
+            if compression == 'gzip':
+                with gzip.open(file_path, 'rt') as file:
+                    self.assertEqual(file.read(), expected)
+        # The compression of the appended file is used regardless of the storage configuration
+        gzip_storage = TextDataStorage(root_dir=self.root_dir,
+                                       include_global_metadata=False,
+                                       compression='gzip')
+        expected = plain.load_data(plain_path)[0]
+        for creator, appender in ((gzip_storage, plain), (plain, gzip_storage)):
+            file_path, _ = creator.new_file(timestamp=self.timestamp,
+                                            filename=f'mixed_{creator.compression}.dat',
+                                            column_dtypes=(float, float, float))
+            appender.append_file(data[:10], file_path)
+            with TextDataStreamWriter(appender, file_path, self.timestamp) as writer:
+                writer.write(data[10:])
+            np.testing.assert_array_equal(appender.load_data(file_path)[0], expected)
+        with self.assertRaises(ValueError):
+            TextDataStorage(root_dir=self.root_dir, compression='zip')
+        csv = CsvDataStorage(root_dir=self.root_dir, compression='gzip')
+        file_path, _, _ = csv.save_data(data, column_headers=('x', 'y', 'z'))
+        self.assertTrue(file_path.endswith('.csv.gz'))
+        loaded, _, general = csv.load_data(file_path)
+        self.assertEqual(general['column_headers'], ('x', 'y', 'z'))
+        np.testing.assert_array_equal(loaded, plain.load_data(plain_path)[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+
+"""
+This file contains unit tests for the qudi config editor module finder.
+
+Copyright (c) 2021, the qudi developers. See the AUTHORS.md file at the top-level directory of this
+distribution and on <https://github.com/Ulm-IQO/qudi-core/>
+
+This file is part of qudi.
+
+Qudi is free software: you can redistribute it and/or modify it under the terms of
+the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+
+Qudi is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with qudi.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import time
+import unittest
+import tempfile
+import textwrap
+
+import qudi
+from qudi.core.configoption import MissingOption
+from qudi.tools.config_editor.module_finder import StaticModuleFinder, ModuleFinder
+from qudi.tools.config_editor.module_finder import QudiModuleInfo
+
+
+_sources = {
+    'interface/dummy_interface.py': """
+        from abc import abstractmethod
+        from qudi.core.module import Base
+
+        class DummyInterface(Base):
+            @property
+            @abstractmethod
+            def value(self):
+                pass
+
+            @value.setter
+            def value(self, val):
+                pass
+    """,
+    'hardware/dummy_hardware.py': """
+        from qudi.core import ConfigOption
+        from qudi.interface.dummy_interface import DummyInterface
+
+        class PartialHardware(DummyInterface):
+            _rate = ConfigOption('rate', 2**10, missing='warn')
+
+        class DummyHardware(PartialHardware):
+            _channels = ConfigOption(name='channels', default=['a', 'b'], missing='error')
+
+            def on_activate(self):
+                pass
+
+            def on_deactivate(self):
+                pass
+
+            @property
+            def value(self):
+                return 42
+    """,
+    'logic/dummy/logic.py': """
+        import qudi.core.connector as connector
+        from qudi.core.module import LogicBase
+        from qudi.core.configoption import ConfigOption
+        from qudi.interface.dummy_interface import DummyInterface
+        from .helper import Helper
+
+        class DummyLogic(LogicBase):
+            _hardware = connector.Connector(interface=DummyInterface, name='hardware')
+            _other = connector.Connector('OtherInterface', optional=True)
+            _options = ConfigOption(default=dict(a=[1, 2], b=-1.5e-3))
+            __private = ConfigOption(default=None)
+
+            def on_activate(self):
+                pass
+
+            def on_deactivate(self):
+                pass
+
+        class NoModule(Helper):
+            pass
+    """,
+    'logic/dummy/helper.py': """
+        class Helper:
+            pass
+    """,
+    'logic/ambiguous_logic.py': """
+        import numpy as np
+        from qudi.core.module import LogicBase
+        from qudi.core.configoption import ConfigOption
+
+        class AmbiguousLogic(LogicBase):
+            _array = ConfigOption(default=np.zeros(3))
+
+            def on_activate(self):
+                pass
+
+            def on_deactivate(self):
+                pass
+    """
+}
+
+
+class TestStaticModuleFinder(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self._tmp_dir.name, 'qudi')
+        for path, source in _sources.items():
+            self._write(path, source)
+        self.cache_path = os.path.join(self._tmp_dir.name, 'cache.pickle')
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def _write(self, path, source):
+        path = os.path.join(self.root, *path.split('/'))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as file:
+            file.write(textwrap.dedent(source))
+
+    def _finder(self):
+        return StaticModuleFinder(search_paths=[self.root, *qudi.__path__],
+                                  cache_path=self.cache_path)
+
+    def test_static_analysis(self):
+        with self.assertLogs('qudi.tools.config_editor', level='WARNING'):
+            modules = self._finder().get_qudi_modules()
+        self.assertIn('qudi.hardware.dummy_hardware.DummyHardware', modules)
+        self.assertIn('qudi.logic.dummy.logic.DummyLogic', modules)
+        # Abstract classes, non-module classes and modules that can not be imported are ignored
+        self.assertNotIn('qudi.hardware.dummy_hardware.PartialHardware', modules)
+        self.assertNotIn('qudi.logic.dummy.logic.NoModule', modules)
+        self.assertNotIn('qudi.logic.ambiguous_logic.AmbiguousLogic', modules)
+
+        hardware = modules['qudi.hardware.dummy_hardware.DummyHardware']
+        self.assertTrue({'DummyHardware', 'DummyInterface', 'Base'}.issubset(hardware.base_names))
+        self.assertEqual(hardware.connectors, list())
+        options = {opt.name: opt for opt in hardware.config_options}
+        self.assertEqual(options['rate'].default, 1024)
+        self.assertEqual(options['rate'].missing, MissingOption.warn)
+        self.assertEqual(options['channels'].default, ['a', 'b'])
+        self.assertFalse(options['channels'].optional)
+
+        logic = modules['qudi.logic.dummy.logic.DummyLogic']
+        connectors = {conn.name: conn for conn in logic.connectors}
+        self.assertEqual(set(connectors), {'hardware', '_other'})
+        self.assertEqual(connectors['hardware'].interface, 'DummyInterface')
+        self.assertFalse(connectors['hardware'].optional)
+        self.assertEqual(connectors['_other'].interface, 'OtherInterface')
+        self.assertTrue(connectors['_other'].optional)
+        options = {opt.name: opt.default for opt in logic.config_options}
+        self.assertEqual(options, {'_options': {'a': [1, 2], 'b': -1.5e-3},
+                                   '_DummyLogic__private': None})
+
+    def test_cache(self):
+        with self.assertLogs('qudi.tools.config_editor', level='WARNING'):
+            self._finder().get_qudi_modules()
+        self.assertTrue(os.path.isfile(self.cache_path))
+        self._write('hardware/dummy_hardware.py',
+                    _sources['hardware/dummy_hardware.py'].replace("2**10", "2**11"))
+        mtime = time.time() + 10
+        os.utime(os.path.join(self.root, 'hardware', 'dummy_hardware.py'), (mtime, mtime))
+        with self.assertLogs('qudi.tools.config_editor', level='WARNING'):
+            modules = self._finder().get_qudi_modules()
+        hardware = modules['qudi.hardware.dummy_hardware.DummyHardware']
+        options = {opt.name: opt.default for opt in hardware.config_options}
+        self.assertEqual(options['rate'], 2048)
+
+    def test_cyclic_reexport(self):
+        self._write('logic/cyc/a.py', """
+            from qudi.logic.cyc.b import Foo
+
+            class CyclicLogic(Foo):
+                pass
+        """)
+        self._write('logic/cyc/b.py', """
+            from qudi.logic.cyc.a import Foo
+        """)
+        with self.assertLogs('qudi.tools.config_editor', level='WARNING'):
+            modules = self._finder().get_qudi_modules()
+        self.assertNotIn('qudi.logic.cyc.a.CyclicLogic', modules)
+        self.assertIn('qudi.logic.dummy.logic.DummyLogic', modules)
+
+    def test_import_equivalence(self):
+        # Compare with import based module discovery for the modules shipped with qudi-core
+        static_modules = StaticModuleFinder(cache_path='').get_qudi_modules()
+        imported_modules = ModuleFinder.get_qudi_modules()
+        self.assertEqual(set(static_modules), set(imported_modules))
+        for name, cls in imported_modules.items():
+            expected = QudiModuleInfo.from_class(cls)
+            info = static_modules[name]
+            self.assertEqual(
+                [(conn.name, conn.interface, conn.optional) for conn in info.connectors],
+                [(conn.name, conn.interface, conn.optional) for conn in expected.connectors]
+            )
+            self.assertEqual(
+                [(opt.name, opt.default, opt.missing) for opt in info.config_options],
+                [(opt.name, opt.default, opt.missing) for opt in expected.config_options]
+            )
+            self.assertTrue(
+                {cls.__name__ for cls in cls.mro()}.issuperset(info.base_names - {'object'})
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
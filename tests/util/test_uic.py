@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+"""
+This file contains unit tests for the qudi .ui file loader cache.
+
+Copyright (c) 2021, the qudi developers. See the AUTHORS.md file at the top-level directory of this
+distribution and on <https://github.com/Ulm-IQO/qudi-core/>
+
+This file is part of qudi.
+
+Qudi is free software: you can redistribute it and/or modify it under the terms of
+the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+
+Qudi is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with qudi.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import unittest
+import tempfile
+import subprocess
+from unittest import mock
+from PySide2 import QtWidgets
+
+import qudi.util.uic as uic
+
+
+_ui_content = """<?xml version="1.0" encoding="UTF-8"?>
+<ui version="4.0">
+ <class>Form</class>
+ <widget class="QWidget" name="Form">
+  <layout class="QVBoxLayout" name="layout">
+   <item>
+    <widget class="QPushButton" name="push_button">
+     <property name="text">
+      <string>{text}</string>
+     </property>
+    </widget>
+   </item>
+  </layout>
+ </widget>
+</ui>
+"""
+
+
+class TestUiCache(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self._tmp_dir.name, 'cache')
+        self.ui_dir = os.path.join(self._tmp_dir.name, 'ui')
+        os.makedirs(self.ui_dir)
+        self.ui_path = os.path.join(self.ui_dir, 'form.ui')
+        self._write_ui('Hello')
+        self._cache_dir_patch = mock.patch.object(uic, 'get_ui_cache_dir',
+                                                  return_value=self.cache_dir)
+        self._cache_dir_patch.start()
+
+    def tearDown(self):
+        self._cache_dir_patch.stop()
+        self._tmp_dir.cleanup()
+
+    def _write_ui(self, text):
+        with open(self.ui_path, 'w') as file:
+            file.write(_ui_content.format(text=text))
+
+    def test_cache(self):
+        code = uic.compile_ui(self.ui_path)
+        self.assertIn('class Ui_Form', code)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+        # Cache hits do not run pyside2-uic
+        with mock.patch.object(subprocess, 'run', side_effect=AssertionError('uic called')):
+            self.assertEqual(uic.compile_ui(self.ui_path), code)
+            with self.assertRaises(AssertionError):
+                uic.compile_ui(self.ui_path, use_cache=False)
+        # Changed content is compiled again
+        self._write_ui('World')
+        self.assertIn('World', uic.compile_ui(self.ui_path))
+        self.assertEqual(len(os.listdir(self.cache_dir)), 2)
+        uic.clear_ui_cache()
+        self.assertEqual(os.listdir(self.cache_dir), list())
+
+    def test_build_cache(self):
+        self.assertEqual(uic.build_ui_cache([self._tmp_dir.name]), [self.ui_path])
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+
+    def test_load_ui(self):
+        app = QtWidgets.QApplication.instance()
+        if app is None:
+            app = QtWidgets.QApplication([])
+        widget = QtWidgets.QWidget()
+        uic.loadUi(self.ui_path, widget)
+        self.assertEqual(widget.push_button.text(), 'Hello')
+        widget.deleteLater()
+
+
+if __name__ == '__main__':
+    unittest.main()
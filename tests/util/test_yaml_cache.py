@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+"""
+This file contains unit tests for the qudi YAML load cache.
+
+Copyright (c) 2021, the qudi developers. See the AUTHORS.md file at the top-level directory of this
+distribution and on <https://github.com/Ulm-IQO/qudi-core/>
+
+This file is part of qudi.
+
+Qudi is free software: you can redistribute it and/or modify it under the terms of
+the GNU Lesser General Public License as published by the Free Software Foundation,
+either version 3 of the License, or (at your option) any later version.
+
+Qudi is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with qudi.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import time
+import unittest
+import tempfile
+import numpy as np
+
+import qudi.util.yaml as qudi_yaml
+from qudi.util.yaml import YamlLoadCache, yaml_load, yaml_dump
+
+
+class TestYamlLoadCache(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self._tmp_dir.name, 'cache')
+        self.file_path = os.path.join(self._tmp_dir.name, 'test.cfg')
+        self.data = {'global': {'startup_modules': ['a', 'b'], 'port': 12345},
+                     'logic': {f'module_{ii}': {'module.Class': 'dummy.Dummy',
+                                                'options': {'value': ii, 'array': np.arange(5)}}
+                               for ii in range(10)}}
+        self._default_cache = qudi_yaml.yaml_load_cache
+        qudi_yaml.yaml_load_cache = YamlLoadCache(cache_dir=self.cache_dir)
+
+    def tearDown(self):
+        qudi_yaml.yaml_load_cache = self._default_cache
+        self._tmp_dir.cleanup()
+
+    def _dump(self, data):
+        yaml_dump(self.file_path, data)
+        # Set modification time into the past to not be considered racy
+        mtime = time.time() - 10
+        os.utime(self.file_path, (mtime, mtime))
+
+    def assertDataEqual(self, data, expected):
+        self.assertEqual(set(data), set(expected))
+        self.assertEqual(data['global'], expected['global'])
+        for name, cfg in expected['logic'].items():
+            self.assertEqual(data['logic'][name]['options']['value'], cfg['options']['value'])
+            np.testing.assert_array_equal(data['logic'][name]['options']['array'],
+                                          cfg['options']['array'])
+
+    def test_cache_hit(self):
+        cache = qudi_yaml.yaml_load_cache
+        self._dump(self.data)
+        self.assertDataEqual(yaml_load(self.file_path, cache=True), self.data)
+        self.assertEqual(cache.statistics['misses'], 1)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+        data = yaml_load(self.file_path, cache=True)
+        self.assertDataEqual(data, self.data)
+        self.assertEqual(cache.statistics['hits'], 1)
+        # Hits return copies
+        data['global']['startup_modules'].append('c')
+        data['logic']['module_0']['options']['array'][0] = 42
+        self.assertDataEqual(yaml_load(self.file_path, cache=True), self.data)
+        self.assertEqual(cache.statistics['hits'], 2)
+        # Cache is persisted on disk
+        qudi_yaml.yaml_load_cache = YamlLoadCache(cache_dir=self.cache_dir)
+        self.assertDataEqual(yaml_load(self.file_path, cache=True), self.data)
+        self.assertEqual(qudi_yaml.yaml_load_cache.statistics['hits'], 1)
+        # Not used by default
+        yaml_load(self.file_path)
+        self.assertEqual(qudi_yaml.yaml_load_cache.statistics['hits'], 1)
+        qudi_yaml.yaml_load_cache.clear()
+        self.assertEqual(os.listdir(self.cache_dir), list())
+
+    def test_invalidation(self):
+        cache = qudi_yaml.yaml_load_cache
+        self._dump(self.data)
+        yaml_load(self.file_path, cache=True)
+        self.data['global']['port'] = 54321
+        self._dump(self.data)
+        self.assertDataEqual(yaml_load(self.file_path, cache=True), self.data)
+        self.assertEqual(cache.statistics['misses'], 2)
+        # Recently modified files are not cached
+        yaml_dump(self.file_path, self.data)
+        yaml_load(self.file_path, cache=True)
+        yaml_load(self.file_path, cache=True)
+        self.assertEqual(cache.statistics['misses'], 4)
+        self.assertEqual(cache.statistics['hits'], 0)
+
+    def test_external_arrays(self):
+        cache = qudi_yaml.yaml_load_cache
+        array_path = os.path.join(self._tmp_dir.name, 'test.npz')
+        data = {'large': np.arange(1000)}
+        yaml_dump(self.file_path, data, array_file_path=array_path)
+        mtime = time.time() - 10
+        os.utime(self.file_path, (mtime, mtime))
+        for _ in range(2):
+            loaded = yaml_load(self.file_path, cache=True, array_file_path=array_path)
+            np.testing.assert_array_equal(loaded['large'], data['large'])
+        self.assertEqual(cache.statistics['misses'], 2)
+        self.assertFalse(os.path.exists(self.cache_dir))
+
+
+if __name__ == '__main__':
+    unittest.main()